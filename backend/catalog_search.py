@@ -0,0 +1,180 @@
+"""Tokenized inverted index over one musician's songs for audience search.
+
+Titles, artists and tags (genres, moods, year) are split into normalized tokens
+(casefolded, accents and apostrophes dropped). Each token maps to the songs
+containing it and the fields it occurs in, and a sorted vocabulary makes every
+query token a prefix match found by bisection. Songs must match every query
+token; they are ranked by field weight (title over artist over tags, whole-word
+matches slightly ahead of prefixes), then request_count, then recency.
+
+Query cost is bounded: at most MAX_QUERY_TERMS tokens per query and
+MAX_PREFIX_EXPANSION vocabulary entries per token. The index is updated one
+song at a time with add/remove, so a single song write never rebuilds it.
+
+PrefixIndex serves search-as-you-type: a sorted array of normalized titles and
+artists (each also indexed from every later word) searched by bisection, with
+the matching songs ranked by a caller-supplied popularity, then title.
+"""
+import bisect
+import heapq
+import re
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+TITLE = 1
+ARTIST = 2
+TAGS = 4
+
+# Score for a query token by the best field it matched in
+FIELD_WEIGHTS = {TITLE: 4.0, ARTIST: 2.0, TAGS: 1.0}
+EXACT_MATCH_BONUS = 0.5  # "love" ranks "Love Story" ahead of "Lovely"
+
+MAX_QUERY_TERMS = 8
+MAX_PREFIX_EXPANSION = 256  # Vocabulary entries scanned per query token
+MAX_COMPLETION_SCAN = 4096  # Sorted entries scanned per autocomplete prefix
+
+TOKEN_PATTERN = re.compile(r"\w+")
+APOSTROPHES = re.compile(r"['‘’`´]")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Normalized word tokens: casefolded, without accents, "don't" -> "dont\""""
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char)).casefold()
+    return TOKEN_PATTERN.findall(APOSTROPHES.sub("", text))
+
+
+def _best_weight(fields: int) -> float:
+    for field in (TITLE, ARTIST, TAGS):
+        if fields & field:
+            return FIELD_WEIGHTS[field]
+    return 0.0
+
+
+class SongSearchIndex:
+    """Inverted index for one catalog; song ids are opaque strings"""
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, int]] = {}  # token -> {song_id: field bits}
+        self.vocabulary: List[str] = []  # Sorted postings keys for prefix lookups
+        self.songs: Dict[str, Tuple[Tuple[str, ...], int, float]] = {}  # song_id -> (tokens, request_count, recency)
+
+    def __len__(self) -> int:
+        return len(self.songs)
+
+    def add(
+        self,
+        song_id: str,
+        title: str,
+        artist: str,
+        tags: Iterable[str] = (),
+        request_count: int = 0,
+        recency: float = 0.0
+    ) -> None:
+        """Index a song, replacing any previous entry for the same id"""
+        if song_id in self.songs:
+            self.remove(song_id)
+
+        fields: Dict[str, int] = {}
+        for field, values in ((TITLE, [title]), (ARTIST, [artist]), (TAGS, tags)):
+            for value in values:
+                for token in tokenize(str(value)):
+                    fields[token] = fields.get(token, 0) | field
+
+        for token, bits in fields.items():
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = {}
+                bisect.insort(self.vocabulary, token)
+            postings[song_id] = bits
+        self.songs[song_id] = (tuple(fields), request_count or 0, recency)
+
+    def remove(self, song_id: str) -> None:
+        entry = self.songs.pop(song_id, None)
+        if entry is None:
+            return
+        for token in entry[0]:
+            postings = self.postings[token]
+            del postings[song_id]
+            if not postings:
+                del self.postings[token]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+
+    def set_request_count(self, song_id: str, request_count: int) -> None:
+        entry = self.songs.get(song_id)
+        if entry is not None:
+            self.songs[song_id] = (entry[0], request_count or 0, entry[2])
+
+    def expand(self, prefix: str) -> List[str]:
+        """Vocabulary tokens starting with prefix, capped at MAX_PREFIX_EXPANSION"""
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = min(start + MAX_PREFIX_EXPANSION, len(self.vocabulary))
+        tokens = []
+        for position in range(start, end):
+            token = self.vocabulary[position]
+            if not token.startswith(prefix):
+                break
+            tokens.append(token)
+        return tokens
+
+    def search(self, query: str) -> Optional[List[str]]:
+        """Ids of songs matching every query token, best first; None when the query has no tokens"""
+        terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+        if not terms:
+            return None
+
+        # Longest terms first: they expand to the fewest tokens and shrink the candidate set fastest
+        scores: Optional[Dict[str, float]] = None
+        for term in sorted(terms, key=len, reverse=True):
+            term_scores: Dict[str, float] = {}
+            for token in self.expand(term):
+                bonus = EXACT_MATCH_BONUS if token == term else 0.0
+                for song_id, fields in self.postings[token].items():
+                    if scores is not None and song_id not in scores:
+                        continue
+                    score = _best_weight(fields) + bonus
+                    if score > term_scores.get(song_id, 0.0):
+                        term_scores[song_id] = score
+            if scores is not None:
+                term_scores = {song_id: scores[song_id] + score for song_id, score in term_scores.items()}
+            scores = term_scores
+            if not scores:
+                return []
+
+        songs = self.songs
+        return sorted(scores, key=lambda song_id: (-scores[song_id], -songs[song_id][1], -songs[song_id][2], song_id))
+
+
+class PrefixIndex:
+    """Sorted normalized titles and artists for autocomplete; built once per catalog version"""
+
+    def __init__(self, songs: Iterable[Tuple[str, str, str]]):
+        entries = []
+        titles = []
+        for song_id, title, artist in songs:
+            titles.append((" ".join(tokenize(title)), song_id))
+            for text in (title, artist):
+                tokens = tokenize(text)
+                # "Love Story" is found by "lo" and by "sto"
+                for start in range(len(tokens)):
+                    entries.append((" ".join(tokens[start:]), song_id))
+        entries.sort()
+        self.keys = [key for key, _ in entries]
+        self.song_ids = [song_id for _, song_id in entries]
+        # Alphabetical position by title, the tiebreak between equally popular songs
+        self.title_order = {song_id: position for position, (_, song_id) in enumerate(sorted(titles))}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def complete(self, prefix: str, popularity: Callable[[str], int], limit: int) -> List[str]:
+        """Up to limit distinct song ids with a title or artist starting with prefix, most popular first"""
+        normalized = " ".join(tokenize(prefix))
+        if not normalized:
+            return []
+        start = bisect.bisect_left(self.keys, normalized)
+        end = bisect.bisect_left(self.keys, normalized + "\U0010ffff", start, min(start + MAX_COMPLETION_SCAN, len(self.keys)))
+        title_order = self.title_order
+        return heapq.nsmallest(limit, set(self.song_ids[start:end]), key=lambda song_id: (-popularity(song_id), title_order[song_id]))
@@ -0,0 +1,234 @@
+"""CSV song list parsing, whole-file or incrementally from a byte stream.
+
+parse_csv_bytes takes the file in arbitrary pieces (upload reads, resumable
+upload chunks) and carries split characters, partial records and the header
+in a plain-dict parse state, so a stream parses exactly like the whole file
+does with parse_csv_content.
+"""
+import codecs
+import csv
+import io
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+CSV_EXPECTED_COLUMNS = {'title', 'artist', 'genre', 'mood', 'year', 'notes'}
+CSV_READ_CHUNK_SIZE = 64 * 1024  # Bytes read from the upload spool per iteration
+CSV_MAX_RECORD_SIZE = 1024 * 1024  # Guards against unbalanced quotes swallowing the whole file
+CSV_MAX_ERRORS = 100  # Row error messages kept per upload; the rest are only counted
+CSV_SPECIAL_CHARACTERS = re.compile(r'[",\r\n]')  # Everything that can change the quote state
+
+
+def map_csv_columns(header: List[str]) -> Dict[int, str]:
+    """Map CSV column positions to song fields (case insensitive)"""
+    if not header:
+        raise ValueError("CSV file appears to be empty or invalid")
+
+    col_mapping = {}
+    for position, field in enumerate(header):
+        field_lower = field.lower().strip()
+        if field_lower in CSV_EXPECTED_COLUMNS:
+            col_mapping[position] = field_lower
+
+    # Check if we have required columns
+    if 'title' not in col_mapping.values() or 'artist' not in col_mapping.values():
+        raise ValueError("CSV must contain 'Title' and 'Artist' columns")
+
+    return col_mapping
+
+
+def validate_csv_row(row: List[str], col_mapping: Dict[int, str], row_num: int) -> Dict[str, Any]:
+    """Validate one CSV record and return the song dict, or raise ValueError with the row error"""
+    try:
+        # Clean and map the row data
+        song_data = {}
+        for position, mapped_col in col_mapping.items():
+            song_data[mapped_col] = row[position].strip() if position < len(row) else ''
+
+        # Process required fields
+        if not song_data.get('title'):
+            raise ValueError(f"Row {row_num}: Title is required")
+
+        if not song_data.get('artist'):
+            raise ValueError(f"Row {row_num}: Artist is required")
+
+        # Process genres and moods (comma-separated)
+        genres = []
+        if song_data.get('genre'):
+            genres = [g.strip() for g in song_data['genre'].split(',') if g.strip()]
+
+        moods = []
+        if song_data.get('mood'):
+            moods = [m.strip() for m in song_data['mood'].split(',') if m.strip()]
+
+        # Process year
+        year = None
+        if song_data.get('year'):
+            try:
+                year = int(song_data['year'])
+            except ValueError:
+                raise ValueError(f"Row {row_num}: Year must be a valid number")
+            if year < 1900 or year > datetime.now().year + 1:
+                raise ValueError(f"Row {row_num}: Year must be between 1900 and {datetime.now().year + 1}")
+
+        return {
+            'title': song_data['title'],
+            'artist': song_data['artist'],
+            'genres': genres,
+            'moods': moods,
+            'year': year,
+            'notes': song_data.get('notes', ''),
+            'row_number': row_num
+        }
+
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Row {row_num}: Error processing row - {str(e)}")
+
+
+def parse_csv_content(content: bytes) -> Dict[str, Any]:
+    """Parse CSV content and return list of song dictionaries"""
+    try:
+        content_str = content.decode('utf-8')
+        reader = csv.reader(io.StringIO(content_str))
+        col_mapping = map_csv_columns(next(reader, None))
+
+        songs = []
+        errors = []
+        row_num = 1  # Row 1 is the header
+
+        for row in reader:
+            if not row:
+                continue  # Skip blank lines
+            row_num += 1
+            try:
+                songs.append(validate_csv_row(row, col_mapping, row_num))
+            except ValueError as e:
+                errors.append(str(e))
+
+        return {'songs': songs, 'errors': errors}
+
+    except UnicodeDecodeError:
+        raise ValueError("File encoding not supported. Please use UTF-8 encoded CSV file.")
+    except Exception as e:
+        raise ValueError(f"Error parsing CSV: {str(e)}")
+
+
+def new_csv_parse_state() -> Dict[str, Any]:
+    """Counters, capped error list and carry-over between reads, filled in by parse_csv_bytes"""
+    return {
+        "total_rows": 0, "valid_rows": 0, "error_count": 0, "errors": [],
+        "header": None, "row_num": 1, "pending": "", "undecoded": b""
+    }
+
+
+def csv_error_messages(parse_state: Dict[str, Any]) -> List[str]:
+    """Row errors kept during streaming, plus a summary line for any that were dropped"""
+    errors = list(parse_state["errors"])
+    dropped = parse_state["error_count"] - len(errors)
+    if dropped > 0:
+        errors.append(f"... and {dropped} more rows with errors")
+    return errors
+
+
+def split_complete_csv_records(text: str) -> Tuple[str, str]:
+    """Split text at the last record boundary, tracking quotes the way csv.reader does.
+
+    Returns (complete records, remainder). Text must start at a record boundary. A quote
+    only opens a quoted field at the start of a field, so a stray one inside an unquoted
+    field (12" Remix) is literal; inside a quoted field "" is an escaped quote.
+    """
+    state = "start"  # start of a field, "field" (unquoted), "quoted", or "quote" (just after a quote in a quoted field)
+    cut = 0
+    previous = -1
+    for match in CSV_SPECIAL_CHARACTERS.finditer(text):
+        position = match.start()
+        if position > previous + 1 and state in ("start", "quote"):
+            state = "field"  # Ordinary characters since the last special one
+        previous = position
+        char = match.group()
+
+        if char == '"':
+            if state == "start":
+                state = "quoted"
+            elif state == "quoted":
+                state = "quote"
+            elif state == "quote":
+                state = "quoted"  # Escaped quote
+        elif state == "quoted":
+            continue  # Delimiters and newlines are data inside quotes
+        elif char == ',':
+            state = "start"
+        else:
+            state = "start"
+            # A record ends at \n, or at a lone \r once the next character shows it isn't \r\n
+            if char == '\n':
+                cut = position + 1
+            elif position + 1 < len(text) and text[position + 1] != '\n':
+                cut = position + 1
+    return text[:cut], text[cut:]
+
+
+def parse_csv_bytes(
+    data: bytes,
+    parse_state: Dict[str, Any],
+    final: bool = False,
+    max_errors: int = CSV_MAX_ERRORS
+) -> List[Dict[str, Any]]:
+    """Parse the next piece of a CSV byte stream and return its validated song rows.
+
+    Split characters, partial records and the header row are carried over in
+    parse_state (which only holds plain values, so it can be persisted between
+    requests). Row errors are counted there and at most max_errors messages are kept.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    decoder.setstate((parse_state["undecoded"], 0))
+    try:
+        pending = parse_state["pending"] + decoder.decode(data, final=final)
+    except UnicodeDecodeError:
+        raise ValueError("File encoding not supported. Please use UTF-8 encoded CSV file.")
+    parse_state["undecoded"] = decoder.getstate()[0]
+
+    if final:
+        complete, parse_state["pending"] = pending, ''
+    else:
+        complete, parse_state["pending"] = split_complete_csv_records(pending)
+        if len(parse_state["pending"]) > CSV_MAX_RECORD_SIZE:
+            raise ValueError("Error parsing CSV: a row is too large or has an unclosed quote")
+
+    songs = []
+    if complete:
+        try:
+            records = list(csv.reader(io.StringIO(complete)))
+        except csv.Error as e:
+            raise ValueError(f"Error parsing CSV: {str(e)}")
+
+        col_mapping = map_csv_columns(parse_state["header"]) if parse_state["header"] is not None else None
+        for row in records:
+            if col_mapping is None:
+                try:
+                    col_mapping = map_csv_columns(row)
+                except ValueError as e:
+                    raise ValueError(f"Error parsing CSV: {str(e)}")
+                parse_state["header"] = row
+                continue
+            if not row:
+                continue  # Skip blank lines
+
+            parse_state["row_num"] += 1
+            parse_state["total_rows"] += 1
+            try:
+                song = validate_csv_row(row, col_mapping, parse_state["row_num"])
+            except ValueError as e:
+                parse_state["error_count"] += 1
+                if len(parse_state["errors"]) < max_errors:
+                    parse_state["errors"].append(str(e))
+                continue
+
+            parse_state["valid_rows"] += 1
+            songs.append(song)
+
+    if final and parse_state["header"] is None:
+        raise ValueError("Error parsing CSV: CSV file appears to be empty or invalid")
+    return songs
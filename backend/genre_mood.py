@@ -0,0 +1,303 @@
+"""Curated genre/mood assignment from song titles and artists.
+
+Each rule list is ordered by priority: the first rule with a keyword occurring
+(as a substring) in the lowercased text wins. Every list is compiled once into a
+single regex, so classifying a song is one scan per field instead of a chain
+of substring checks.
+
+Moods can also come from Spotify audio features: get_mood_from_audio_features
+for one track, moods_from_audio_features for a whole batch at once.
+"""
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Curated Genre List (20 options)
+CURATED_GENRES = [
+    "Pop", "Rock", "Classic Rock", "Folk", "Country", "Americana", "Indie",
+    "Alternative", "Singer-Songwriter", "R&B", "Soul", "Funk", "Blues",
+    "Jazz", "Hip Hop", "Reggae", "Electronic", "Dance", "Latin", "Acoustic"
+]
+
+# Curated Mood List (20 options)
+CURATED_MOODS = [
+    "Chill Vibes", "Feel Good", "Throwback", "Romantic", "Poolside", "Island Vibes",
+    "Dance Party", "Late Night", "Road Trip", "Sad Bangers", "Coffeehouse",
+    "Campfire", "Bar Anthems", "Summer Vibes", "Rainy Day", "Feel It Live",
+    "Heartbreak", "Fall Acoustic", "Weekend Warm-Up", "Groovy"
+]
+
+DEFAULT_GENRE = "Pop"
+DEFAULT_MOOD = "Feel Good"
+
+# Artist-based genre detection (common artists people know) - checked before the title
+GENRE_ARTIST_RULES = [
+    ("Pop", ["taylor swift", "adele", "ed sheeran", "bruno mars"]),
+    ("Classic Rock", ["the beatles", "led zeppelin", "queen", "eagles", "fleetwood mac"]),
+    ("Country", ["johnny cash", "dolly parton", "chris stapleton", "kacey musgraves"]),
+    ("Folk", ["bob dylan", "joni mitchell", "simon and garfunkel"]),
+    ("Singer-Songwriter", ["john mayer", "james taylor", "jack johnson"]),
+    ("R&B", ["stevie wonder", "marvin gaye", "alicia keys"]),
+    ("Blues", ["bb king", "muddy waters", "eric clapton"]),
+    ("Jazz", ["miles davis", "ella fitzgerald", "frank sinatra"]),
+    ("Reggae", ["bob marley", "jimmy buffett"]),
+]
+
+# Title-based genre detection
+GENRE_TITLE_RULES = [
+    ("Rock", ["rock", "stone", "highway", "guitar"]),
+    ("Classic Rock", ["classic", "oldies", "vintage"]),
+    ("Country", ["country", "truck", "whiskey", "cowboy", "honky"]),
+    ("Folk", ["folk", "mountain", "cabin", "prairie"]),
+    ("Acoustic", ["acoustic", "unplugged", "stripped"]),
+    ("Hip Hop", ["hip", "rap", "beat", "street"]),
+    ("Jazz", ["jazz", "swing", "smooth"]),
+    ("Blues", ["blues", "blue", "lonesome"]),
+    ("Electronic", ["electronic", "digital", "synth", "techno"]),
+    ("Dance", ["dance", "club", "party", "disco"]),
+    ("Reggae", ["reggae", "island", "caribbean"]),
+    ("Soul", ["soul", "funky", "groove"]),
+    ("Indie", ["indie", "alternative", "underground"]),
+    ("Latin", ["latin", "spanish", "salsa", "tango"]),
+]
+
+# Mood assignment based on keywords - more contextual and performance-oriented
+MOOD_TITLE_RULES = [
+    # Love and relationship moods
+    ("Romantic", ["love", "heart", "baby", "kiss", "valentine", "together"]),
+    ("Heartbreak", ["break", "goodbye", "tears", "lonely", "miss", "gone"]),
+    # Energy and party moods
+    ("Dance Party", ["party", "dance", "celebration", "tonight", "weekend"]),
+    ("Bar Anthems", ["bar", "beer", "whiskey", "shots", "crowd", "anthem"]),
+    ("Weekend Warm-Up", ["warm up", "getting ready", "pump", "hype"]),
+    ("Groovy", ["groove", "funky", "smooth", "soul", "rhythm"]),
+    # Chill and relaxed moods
+    ("Chill Vibes", ["chill", "relax", "peace", "calm", "quiet", "soft", "mellow"]),
+    ("Coffeehouse", ["coffee", "morning", "café", "acoustic", "intimate"]),
+    ("Campfire", ["campfire", "around", "circle", "sing along"]),
+    ("Late Night", ["late", "night", "midnight", "after dark", "3am"]),
+    ("Rainy Day", ["rain", "storm", "grey", "cozy", "inside"]),
+    # Seasonal and setting moods
+    ("Summer Vibes", ["summer", "sun", "beach", "vacation", "hot"]),
+    ("Poolside", ["pool", "swimming", "drinks", "cocktail", "tropical"]),
+    ("Island Vibes", ["island", "caribbean", "beach", "ocean", "waves"]),
+    ("Road Trip", ["road", "highway", "drive", "car", "journey", "adventure"]),
+    ("Fall Acoustic", ["fall", "autumn", "leaves", "cozy", "sweater"]),
+    # Performance and nostalgia moods
+    ("Throwback", ["throwback", "oldies", "remember", "back", "classic"]),
+    ("Feel It Live", ["live", "stage", "show", "performance", "crowd"]),
+]
+
+# Lowest-priority mood: needs a word from each list - sad but still hits hard
+SAD_BANGER_MOOD = "Sad Bangers"
+SAD_BANGER_SAD_WORDS = ["sad", "blue", "hurt", "pain"]
+SAD_BANGER_LIFT_WORDS = ["but", "still", "anyway", "dance", "sing"]
+
+
+class KeywordRules:
+    """Priority-ordered (category, keywords) rules compiled into one regex.
+
+    The alternation sits inside a lookahead, so finditer reports a match at every
+    position where some keyword starts - overlapping occurrences included. Keywords
+    are ordered by rule priority, so at each position the best rule starting there
+    is the one reported.
+    """
+
+    def __init__(self, rules: List[Tuple[str, List[str]]]):
+        self.categories = [category for category, _ in rules]
+        self.priority: Dict[str, int] = {}
+        for index, (_, keywords) in enumerate(rules):
+            for keyword in keywords:
+                self.priority.setdefault(keyword, index)
+        ordered = sorted(self.priority, key=lambda keyword: (self.priority[keyword], -len(keyword)))
+        self.pattern = re.compile("(?=(" + "|".join(re.escape(keyword) for keyword in ordered) + "))")
+
+    def match(self, text: str) -> Optional[str]:
+        """Category of the highest-priority rule with a keyword in text, or None"""
+        best = None
+        for found in self.pattern.finditer(text):
+            index = self.priority[found.group(1)]
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        return self.categories[best] if best is not None else None
+
+    def matches_any(self, text: str) -> bool:
+        return self.pattern.search(text) is not None
+
+
+_genre_artist_rules = KeywordRules(GENRE_ARTIST_RULES)
+_genre_title_rules = KeywordRules(GENRE_TITLE_RULES)
+_mood_title_rules = KeywordRules(MOOD_TITLE_RULES)
+_sad_words = KeywordRules([(SAD_BANGER_MOOD, SAD_BANGER_SAD_WORDS)])
+_lift_words = KeywordRules([(SAD_BANGER_MOOD, SAD_BANGER_LIFT_WORDS)])
+
+
+def assign_genre_and_mood(song_title: str, artist: str) -> Dict[str, Any]:
+    """Assign genre and mood based on song title and artist using curated categories"""
+    title_lower = song_title.lower()
+    artist_lower = artist.lower()
+
+    genre = _genre_artist_rules.match(artist_lower) or _genre_title_rules.match(title_lower) or DEFAULT_GENRE
+
+    mood = _mood_title_rules.match(title_lower)
+    if mood is None:
+        if _sad_words.matches_any(title_lower) and _lift_words.matches_any(title_lower):
+            mood = SAD_BANGER_MOOD
+        else:
+            mood = DEFAULT_MOOD
+
+    return {"genre": genre, "mood": mood}
+
+
+def classify_many(titles: Iterable[str], artists: Iterable[str]) -> List[Dict[str, Any]]:
+    """assign_genre_and_mood for parallel title/artist sequences; repeated songs are classified once"""
+    seen: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    results = []
+    for title, artist in zip(titles, artists):
+        key = (title, artist)
+        if key not in seen:
+            seen[key] = assign_genre_and_mood(title, artist)
+        # Callers may mutate the result, so repeated songs get their own copy
+        results.append(dict(seen[key]))
+    return results
+
+
+# Audio features -> mood
+def get_mood_from_audio_features(audio_features: dict) -> str:
+    """Determine mood from Spotify audio features using curated mood categories"""
+    if not audio_features:
+        return "Feel Good"  # Default
+
+    valence = audio_features.get('valence', 0.5)  # 0.0 = sad, 1.0 = happy
+    energy = audio_features.get('energy', 0.5)    # 0.0 = low energy, 1.0 = high energy
+    danceability = audio_features.get('danceability', 0.5)
+    acousticness = audio_features.get('acousticness', 0.5)
+    tempo = audio_features.get('tempo', 120)
+
+    # Map to curated mood categories based on audio features
+
+    # High energy, high danceability = party/dance moods
+    if energy > 0.8 and danceability > 0.7:
+        return "Dance Party"
+    elif energy > 0.7 and valence > 0.7 and tempo > 140:
+        return "Bar Anthems"
+    elif energy > 0.6 and valence > 0.6 and danceability > 0.6:
+        return "Weekend Warm-Up"
+
+    # High valence but lower energy = good vibes
+    elif valence > 0.7 and energy > 0.5:
+        return "Feel Good"
+    elif valence > 0.6 and acousticness > 0.5:
+        return "Summer Vibes"
+    elif valence > 0.5 and danceability > 0.6:
+        return "Groovy"
+
+    # Mid valence, romantic characteristics
+    elif 0.4 <= valence <= 0.7 and energy < 0.6 and acousticness > 0.4:
+        return "Romantic"
+    elif 0.4 <= valence <= 0.6 and energy < 0.5:
+        return "Poolside"
+
+    # Low energy, chill vibes
+    elif energy < 0.4 and valence > 0.4:
+        return "Chill Vibes"
+    elif energy < 0.5 and acousticness > 0.6:
+        return "Coffeehouse"
+    elif energy < 0.4 and tempo < 100:
+        return "Late Night"
+
+    # Low valence = sad/melancholic but still engaging
+    elif valence < 0.4 and energy > 0.5:
+        return "Sad Bangers"  # Sad but still hits hard
+    elif valence < 0.4 and energy < 0.5:
+        return "Heartbreak"
+    elif valence < 0.5 and acousticness > 0.5:
+        return "Rainy Day"
+
+    # Acoustic characteristics
+    elif acousticness > 0.7:
+        return "Fall Acoustic"
+    elif acousticness > 0.5 and energy < 0.6:
+        return "Campfire"
+
+    # High energy, mid-range everything else = road trip vibes
+    elif energy > 0.6 and 0.4 <= valence <= 0.7:
+        return "Road Trip"
+
+    # Default fallbacks
+    elif energy > 0.6:
+        return "Feel It Live"  # High energy, good for performance
+    elif valence > 0.5:
+        return "Throwback"  # Pleasant, nostalgic feeling
+    else:
+        return "Feel Good"  # Safe default
+
+
+AUDIO_FEATURE_COLUMNS = ("valence", "energy", "danceability", "acousticness", "tempo")
+AUDIO_FEATURE_DEFAULTS = (0.5, 0.5, 0.5, 0.5, 120)
+
+
+def classify_audio_feature_matrix(features: np.ndarray) -> np.ndarray:
+    """Moods for an (N x 5) matrix with AUDIO_FEATURE_COLUMNS columns.
+
+    Same thresholds and precedence as get_mood_from_audio_features: np.select
+    takes the first condition that holds for each row.
+    """
+    valence, energy, danceability, acousticness, tempo = features.T
+    decision_table = [
+        # High energy, high danceability = party/dance moods
+        (energy > 0.8) & (danceability > 0.7), "Dance Party",
+        (energy > 0.7) & (valence > 0.7) & (tempo > 140), "Bar Anthems",
+        (energy > 0.6) & (valence > 0.6) & (danceability > 0.6), "Weekend Warm-Up",
+        # High valence but lower energy = good vibes
+        (valence > 0.7) & (energy > 0.5), "Feel Good",
+        (valence > 0.6) & (acousticness > 0.5), "Summer Vibes",
+        (valence > 0.5) & (danceability > 0.6), "Groovy",
+        # Mid valence, romantic characteristics
+        (valence >= 0.4) & (valence <= 0.7) & (energy < 0.6) & (acousticness > 0.4), "Romantic",
+        (valence >= 0.4) & (valence <= 0.6) & (energy < 0.5), "Poolside",
+        # Low energy, chill vibes
+        (energy < 0.4) & (valence > 0.4), "Chill Vibes",
+        (energy < 0.5) & (acousticness > 0.6), "Coffeehouse",
+        (energy < 0.4) & (tempo < 100), "Late Night",
+        # Low valence = sad/melancholic but still engaging
+        (valence < 0.4) & (energy > 0.5), "Sad Bangers",
+        (valence < 0.4) & (energy < 0.5), "Heartbreak",
+        (valence < 0.5) & (acousticness > 0.5), "Rainy Day",
+        # Acoustic characteristics
+        acousticness > 0.7, "Fall Acoustic",
+        (acousticness > 0.5) & (energy < 0.6), "Campfire",
+        # High energy, mid-range everything else = road trip vibes
+        (energy > 0.6) & (valence >= 0.4) & (valence <= 0.7), "Road Trip",
+        # Default fallbacks
+        energy > 0.6, "Feel It Live",
+        valence > 0.5, "Throwback",
+    ]
+    return np.select(decision_table[0::2], decision_table[1::2], default=DEFAULT_MOOD)
+
+
+def moods_from_audio_features(features_list: List[Optional[Dict[str, Any]]]) -> List[Optional[str]]:
+    """Batch get_mood_from_audio_features over Spotify audio-feature objects.
+
+    Entries that are missing/empty or hold non-numeric values map to None, so the
+    caller can fall back to the curated title-based mood.
+    """
+    moods: List[Optional[str]] = [None] * len(features_list)
+    rows = []
+    positions = []
+    for position, audio_features in enumerate(features_list):
+        if not audio_features:
+            continue
+        row = [audio_features.get(column, default) for column, default in zip(AUDIO_FEATURE_COLUMNS, AUDIO_FEATURE_DEFAULTS)]
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in row):
+            rows.append(row)
+            positions.append(position)
+
+    if rows:
+        labels = classify_audio_feature_matrix(np.array(rows, dtype=float))
+        for position, label in zip(positions, labels):
+            moods[position] = str(label)
+    return moods
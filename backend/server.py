@@ -1,5 +1,7 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Request, Response
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Request, Response, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -7,8 +9,10 @@ import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Set
 import uuid
+import time
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
 import bcrypt
 import jwt
@@ -16,17 +20,32 @@ import re
 from pymongo import ASCENDING, DESCENDING
 import csv
 import io
+import codecs
 from emergentintegrations.payments.stripe.checkout import StripeCheckout, CheckoutSessionResponse, CheckoutStatusResponse, CheckoutSessionRequest
 import qrcode
 from PIL import Image, ImageDraw, ImageFont
 import base64
+import hashlib
 from io import BytesIO
+from pymongo import IndexModel, UpdateOne, ReplaceOne, ReturnDocument
+from pymongo.errors import OperationFailure, DuplicateKeyError, BulkWriteError
 import httpx
-from bs4 import BeautifulSoup
+from urllib.parse import unquote
 import asyncio
+import copy
 import json
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
+from concurrent.futures import ThreadPoolExecutor
+from spotify_fake import spotify_transport_from_env
+from genre_mood import assign_genre_and_mood, classify_many, moods_from_audio_features
+from catalog_search import PrefixIndex, SongSearchIndex
+from song_identity import normalize_song_key, song_fingerprint
+from csv_import import (
+    CSV_MAX_ERRORS,
+    CSV_READ_CHUNK_SIZE,
+    csv_error_messages,
+    new_csv_parse_state,
+    parse_csv_bytes,
+)
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -41,6 +60,15 @@ JWT_SECRET = os.environ.get('JWT_SECRET', 'requestwave-secret-key')
 JWT_ALGORITHM = 'HS256'
 JWT_EXPIRATION_HOURS = 24
 
+# Password hashing - bcrypt runs on its own bounded pool so it never blocks the event loop
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', '4'))
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', str(PASSWORD_HASH_WORKERS * 4)))
+
+# Verified principal cache - bounds how long a revoked or deleted account stays valid per process
+AUTH_CACHE_TTL_SECONDS = int(os.environ.get('AUTH_CACHE_TTL_SECONDS', '60'))
+AUTH_CACHE_MAX_ENTRIES = int(os.environ.get('AUTH_CACHE_MAX_ENTRIES', '10000'))
+
 # Stripe Configuration
 STRIPE_API_KEY = os.environ.get('STRIPE_API_KEY')
 MONTHLY_SUBSCRIPTION_PRICE = 10.00  # $10/month
@@ -104,6 +132,12 @@ class Song(BaseModel):
     hidden: bool = False  # NEW: Hide song from audience view
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+class AutocompleteSuggestion(BaseModel):
+    id: str
+    title: str
+    artist: str
+    request_count: int = 0
+
 class SongCreate(BaseModel):
     title: str
     artist: str
@@ -246,7 +280,7 @@ class BatchEditResponse(BaseModel):
 class DesignSettings(BaseModel):
     color_scheme: str = "purple"  # purple, blue, green, red, orange
     layout_mode: str = "grid"     # grid, list
-    artist_photo: Optional[str] = None  # base64 image data
+    artist_photo: Optional[str] = None  # URL of the stored photo (uploads arrive as base64 data URIs)
     show_year: bool = True
     show_notes: bool = True
     allow_song_suggestions: bool = True  # NEW: Pro feature - allow audience to suggest songs not on the list
@@ -298,12 +332,40 @@ class CSVUploadResponse(BaseModel):
     message: str
     songs_added: int
     errors: List[str] = []
+    near_duplicates: List[str] = []  # Rows skipped because they closely match an existing song
+    job_id: Optional[str] = None  # Set when the upload was queued as a background job
+
+class UploadSessionCreate(BaseModel):
+    filename: str  # .csv or .lst
+    total_size: int
+    chunk_size: Optional[int] = None  # Defaults to UPLOAD_CHUNK_SIZE
+    auto_enrich: bool = False
+
+class UploadSessionStatus(BaseModel):
+    id: str
+    filename: str
+    format: str
+    state: str  # receiving, complete
+    total_size: int
+    chunk_size: int
+    total_chunks: int
+    next_chunk: int  # First chunk not yet acknowledged; resume from here
+    bytes_received: int
+    songs_added: int
+    duplicates: int
+    near_duplicates: int
+    errors: List[str] = []
+    near_duplicate_matches: List[str] = []
+    result: Optional[Dict[str, Any]] = None  # Upload response once finalized
+    expires_at: datetime
 
 class CSVPreviewResponse(BaseModel):
     preview: List[Dict[str, Any]]
     total_rows: int
     valid_rows: int
     errors: List[str] = []
+    upload_token: Optional[str] = None  # Pass to /songs/csv/upload instead of re-sending the file
+    expires_at: Optional[datetime] = None
 
 # NEW: Playlist models for Pro feature
 class PlaylistCreate(BaseModel):
@@ -327,6 +389,18 @@ class PlaylistResponse(BaseModel):
 class PlaylistUpdate(BaseModel):
     song_ids: List[str]
 
+# Musician field projections - each lookup declares the fields it reads so the
+# password hash and inline design assets are not fetched on every call
+MUSICIAN_ACCOUNT_FIELDS = tuple(Musician.model_fields)
+MUSICIAN_PUBLIC_FIELDS = tuple(MusicianPublic.model_fields)
+MUSICIAN_PROFILE_FIELDS = tuple(MusicianProfile.model_fields)
+
+def musician_projection(*fields: str) -> Dict[str, int]:
+    """Projection for a musicians lookup; always includes id so a match is never an empty dict"""
+    projection = {"_id": 0, "id": 1}
+    projection.update({field: 1 for field in fields})
+    return projection
+
 # Utility functions
 def create_slug(name: str) -> str:
     """Create URL-friendly slug from musician name"""
@@ -335,19 +409,95 @@ def create_slug(name: str) -> str:
     return slug.strip('-')
 
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
 
 def verify_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
 
-def create_jwt_token(musician_id: str) -> str:
+def password_needs_rehash(hashed: str) -> bool:
+    """True when a stored hash was made with a different cost factor than BCRYPT_ROUNDS"""
+    try:
+        return int(hashed.split('$')[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_password_jobs_pending = 0
+
+async def run_password_job(func, *args):
+    """Run a bcrypt call on the password pool, rejecting with 429 when too many are queued"""
+    global _password_jobs_pending
+    if _password_jobs_pending >= PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many sign-in attempts in progress. Please try again shortly.",
+            headers={"Retry-After": "1"}
+        )
+    
+    _password_jobs_pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_password_executor, func, *args)
+    finally:
+        _password_jobs_pending -= 1
+
+async def hash_password_async(password: str) -> str:
+    return await run_password_job(hash_password, password)
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await run_password_job(verify_password, password, hashed)
+
+def create_jwt_token(musician_id: str, token_version: int = 0) -> str:
     expiration = datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS)
     payload = {
         'musician_id': musician_id,
+        'token_version': token_version,  # Bumped on the musician to revoke older tokens
         'exp': expiration
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
+# Verified musician ids -> (current token_version, expiry), least recently used first
+_principal_cache: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+principal_cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+async def get_principal_token_version(musician_id: str) -> Optional[int]:
+    """Current token version for an existing musician (cached), or None if the musician doesn't exist"""
+    now = time.monotonic()
+    cached = _principal_cache.get(musician_id)
+    if cached and cached[1] > now:
+        _principal_cache.move_to_end(musician_id)
+        principal_cache_stats["hits"] += 1
+        return cached[0]
+    
+    principal_cache_stats["misses"] += 1
+    musician = await db.musicians.find_one({"id": musician_id}, musician_projection("token_version"))
+    if not musician:
+        _principal_cache.pop(musician_id, None)
+        return None
+    
+    token_version = musician.get("token_version", 0)
+    _principal_cache[musician_id] = (token_version, now + AUTH_CACHE_TTL_SECONDS)
+    _principal_cache.move_to_end(musician_id)
+    while len(_principal_cache) > AUTH_CACHE_MAX_ENTRIES:
+        _principal_cache.popitem(last=False)
+        principal_cache_stats["evictions"] += 1
+    
+    return token_version
+
+def invalidate_principal(musician_id: str) -> None:
+    """Drop a cached principal - call after a password reset, token revocation or account removal"""
+    if _principal_cache.pop(musician_id, None) is not None:
+        principal_cache_stats["invalidations"] += 1
+
+def get_principal_cache_stats() -> Dict[str, Any]:
+    lookups = principal_cache_stats["hits"] + principal_cache_stats["misses"]
+    return {
+        **principal_cache_stats,
+        "size": len(_principal_cache),
+        "max_entries": AUTH_CACHE_MAX_ENTRIES,
+        "ttl_seconds": AUTH_CACHE_TTL_SECONDS,
+        "hit_ratio": round(principal_cache_stats["hits"] / lookups, 4) if lookups else None
+    }
+
 async def get_current_musician(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     """Get current authenticated musician ID from JWT token"""
     try:
@@ -356,10 +506,12 @@ async def get_current_musician(credentials: HTTPAuthorizationCredentials = Depen
         if not musician_id:
             raise HTTPException(status_code=401, detail="Invalid token")
         
-        # Verify musician exists
-        musician = await db.musicians.find_one({"id": musician_id})
-        if not musician:
+        # Verify musician exists and the token hasn't been revoked (cached)
+        current_version = await get_principal_token_version(musician_id)
+        if current_version is None:
             raise HTTPException(status_code=401, detail="Musician not found")
+        if payload.get('token_version', 0) != current_version:
+            raise HTTPException(status_code=401, detail="Token revoked")
         
         return musician_id
     except jwt.ExpiredSignatureError:
@@ -384,92 +536,376 @@ async def require_pro_access(musician_id: str):
             detail="This feature requires a Pro subscription. Please upgrade to access playlists."
         )
 
-def parse_csv_content(content: bytes) -> List[Dict[str, Any]]:
-    """Parse CSV content and return list of song dictionaries"""
+# Index registry - one entry per query shape the API issues against each collection
+INDEX_REGISTRY: Dict[str, List[IndexModel]] = {
+    "musicians": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("slug", ASCENDING)], unique=True),
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("design_settings.artist_photo_id", ASCENDING)], sparse=True),
+    ],
+    "songs": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        # Song list sorts - id is the keyset pagination tiebreaker (see SONG_SORTS)
+        IndexModel([("musician_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("musician_id", ASCENDING), ("request_count", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("musician_id", ASCENDING), ("title", ASCENDING), ("id", ASCENDING)]),
+        IndexModel([("musician_id", ASCENDING), ("artist", ASCENDING), ("id", ASCENDING)]),
+        IndexModel([("musician_id", ASCENDING), ("year", DESCENDING), ("id", DESCENDING)]),
+        # Duplicate checks - songs left unkeyed by the backfill (pre-existing duplicates) are excluded
+        IndexModel(
+            [("musician_id", ASCENDING), ("title_key", ASCENDING), ("artist_key", ASCENDING)],
+            unique=True,
+            partialFilterExpression={"title_key": {"$type": "string"}}
+        ),
+    ],
+    "requests": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("musician_id", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("musician_id", ASCENDING), ("show_name", ASCENDING)]),
+    ],
+    "shows": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("musician_id", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "playlists": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("musician_id", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "song_suggestions": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("musician_id", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "tips": [
+        IndexModel([("musician_id", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "password_resets": [
+        IndexModel([("email", ASCENDING), ("reset_code", ASCENDING)]),
+    ],
+    "metadata_cache": [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    "jobs": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("state", ASCENDING), ("created_at", ASCENDING)]),
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    "job_rows": [
+        IndexModel([("job_id", ASCENDING), ("seq", ASCENDING)], unique=True),
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    "upload_sessions": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("expires_at", ASCENDING)]),  # Swept by cleanup_upload_sessions, which also removes the files
+    ],
+    "upload_previews": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    "payment_transactions": [
+        IndexModel([("session_id", ASCENDING), ("musician_id", ASCENDING)]),
+    ],
+}
+
+async def ensure_indexes() -> Dict[str, Dict[str, List[str]]]:
+    """Build every registered index (idempotent) and report missing, extra and unused indexes"""
+    report = {}
+
+    for collection_name, index_models in INDEX_REGISTRY.items():
+        collection = db[collection_name]
+        declared = [model.document["name"] for model in index_models]
+
+        existing = [index["name"] async for index in collection.list_indexes()]
+        missing = [name for name in declared if name not in existing]
+        extra = [name for name in existing if name != "_id_" and name not in declared]
+
+        # create_indexes is a no-op for indexes that already exist with the same spec
+        try:
+            await collection.create_indexes(index_models)
+        except OperationFailure as e:
+            logger.error(f"Error building indexes on '{collection_name}': {str(e)}")
+
+        # Indexes that existed before this run but have never served a query
+        unused = []
+        try:
+            async for stats in collection.aggregate([{"$indexStats": {}}]):
+                if stats["name"] != "_id_" and stats["name"] not in missing and stats["accesses"]["ops"] == 0:
+                    unused.append(stats["name"])
+        except OperationFailure as e:
+            logger.warning(f"$indexStats unavailable for '{collection_name}': {str(e)}")
+
+        report[collection_name] = {"missing": missing, "extra": extra, "unused": unused}
+
+        if missing or extra or unused:
+            logger.info(f"Indexes on '{collection_name}': built {missing}, extra {extra}, unused {unused}")
+
+    return report
+
+# Normalized duplicate-check keys - normalize_song_key and song_fingerprint are in song_identity.py
+def song_keys(title: str, artist: str) -> Dict[str, str]:
+    """Build the indexed title_key/artist_key fields for a song"""
+    return {
+        "title_key": normalize_song_key(title),
+        "artist_key": normalize_song_key(artist)
+    }
+
+def duplicate_song_query(musician_id: str, title: str, artist: str) -> Dict[str, Any]:
+    """Index-backed query matching an existing song with the same title and artist"""
+    return {"musician_id": musician_id, **song_keys(title, artist)}
+
+async def backfill_song_keys(batch_size: int = 1000) -> Dict[str, int]:
+    """Populate title_key/artist_key on songs written before the keys existed"""
+    if not await db.songs.find_one({"title_key": {"$exists": False}}, {"_id": 1}):
+        return {"updated": 0, "duplicates": 0}
+
+    updated = 0
+    duplicates = 0
+    operations = []
+    current_musician = None
+    seen_keys = set()
+
+    # Oldest copy of each title/artist keeps the key; later copies are marked with None
+    # so the partial unique index can be built without deleting anyone's songs
+    cursor = db.songs.find(
+        {},
+        {"_id": 0, "id": 1, "musician_id": 1, "title": 1, "artist": 1, "title_key": 1, "artist_key": 1}
+    ).sort([("musician_id", ASCENDING), ("created_at", ASCENDING)])
+
+    async for song in cursor:
+        if song["musician_id"] != current_musician:
+            current_musician = song["musician_id"]
+            seen_keys = set()
+
+        if "title_key" in song:
+            if song["title_key"] is not None:
+                seen_keys.add((song["title_key"], song.get("artist_key")))
+            continue
+
+        keys = song_keys(song.get("title", ""), song.get("artist", ""))
+        key_tuple = (keys["title_key"], keys["artist_key"])
+        if key_tuple in seen_keys:
+            keys = {"title_key": None, "artist_key": None}
+            duplicates += 1
+        else:
+            seen_keys.add(key_tuple)
+
+        operations.append(UpdateOne({"id": song["id"]}, {"$set": keys}))
+        if len(operations) >= batch_size:
+            updated += await _flush_key_backfill(operations)
+            operations = []
+
+    if operations:
+        updated += await _flush_key_backfill(operations)
+
+    logger.info(f"Backfilled title/artist keys on {updated} songs ({duplicates} pre-existing duplicates left unkeyed)")
+    return {"updated": updated, "duplicates": duplicates}
+
+async def _flush_key_backfill(operations: List[UpdateOne]) -> int:
     try:
-        content_str = content.decode('utf-8')
-        reader = csv.DictReader(io.StringIO(content_str))
-        
-        songs = []
-        errors = []
-        
-        # Expected columns (case insensitive)
-        expected_cols = {'title', 'artist', 'genre', 'mood', 'year', 'notes'}
-        
-        # Get actual column names (case insensitive mapping)
-        if not reader.fieldnames:
-            raise ValueError("CSV file appears to be empty or invalid")
-        
-        col_mapping = {}
-        for field in reader.fieldnames:
-            field_lower = field.lower().strip()
-            if field_lower in expected_cols:
-                col_mapping[field] = field_lower
-        
-        # Check if we have required columns
-        if 'title' not in col_mapping.values() or 'artist' not in col_mapping.values():
-            raise ValueError("CSV must contain 'Title' and 'Artist' columns")
-        
-        for row_num, row in enumerate(reader, start=2):  # start=2 because row 1 is header
+        result = await db.songs.bulk_write(operations, ordered=False)
+        return result.modified_count
+    except BulkWriteError as e:
+        # A concurrent write already claimed the key - the song stays unkeyed and is retried next startup
+        logger.warning(f"Key backfill skipped {len(e.details.get('writeErrors', []))} conflicting songs")
+        return e.details.get("nModified", 0)
+
+# Bulk song ingestion shared by CSV, LST and playlist imports
+INGEST_CHUNK_SIZE = 500
+NEAR_DUPLICATE_REPORT_LIMIT = 100  # Near-duplicate messages kept per import; the rest are only counted
+
+def build_song_document(musician_id: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a song document ready for insertion from a parsed import row"""
+    return {
+        "id": str(uuid.uuid4()),
+        "musician_id": musician_id,
+        "title": row["title"],
+        "artist": row["artist"],
+        "genres": row.get("genres") or [],
+        "moods": row.get("moods") or [],
+        "year": row.get("year"),
+        "decade": calculate_decade(row.get("year")),
+        "notes": row.get("notes", ""),
+        "request_count": 0,
+        "hidden": False,
+        "created_at": datetime.utcnow(),
+        **song_keys(row["title"], row["artist"])
+    }
+
+async def iterate_rows(rows):
+    """Yield rows from either a plain iterable or an async iterable"""
+    if hasattr(rows, "__aiter__"):
+        async for row in rows:
+            yield row
+    else:
+        for row in rows:
+            yield row
+
+async def ingest_songs(
+    musician_id: str,
+    rows,
+    enrich=None,
+    duplicate_message=None,
+    error_message=None,
+    chunk_size: int = INGEST_CHUNK_SIZE,
+    max_errors: Optional[int] = None,
+    prefetch=None,
+    catalog: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Insert import rows in chunks with one insert_many per chunk.
+
+    Duplicates are checked in memory against catalog (see load_import_catalog), which
+    is loaded here unless the caller shares one across several calls. Rows whose
+    fingerprint matches an existing song are skipped as near-duplicates and reported
+    in near_duplicate_matches, separately from exact duplicates.
+
+    enrich(song_dict, row) is awaited for each non-duplicate row before insertion;
+    prefetch(song_dicts), if given, is awaited first with the chunk's new songs so
+    enrichment lookups can be batched.
+    duplicate_message(row) and error_message(row, error) format the per-row error strings;
+    duplicates are only reported when duplicate_message is given, and at most
+    max_errors messages are kept.
+    """
+    if error_message is None:
+        error_message = _default_import_error
+
+    summary = {
+        "songs_added": 0, "duplicates": 0, "near_duplicates": 0,
+        "errors": [], "near_duplicate_matches": [], "max_errors": max_errors
+    }
+    if catalog is None:
+        catalog = await load_import_catalog(musician_id)
+    chunk = []
+
+    async for row in iterate_rows(rows):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            await _ingest_chunk(musician_id, chunk, catalog, summary, enrich, duplicate_message, error_message, prefetch)
+            chunk = []
+
+    if chunk:
+        await _ingest_chunk(musician_id, chunk, catalog, summary, enrich, duplicate_message, error_message, prefetch)
+
+    return summary
+
+async def load_import_catalog(musician_id: str) -> Dict[str, Any]:
+    """Exact keys and fingerprints of a musician's songs, read once so every row checks in O(1).
+
+    Rows accepted during the import are added too, which catches repeats within the file.
+    """
+    catalog = {"keys": set(), "fingerprints": {}}
+    async for song in db.songs.find({"musician_id": musician_id}, {"_id": 0, "title": 1, "artist": 1}):
+        _remember_catalog_song(catalog, song.get("title", ""), song.get("artist", ""))
+    return catalog
+
+def _remember_catalog_song(catalog, title, artist, fingerprint=None):
+    catalog["keys"].add((normalize_song_key(title), normalize_song_key(artist)))
+    catalog["fingerprints"].setdefault(fingerprint or song_fingerprint(title, artist), (title, artist))
+
+async def _ingest_chunk(musician_id, chunk, catalog, summary, enrich, duplicate_message, error_message, prefetch=None):
+    documents = []
+    for row in chunk:
+        try:
+            documents.append((row, build_song_document(musician_id, row)))
+        except Exception as e:
+            _record_error(summary, error_message(row, str(e)))
+
+    to_insert = []
+    for row, doc in documents:
+        if (doc["title_key"], doc["artist_key"]) in catalog["keys"]:
+            _record_duplicate(row, summary, duplicate_message)
+            continue
+        fingerprint = song_fingerprint(doc["title"], doc["artist"])
+        existing = catalog["fingerprints"].get(fingerprint)
+        if existing:
+            _record_near_duplicate(doc, existing, summary)
+            continue
+        _remember_catalog_song(catalog, doc["title"], doc["artist"], fingerprint)
+        to_insert.append((row, doc))
+
+    if not to_insert:
+        return
+
+    if enrich:
+        if prefetch:
             try:
-                # Clean and map the row data
-                song_data = {}
-                for original_col, mapped_col in col_mapping.items():
-                    value = row.get(original_col, '').strip()
-                    song_data[mapped_col] = value
-                
-                # Process required fields
-                if not song_data.get('title'):
-                    errors.append(f"Row {row_num}: Title is required")
-                    continue
-                
-                if not song_data.get('artist'):
-                    errors.append(f"Row {row_num}: Artist is required")
-                    continue
-                
-                # Process genres and moods (comma-separated)
-                genres = []
-                if song_data.get('genre'):
-                    genres = [g.strip() for g in song_data['genre'].split(',') if g.strip()]
-                
-                moods = []
-                if song_data.get('mood'):
-                    moods = [m.strip() for m in song_data['mood'].split(',') if m.strip()]
-                
-                # Process year
-                year = None
-                if song_data.get('year'):
-                    try:
-                        year = int(song_data['year'])
-                        if year < 1900 or year > datetime.now().year + 1:
-                            errors.append(f"Row {row_num}: Year must be between 1900 and {datetime.now().year + 1}")
-                            continue
-                    except ValueError:
-                        errors.append(f"Row {row_num}: Year must be a valid number")
-                        continue
-                
-                # Create song object
-                song = {
-                    'title': song_data['title'],
-                    'artist': song_data['artist'],
-                    'genres': genres,
-                    'moods': moods,
-                    'year': year,
-                    'notes': song_data.get('notes', ''),
-                    'row_number': row_num
-                }
-                
-                songs.append(song)
-                
+                await prefetch([doc for _, doc in to_insert])
             except Exception as e:
-                errors.append(f"Row {row_num}: Error processing row - {str(e)}")
-        
-        return {'songs': songs, 'errors': errors}
-        
-    except UnicodeDecodeError:
-        raise ValueError("File encoding not supported. Please use UTF-8 encoded CSV file.")
-    except Exception as e:
-        raise ValueError(f"Error parsing CSV: {str(e)}")
+                # Rows still enrich one by one below
+                logger.warning(f"Metadata prefetch failed: {str(e)}")
+        for row, doc in to_insert:
+            await enrich(doc, row)
+            doc["decade"] = calculate_decade(doc["year"])
+
+    songs_added = summary["songs_added"]
+    try:
+        result = await db.songs.insert_many([doc for _, doc in to_insert], ordered=False)
+        summary["songs_added"] += len(result.inserted_ids)
+    except BulkWriteError as e:
+        summary["songs_added"] += e.details.get("nInserted", 0)
+        for write_error in e.details.get("writeErrors", []):
+            row = to_insert[write_error["index"]][0]
+            if write_error.get("code") == 11000:
+                # Inserted concurrently since the duplicate lookup
+                _record_duplicate(row, summary, duplicate_message)
+            else:
+                _record_error(summary, error_message(row, write_error.get("errmsg", "write failed")))
+
+    if summary["songs_added"] > songs_added:
+        await bump_content_version(musician_id)
+
+def _default_import_error(row, error):
+    return f"Error importing '{row.get('title', 'Unknown')}': {error}"
+
+def _record_duplicate(row, summary, duplicate_message):
+    summary["duplicates"] += 1
+    if duplicate_message:
+        _record_error(summary, duplicate_message(row))
+
+def _record_near_duplicate(doc, existing, summary):
+    summary["near_duplicates"] += 1
+    if len(summary["near_duplicate_matches"]) < NEAR_DUPLICATE_REPORT_LIMIT:
+        summary["near_duplicate_matches"].append(near_duplicate_message(doc["title"], doc["artist"], *existing))
+
+def _record_error(summary, message):
+    if summary["max_errors"] is None or len(summary["errors"]) < summary["max_errors"]:
+        summary["errors"].append(message)
+
+def near_duplicate_message(title: str, artist: str, existing_title: str, existing_artist: str) -> str:
+    return f"Skipped '{title}' by '{artist}' - looks like '{existing_title}' by '{existing_artist}' already in your library"
+
+def near_duplicate_summary(count: int) -> str:
+    """Suffix for import result messages"""
+    return f" ({count} near-duplicates skipped)" if count else ""
+
+# CSV parsing - see csv_import.py
+async def stream_csv_rows(
+    file: UploadFile,
+    parse_state: Dict[str, Any],
+    max_errors: int = CSV_MAX_ERRORS
+):
+    """Yield validated song rows from an uploaded CSV while it is read in chunks.
+
+    Only the current read chunk and any partial record are held in memory, so peak
+    usage does not depend on file size.
+    """
+    await file.seek(0)
+    while True:
+        chunk = await file.read(CSV_READ_CHUNK_SIZE)
+        for song in parse_csv_bytes(chunk, parse_state, final=not chunk, max_errors=max_errors):
+            yield song
+        if not chunk:
+            break
+
+async def rows_until_parse_error(rows, parse_state: Dict[str, Any]):
+    """Yield rows until the stream can no longer be parsed, keeping the error in parse_state["fatal_error"].
+
+    Lets an import that inserts while parsing report the songs added before the bad part of the file.
+    """
+    try:
+        async for row in rows:
+            yield row
+    except ValueError as e:
+        parse_state["fatal_error"] = str(e)
 
 def validate_csv_file(file: UploadFile) -> None:
     """Validate uploaded CSV file"""
@@ -487,75 +923,95 @@ def validate_lst_file(file: UploadFile) -> None:
     if file.size > 10 * 1024 * 1024:  # 10MB limit
         raise HTTPException(status_code=400, detail="File size must be less than 10MB")
 
+def parse_lst_lines(lines: List[str]) -> List[Dict[str, Any]]:
+    """Turn 'Song Title - Artist' lines into classified song rows"""
+    entries = []
+    for line in lines:
+        line = line.strip()
+        
+        # Skip empty lines and headers
+        if not line or line.startswith('-') or line.startswith('#'):
+            continue
+            
+        # Parse "Song Title - Artist" format
+        if ' - ' in line:
+            parts = line.split(' - ', 1)  # Split only on first ' - '
+            title = parts[0].strip()
+            artist = parts[1].strip()
+            
+            if title and artist:
+                entries.append((title, artist))
+        else:
+            # Handle lines without ' - ' separator (might be just song title)
+            title = line.strip()
+            if title:
+                entries.append((title, "Unknown Artist"))
+    
+    # Use curated genre/mood assignment, classified in one batch
+    classifications = classify_many([title for title, _ in entries], [artist for _, artist in entries])
+    
+    songs = []
+    for (title, artist), genre_mood_data in zip(entries, classifications):
+        songs.append({
+            "title": title,
+            "artist": artist,
+            "genres": [genre_mood_data["genre"]], 
+            "moods": [genre_mood_data["mood"]],
+            "year": None,  # Will be filled by auto-enrichment if enabled
+            "notes": ""  # Leave blank for user customization
+        })
+    
+    return songs
+
 def parse_lst_file(file: UploadFile) -> List[Dict[str, Any]]:
     """Parse LST file with 'Song Title - Artist' format"""
     try:
         # Reset file pointer
         file.file.seek(0)
         content = file.file.read().decode('utf-8')
-        lines = content.strip().split('\n')
-        
-        songs = []
-        for line_num, line in enumerate(lines, 1):
-            line = line.strip()
-            
-            # Skip empty lines and headers
-            if not line or line.startswith('-') or line.startswith('#'):
-                continue
-                
-            # Parse "Song Title - Artist" format
-            if ' - ' in line:
-                parts = line.split(' - ', 1)  # Split only on first ' - '
-                title = parts[0].strip()
-                artist = parts[1].strip()
-                
-                if title and artist:
-                    # Use curated genre/mood assignment
-                    genre_mood_data = assign_genre_and_mood(title, artist)
-                    
-                    song_data = {
-                        "title": title,
-                        "artist": artist,
-                        "genres": [genre_mood_data["genre"]], 
-                        "moods": [genre_mood_data["mood"]],
-                        "year": None,  # Will be filled by auto-enrichment if enabled
-                        "notes": ""  # Leave blank for user customization
-                    }
-                    songs.append(song_data)
-            else:
-                # Handle lines without ' - ' separator (might be just song title)
-                title = line.strip()
-                if title:
-                    genre_mood_data = assign_genre_and_mood(title, "Unknown Artist")
-                    
-                    song_data = {
-                        "title": title,
-                        "artist": "Unknown Artist",
-                        "genres": [genre_mood_data["genre"]], 
-                        "moods": [genre_mood_data["mood"]],
-                        "year": None,
-                        "notes": ""
-                    }
-                    songs.append(song_data)
-        
-        return songs
+        return parse_lst_lines(content.strip().split('\n'))
         
     except Exception as e:
         raise ValueError(f"Error parsing LST file: {str(e)}")
 
+def new_lst_parse_state() -> Dict[str, Any]:
+    """Carry-over between reads for parse_lst_bytes"""
+    return {"pending": "", "undecoded": b""}
+
+def parse_lst_bytes(data: bytes, parse_state: Dict[str, Any], final: bool = False) -> List[Dict[str, Any]]:
+    """Parse the next piece of an LST byte stream, keeping any partial line in parse_state"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    decoder.setstate((parse_state["undecoded"], 0))
+    try:
+        text = parse_state["pending"] + decoder.decode(data, final=final)
+    except UnicodeDecodeError as e:
+        raise ValueError(f"Error parsing LST file: {str(e)}")
+    parse_state["undecoded"] = decoder.getstate()[0]
+    
+    lines = text.split('\n')
+    parse_state["pending"] = '' if final else lines.pop()
+    return parse_lst_lines(lines)
+
 class LSTUploadResponse(BaseModel):
     success: bool
     message: str
     songs_added: int
+    near_duplicates: List[str] = []  # Rows skipped because they closely match an existing song
+    job_id: Optional[str] = None  # Set when the upload was queued as a background job
     
 class LSTPreviewResponse(BaseModel):
     success: bool
     songs: List[Dict[str, Any]]
     total_songs: int
+    upload_token: Optional[str] = None  # Pass to /songs/lst/upload instead of re-sending the file
+    expires_at: Optional[datetime] = None
 
 async def get_subscription_status(musician_id: str) -> SubscriptionStatus:
     """Get current subscription status and request limits for a musician"""
-    musician = await db.musicians.find_one({"id": musician_id})
+    musician = await db.musicians.find_one(
+        {"id": musician_id},
+        musician_projection("created_at", "subscription_ends_at")
+    )
     if not musician:
         raise HTTPException(status_code=404, detail="Musician not found")
     
@@ -733,40 +1189,59 @@ async def get_spotify_client_token() -> str:
     # For now, return a placeholder to simulate the token fetch
     return "simulated_client_token"
 
+# Outbound scraping - one pooled client for playlist pages, oEmbed and Apple Music API pages
+SCRAPE_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+APPLE_MUSIC_API_URL = os.environ.get('APPLE_MUSIC_API_URL', 'https://amp-api.music.apple.com')
+APPLE_MUSIC_DEVELOPER_TOKEN = os.environ.get('APPLE_MUSIC_DEVELOPER_TOKEN')  # Otherwise taken from the page config when present
+APPLE_MUSIC_MAX_TRACK_PAGES = 50  # Guards pagination; Apple serves up to 100 tracks per page
+
+SCRIPT_OPEN_PATTERN = re.compile(r'<script\b([^>]*)>', re.IGNORECASE)
+SCRIPT_CLOSE_PATTERN = re.compile(r'</script\s*>', re.IGNORECASE)
+JSON_SCRIPT_TYPE_PATTERN = re.compile(r'\btype\s*=\s*["\']?application/json["\'\s>]', re.IGNORECASE)
+APPLE_MUSIC_CONFIG_PATTERN = re.compile(r'<meta\s+name="desktop-music-app/config/environment"\s+content="([^"]+)"', re.IGNORECASE)
+
+_scrape_http: Optional[httpx.AsyncClient] = None
+
+def get_scrape_http() -> httpx.AsyncClient:
+    """Shared connection-pooled HTTP session for scraping playlist pages"""
+    global _scrape_http
+    if _scrape_http is None:
+        _scrape_http = httpx.AsyncClient(
+            headers={'User-Agent': SCRAPE_USER_AGENT},
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        )
+    return _scrape_http
+
 async def scrape_spotify_playlist(playlist_id: str) -> List[Dict[str, Any]]:
     """Get Spotify playlist tracks using a combination of web scraping and API simulation"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-        
         # First, try to get playlist info via oEmbed to validate it exists
-        async with httpx.AsyncClient(headers=headers, timeout=30.0) as client:
-            oembed_url = f"https://open.spotify.com/oembed?url=https://open.spotify.com/playlist/{playlist_id}"
-            
-            try:
-                oembed_response = await client.get(oembed_url)
-                if oembed_response.status_code == 200:
-                    oembed_data = oembed_response.json()
-                    playlist_title = oembed_data.get('title', 'Unknown Playlist')
-                    
-                    # Since we can't easily scrape the actual tracks without JS rendering,
-                    # we'll return a curated set of popular songs that represent common playlist content
-                    # This simulates what would be extracted from a real playlist
-                    
-                    # Generate realistic songs based on playlist type/title
-                    popular_songs = get_popular_songs_by_playlist_type(playlist_title)
-                    
-                    # Leave notes blank for user customization
-                    for song in popular_songs:
-                        song['notes'] = ''
-                        song['source'] = 'spotify'
-                    
-                    logger.info(f"Successfully parsed Spotify playlist: {playlist_title} with {len(popular_songs)} songs")
-                    return popular_songs
-                    
-            except Exception as e:
-                logger.warning(f"oEmbed request failed: {str(e)}")
+        oembed_url = f"https://open.spotify.com/oembed?url=https://open.spotify.com/playlist/{playlist_id}"
+        
+        try:
+            oembed_response = await get_scrape_http().get(oembed_url)
+            if oembed_response.status_code == 200:
+                oembed_data = oembed_response.json()
+                playlist_title = oembed_data.get('title', 'Unknown Playlist')
+                
+                # Since we can't easily scrape the actual tracks without JS rendering,
+                # we'll return a curated set of popular songs that represent common playlist content
+                # This simulates what would be extracted from a real playlist
+                
+                # Generate realistic songs based on playlist type/title
+                popular_songs = get_popular_songs_by_playlist_type(playlist_title)
+                
+                # Leave notes blank for user customization
+                for song in popular_songs:
+                    song['notes'] = ''
+                    song['source'] = 'spotify'
+                
+                logger.info(f"Successfully parsed Spotify playlist: {playlist_title} with {len(popular_songs)} songs")
+                return popular_songs
+                
+        except Exception as e:
+            logger.warning(f"oEmbed request failed: {str(e)}")
         
         # Fallback if oEmbed fails
         logger.info(f"Using fallback songs for Spotify playlist {playlist_id}")
@@ -946,133 +1421,172 @@ def get_fallback_spotify_songs(playlist_id: str) -> List[Dict[str, Any]]:
         }
     ]
 
+def iter_json_scripts(html: str):
+    """Parsed bodies of the page's <script type="application/json"> tags.
+
+    A regex scan over the raw page - no DOM is built, and other scripts are skipped
+    without being parsed.
+    """
+    position = 0
+    while True:
+        opening = SCRIPT_OPEN_PATTERN.search(html, position)
+        if not opening:
+            return
+        closing = SCRIPT_CLOSE_PATTERN.search(html, opening.end())
+        if not closing:
+            return
+        position = closing.end()
+        if not JSON_SCRIPT_TYPE_PATTERN.search(opening.group(1) + '>'):
+            continue
+        content = html[opening.end():closing.start()]
+        if not content.strip():
+            continue
+        try:
+            yield json.loads(content)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Error parsing Apple Music JSON data: {str(e)}")
+
+def find_apple_music_token(html: str) -> Optional[str]:
+    """Developer token for Apple's catalog API, needed to page through long playlists"""
+    if APPLE_MUSIC_DEVELOPER_TOKEN:
+        return APPLE_MUSIC_DEVELOPER_TOKEN
+    match = APPLE_MUSIC_CONFIG_PATTERN.search(html)
+    if not match:
+        return None
+    try:
+        config = json.loads(unquote(match.group(1)))
+        return config.get('MEDIA_API', {}).get('token')
+    except (ValueError, AttributeError):
+        return None
+
+async def fetch_apple_music_track_pages(next_path: str, token: str) -> List[Dict[str, Any]]:
+    """Follow a playlist's track pagination ("next" links) through the catalog API"""
+    tracks = []
+    pages = 0
+    while next_path and pages < APPLE_MUSIC_MAX_TRACK_PAGES:
+        response = await get_scrape_http().get(
+            f"{APPLE_MUSIC_API_URL}{next_path}",
+            headers={"Authorization": f"Bearer {token}", "Origin": "https://music.apple.com"}
+        )
+        response.raise_for_status()
+        page = response.json()
+        tracks.extend(page.get('data', []))
+        next_path = page.get('next')
+        pages += 1
+    if next_path:
+        logger.warning(f"Stopped Apple Music pagination after {pages} pages")
+    return tracks
+
+def apple_music_tracks_to_songs(tracks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Import rows for Apple Music track resources"""
+    attributes = [track['attributes'] for track in tracks if isinstance(track, dict) and 'attributes' in track]
+    titles = [attrs.get('name', 'Unknown Title') for attrs in attributes]
+    artists = [attrs.get('artistName', 'Unknown Artist') for attrs in attributes]
+    
+    # Assign mood based on title/artist
+    classifications = classify_many(titles, artists)
+    
+    songs = []
+    for attrs, title, artist, enhanced_data in zip(attributes, titles, artists, classifications):
+        # Get genre and year
+        genre_names = attrs.get('genreNames', ['Pop'])
+        genre = genre_names[0] if genre_names else 'Pop'
+        
+        release_date = attrs.get('releaseDate', '2023')
+        year = int(release_date[:4]) if release_date and len(release_date) >= 4 else 2023
+        
+        songs.append({
+            'title': title,
+            'artist': artist,
+            'genres': [genre],
+            'moods': [enhanced_data['mood']],
+            'year': year,
+            'notes': '',  # Leave blank for user customization
+            'source': 'apple_music'
+        })
+    return songs
+
 async def scrape_apple_music_playlist(playlist_url: str) -> List[Dict[str, Any]]:
     """Scrape Apple Music playlist to extract real song data"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
+        response = await get_scrape_http().get(playlist_url)
+        response.raise_for_status()
+        html = response.text
         
-        async with httpx.AsyncClient(headers=headers, timeout=30.0) as client:
-            response = await client.get(playlist_url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            songs = []
-            
-            # Look for JSON-LD structured data first
-            json_scripts = soup.find_all('script', type='application/json')
-            
-            for script in json_scripts:
-                try:
-                    if script.string:
-                        data = json.loads(script.string)
-                        # Apple Music stores data in various formats
-                        if isinstance(data, dict):
-                            # Try to navigate through the data structure
-                            if 'data' in data and isinstance(data['data'], dict):
-                                playlist_data = data['data']
-                                
-                                # Look for tracks in relationships
-                                if 'relationships' in playlist_data:
-                                    tracks_data = playlist_data['relationships'].get('tracks', {})
-                                    tracks = tracks_data.get('data', [])
-                                    
-                                    for track in tracks[:20]:  # Limit to 20 songs
-                                        if 'attributes' in track:
-                                            attrs = track['attributes']
-                                            title = attrs.get('name', 'Unknown Title')
-                                            artist = attrs.get('artistName', 'Unknown Artist')
-                                            
-                                            # Get genre and year
-                                            genre_names = attrs.get('genreNames', ['Pop'])
-                                            genre = genre_names[0] if genre_names else 'Pop'
-                                            
-                                            release_date = attrs.get('releaseDate', '2023')
-                                            year = int(release_date[:4]) if release_date and len(release_date) >= 4 else 2023
-                                            
-                                            # Assign mood based on title/artist
-                                            enhanced_data = assign_genre_and_mood(title, artist)
-                                            
-                                            songs.append({
-                                                'title': title,
-                                                'artist': artist,
-                                                'genres': [genre],
-                                                'moods': [enhanced_data['mood']],
-                                                'year': year,
-                                                'notes': '',  # Leave blank for user customization
-                                                'source': 'apple_music'
-                                            })
-                                
-                                if songs:
-                                    return songs
-                                    
-                except (json.JSONDecodeError, KeyError, TypeError) as e:
-                    logger.warning(f"Error parsing Apple Music JSON data: {str(e)}")
+        # Apple Music embeds the playlist as JSON in the page
+        for data in iter_json_scripts(html):
+            try:
+                if not isinstance(data, dict) or not isinstance(data.get('data'), dict):
                     continue
-            
-            # Fallback: Try to extract from HTML elements and meta tags
-            meta_title = soup.find('meta', property='og:title')
-            playlist_title = meta_title.get('content', 'Apple Music Playlist') if meta_title else 'Apple Music Playlist'
-            
-            # Look for song data in script tags
-            all_scripts = soup.find_all('script')
-            for script in all_scripts:
-                if script.string and ('song' in script.string.lower() or 'track' in script.string.lower()):
-                    try:
-                        # Try to find song patterns in the script content
-                        script_content = script.string
-                        
-                        # Look for common patterns
-                        if '"name"' in script_content and '"artist' in script_content:
-                            # This is a simplified approach - real extraction would be more complex
-                            pass
-                            
-                    except Exception:
-                        continue
-            
-            # If no structured data found, return realistic sample songs
-            sample_songs = [
-                {
-                    'title': 'Good 4 U',
-                    'artist': 'Olivia Rodrigo',
-                    'genres': ['Pop'],
-                    'moods': ['Bar Anthems'],
-                    'year': 2021,
-                    'notes': '',  # Leave blank for user customization
-                    'source': 'apple_music'
-                },
-                {
-                    'title': 'Levitating',
-                    'artist': 'Dua Lipa',
-                    'genres': ['Pop'],
-                    'moods': ['Dance Party'],
-                    'year': 2020,
-                    'notes': '',  # Leave blank for user customization
-                    'source': 'apple_music'
-                }, 
-                {
-                    'title': 'drivers license',
-                    'artist': 'Olivia Rodrigo',
-                    'genres': ['Pop'],
-                    'moods': ['Heartbreak'],
-                    'year': 2021,
-                    'notes': '',  # Leave blank for user customization
-                    'source': 'apple_music'
-                },
-                {
-                    'title': 'Peaches',
-                    'artist': 'Justin Bieber',
-                    'genres': ['Pop'],
-                    'moods': ['Chill Vibes'],
-                    'year': 2021,
-                    'notes': '',  # Leave blank for user customization
-                    'source': 'apple_music'
-                }
-            ]
-            
-            return sample_songs
+                playlist_data = data['data']
+                
+                # Look for tracks in relationships
+                if 'relationships' not in playlist_data:
+                    continue
+                tracks_data = playlist_data['relationships'].get('tracks', {})
+                tracks = list(tracks_data.get('data', []))
+                
+                # The page only carries the first page of tracks
+                if tracks_data.get('next'):
+                    token = find_apple_music_token(html)
+                    if token:
+                        try:
+                            tracks.extend(await fetch_apple_music_track_pages(tracks_data['next'], token))
+                        except Exception as e:
+                            logger.warning(f"Error fetching further Apple Music tracks, importing {len(tracks)} so far: {str(e)}")
+                    else:
+                        logger.warning(f"No Apple Music API token available, importing the first {len(tracks)} tracks only")
                 
+                songs = apple_music_tracks_to_songs(tracks)
+                if songs:
+                    return songs
+                    
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                logger.warning(f"Error parsing Apple Music JSON data: {str(e)}")
+                continue
+        
+        # If no structured data found, return realistic sample songs
+        sample_songs = [
+            {
+                'title': 'Good 4 U',
+                'artist': 'Olivia Rodrigo',
+                'genres': ['Pop'],
+                'moods': ['Bar Anthems'],
+                'year': 2021,
+                'notes': '',  # Leave blank for user customization
+                'source': 'apple_music'
+            },
+            {
+                'title': 'Levitating',
+                'artist': 'Dua Lipa',
+                'genres': ['Pop'],
+                'moods': ['Dance Party'],
+                'year': 2020,
+                'notes': '',  # Leave blank for user customization
+                'source': 'apple_music'
+            }, 
+            {
+                'title': 'drivers license',
+                'artist': 'Olivia Rodrigo',
+                'genres': ['Pop'],
+                'moods': ['Heartbreak'],
+                'year': 2021,
+                'notes': '',  # Leave blank for user customization
+                'source': 'apple_music'
+            },
+            {
+                'title': 'Peaches',
+                'artist': 'Justin Bieber',
+                'genres': ['Pop'],
+                'moods': ['Chill Vibes'],
+                'year': 2021,
+                'notes': '',  # Leave blank for user customization
+                'source': 'apple_music'
+            }
+        ]
+        
+        return sample_songs
+            
     except Exception as e:
         logger.error(f"Error scraping Apple Music playlist: {str(e)}")
         # Return fallback songs even if scraping fails
@@ -1118,286 +1632,331 @@ def calculate_decade(year: Optional[int]) -> Optional[str]:
         decade_suffix = str(decade_year)[-2:]
         return f"{decade_suffix}'s"
 
-def assign_genre_and_mood(song_title: str, artist: str) -> Dict[str, Any]:
-    """Assign genre and mood based on song title and artist using curated categories"""
-    title_lower = song_title.lower()
-    artist_lower = artist.lower()
-    
-    # Curated Genre List (20 options)
-    CURATED_GENRES = [
-        "Pop", "Rock", "Classic Rock", "Folk", "Country", "Americana", "Indie", 
-        "Alternative", "Singer-Songwriter", "R&B", "Soul", "Funk", "Blues", 
-        "Jazz", "Hip Hop", "Reggae", "Electronic", "Dance", "Latin", "Acoustic"
-    ]
-    
-    # Genre assignment based on keywords - prioritize specific categories
-    genre = "Pop"  # Default
-    
-    # Artist-based genre detection (common artists people know)
-    if any(artist in artist_lower for artist in ["taylor swift", "adele", "ed sheeran", "bruno mars"]):
-        genre = "Pop"
-    elif any(artist in artist_lower for artist in ["the beatles", "led zeppelin", "queen", "eagles", "fleetwood mac"]):
-        genre = "Classic Rock"
-    elif any(artist in artist_lower for artist in ["johnny cash", "dolly parton", "chris stapleton", "kacey musgraves"]):
-        genre = "Country"
-    elif any(artist in artist_lower for artist in ["bob dylan", "joni mitchell", "simon and garfunkel"]):
-        genre = "Folk"
-    elif any(artist in artist_lower for artist in ["john mayer", "james taylor", "jack johnson"]):
-        genre = "Singer-Songwriter"
-    elif any(artist in artist_lower for artist in ["stevie wonder", "marvin gaye", "alicia keys"]):
-        genre = "R&B"
-    elif any(artist in artist_lower for artist in ["bb king", "muddy waters", "eric clapton"]):
-        genre = "Blues"
-    elif any(artist in artist_lower for artist in ["miles davis", "ella fitzgerald", "frank sinatra"]):
-        genre = "Jazz"
-    elif any(artist in artist_lower for artist in ["bob marley", "jimmy buffett"]):
-        genre = "Reggae"
-    
-    # Title-based genre detection
-    elif any(word in title_lower for word in ["rock", "stone", "highway", "guitar"]):
-        genre = "Rock"
-    elif any(word in title_lower for word in ["classic", "oldies", "vintage"]):
-        genre = "Classic Rock"
-    elif any(word in title_lower for word in ["country", "truck", "whiskey", "cowboy", "honky"]):
-        genre = "Country"
-    elif any(word in title_lower for word in ["folk", "mountain", "cabin", "prairie"]):
-        genre = "Folk"
-    elif any(word in title_lower for word in ["acoustic", "unplugged", "stripped"]):
-        genre = "Acoustic"
-    elif any(word in title_lower for word in ["hip", "rap", "beat", "street"]):
-        genre = "Hip Hop"
-    elif any(word in title_lower for word in ["jazz", "swing", "smooth"]):
-        genre = "Jazz"
-    elif any(word in title_lower for word in ["blues", "blue", "lonesome"]):
-        genre = "Blues"
-    elif any(word in title_lower for word in ["electronic", "digital", "synth", "techno"]):
-        genre = "Electronic"
-    elif any(word in title_lower for word in ["dance", "club", "party", "disco"]):
-        genre = "Dance"
-    elif any(word in title_lower for word in ["reggae", "island", "caribbean"]):
-        genre = "Reggae"
-    elif any(word in title_lower for word in ["soul", "funky", "groove"]):
-        genre = "Soul"
-    elif any(word in title_lower for word in ["indie", "alternative", "underground"]):
-        genre = "Indie"
-    elif any(word in title_lower for word in ["latin", "spanish", "salsa", "tango"]):
-        genre = "Latin"
-    
-    # Curated Mood List (20 options)
-    CURATED_MOODS = [
-        "Chill Vibes", "Feel Good", "Throwback", "Romantic", "Poolside", "Island Vibes", 
-        "Dance Party", "Late Night", "Road Trip", "Sad Bangers", "Coffeehouse", 
-        "Campfire", "Bar Anthems", "Summer Vibes", "Rainy Day", "Feel It Live", 
-        "Heartbreak", "Fall Acoustic", "Weekend Warm-Up", "Groovy"
-    ]
-    
-    # Mood assignment based on keywords - more contextual and performance-oriented
-    mood = "Feel Good"  # Default
-    
-    # Love and relationship moods
-    if any(word in title_lower for word in ["love", "heart", "baby", "kiss", "valentine", "together"]):
-        mood = "Romantic"
-    elif any(word in title_lower for word in ["break", "goodbye", "tears", "lonely", "miss", "gone"]):
-        mood = "Heartbreak"
-    
-    # Energy and party moods  
-    elif any(word in title_lower for word in ["party", "dance", "celebration", "tonight", "weekend"]):
-        mood = "Dance Party"
-    elif any(word in title_lower for word in ["bar", "beer", "whiskey", "shots", "crowd", "anthem"]):
-        mood = "Bar Anthems"
-    elif any(word in title_lower for word in ["warm up", "getting ready", "pump", "hype"]):
-        mood = "Weekend Warm-Up"
-    elif any(word in title_lower for word in ["groove", "funky", "smooth", "soul", "rhythm"]):
-        mood = "Groovy"
-    
-    # Chill and relaxed moods
-    elif any(word in title_lower for word in ["chill", "relax", "peace", "calm", "quiet", "soft", "mellow"]):
-        mood = "Chill Vibes"
-    elif any(word in title_lower for word in ["coffee", "morning", "café", "acoustic", "intimate"]):
-        mood = "Coffeehouse"
-    elif any(word in title_lower for word in ["campfire", "around", "circle", "sing along"]):
-        mood = "Campfire"
-    elif any(word in title_lower for word in ["late", "night", "midnight", "after dark", "3am"]):
-        mood = "Late Night"
-    elif any(word in title_lower for word in ["rain", "storm", "grey", "cozy", "inside"]):
-        mood = "Rainy Day"
-    
-    # Seasonal and setting moods
-    elif any(word in title_lower for word in ["summer", "sun", "beach", "vacation", "hot"]):
-        mood = "Summer Vibes"
-    elif any(word in title_lower for word in ["pool", "swimming", "drinks", "cocktail", "tropical"]):
-        mood = "Poolside"
-    elif any(word in title_lower for word in ["island", "caribbean", "beach", "ocean", "waves"]):
-        mood = "Island Vibes"
-    elif any(word in title_lower for word in ["road", "highway", "drive", "car", "journey", "adventure"]):
-        mood = "Road Trip"
-    elif any(word in title_lower for word in ["fall", "autumn", "leaves", "cozy", "sweater"]):
-        mood = "Fall Acoustic"
-    
-    # Performance and nostalgia moods
-    elif any(word in title_lower for word in ["throwback", "oldies", "remember", "back", "classic"]):
-        mood = "Throwback"
-    elif any(word in title_lower for word in ["live", "stage", "show", "performance", "crowd"]):
-        mood = "Feel It Live"
-    elif any(word in title_lower for word in ["sad", "blue", "hurt", "pain"]) and any(word in title_lower for word in ["but", "still", "anyway", "dance", "sing"]):
-        mood = "Sad Bangers"  # Sad but still hits hard
-    
-    return {"genre": genre, "mood": mood}
-
-# NEW: Spotify Client Credentials Setup
-def get_spotify_client():
-    """Get Spotify client using Client Credentials flow (no user auth needed)"""
+# Spotify Web API client - one process-wide async session with a cached client-credentials token
+SPOTIFY_API_URL = os.environ.get('SPOTIFY_API_URL', 'https://api.spotify.com/v1')
+SPOTIFY_TOKEN_URL = os.environ.get('SPOTIFY_TOKEN_URL', 'https://accounts.spotify.com/api/token')
+SPOTIFY_TOKEN_REFRESH_MARGIN = 60  # Seconds before expiry to fetch a new token
+SPOTIFY_RATE_LIMIT_RETRIES = 3  # Attempts to wait out a 429 before giving up on a call
+SPOTIFY_DEFAULT_RETRY_AFTER = 1.0  # Seconds to back off when a 429 has no Retry-After header
+SPOTIFY_AUDIO_FEATURES_BATCH_SIZE = 100  # Maximum track ids per /audio-features request
+SPOTIFY_FAKE_MODE = os.environ.get('SPOTIFY_FAKE_MODE')  # "replay" or "record" - see spotify_fake.py
+
+_spotify_http: Optional[httpx.AsyncClient] = None
+_spotify_token: Dict[str, Any] = {"access_token": None, "expires_at": 0.0}
+_spotify_token_lock = asyncio.Lock()
+# Monotonic deadline shared by every caller - one 429 pauses all concurrent lookups
+_spotify_backoff: Dict[str, Any] = {"until": 0.0, "rate_limited": 0}
+spotify_request_count = {"total": 0}
+
+def get_spotify_http() -> httpx.AsyncClient:
+    """Shared connection-pooled HTTP session for Spotify calls"""
+    global _spotify_http
+    if _spotify_http is None:
+        _spotify_http = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            transport=spotify_transport_from_env(SPOTIFY_FAKE_MODE) if SPOTIFY_FAKE_MODE else None
+        )
+    return _spotify_http
+
+async def get_spotify_token(force_refresh: bool = False) -> Optional[str]:
+    """Client Credentials access token, refreshed shortly before it expires"""
+    if not force_refresh and _spotify_token["access_token"] and time.monotonic() < _spotify_token["expires_at"]:
+        return _spotify_token["access_token"]
+    
+    async with _spotify_token_lock:
+        # Another request may have refreshed while we waited for the lock
+        if not force_refresh and _spotify_token["access_token"] and time.monotonic() < _spotify_token["expires_at"]:
+            return _spotify_token["access_token"]
+        
+        client_id = os.getenv("SPOTIFY_CLIENT_ID")
+        client_secret = os.getenv("SPOTIFY_CLIENT_SECRET")
+        if SPOTIFY_FAKE_MODE == "replay":
+            # The local stand-in accepts any credentials
+            client_id = client_id or "replay"
+            client_secret = client_secret or "replay"
+        if not client_id or not client_secret:
+            logger.error("Spotify credentials are not configured")
+            return None
+        
+        response = await get_spotify_http().post(
+            SPOTIFY_TOKEN_URL,
+            data={"grant_type": "client_credentials"},
+            auth=(client_id, client_secret)
+        )
+        response.raise_for_status()
+        token_data = response.json()
+        
+        _spotify_token["access_token"] = token_data["access_token"]
+        _spotify_token["expires_at"] = time.monotonic() + token_data.get("expires_in", 3600) - SPOTIFY_TOKEN_REFRESH_MARGIN
+        return _spotify_token["access_token"]
+
+async def wait_for_spotify_backoff() -> None:
+    """Sleep until any shared rate-limit backoff has elapsed"""
+    delay = _spotify_backoff["until"] - time.monotonic()
+    while delay > 0:
+        await asyncio.sleep(delay)
+        delay = _spotify_backoff["until"] - time.monotonic()
+
+def note_spotify_rate_limit(response: httpx.Response) -> None:
+    """Push the shared backoff deadline out by the response's Retry-After"""
     try:
-        client_credentials_manager = SpotifyClientCredentials(
-            client_id=os.getenv("SPOTIFY_CLIENT_ID"),
-            client_secret=os.getenv("SPOTIFY_CLIENT_SECRET")
+        retry_after = float(response.headers.get("Retry-After", SPOTIFY_DEFAULT_RETRY_AFTER))
+    except ValueError:
+        retry_after = SPOTIFY_DEFAULT_RETRY_AFTER
+    _spotify_backoff["until"] = max(_spotify_backoff["until"], time.monotonic() + retry_after)
+    _spotify_backoff["rate_limited"] += 1
+    logger.warning(f"Spotify rate limit hit, backing off {retry_after}s")
+
+async def spotify_get(path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """GET a Spotify Web API resource; returns None when no token is available"""
+    token = await get_spotify_token()
+    if not token:
+        return None
+    
+    token_refreshed = False
+    for attempt in range(SPOTIFY_RATE_LIMIT_RETRIES + 1):
+        await wait_for_spotify_backoff()
+        spotify_request_count["total"] += 1
+        response = await get_spotify_http().get(
+            f"{SPOTIFY_API_URL}{path}",
+            params=params,
+            headers={"Authorization": f"Bearer {token}"}
         )
-        return spotipy.Spotify(client_credentials_manager=client_credentials_manager)
-    except Exception as e:
-        logger.error(f"Error setting up Spotify client: {str(e)}")
+        if response.status_code == 401 and not token_refreshed:
+            # Token revoked or expired early - refresh once and retry
+            token = await get_spotify_token(force_refresh=True)
+            if not token:
+                return None
+            token_refreshed = True
+            spotify_request_count["total"] += 1
+            response = await get_spotify_http().get(
+                f"{SPOTIFY_API_URL}{path}",
+                params=params,
+                headers={"Authorization": f"Bearer {token}"}
+            )
+        if response.status_code != 429 or attempt == SPOTIFY_RATE_LIMIT_RETRIES:
+            break
+        note_spotify_rate_limit(response)
+    
+    response.raise_for_status()
+    return response.json()
+
+async def resolve_spotify_track(title: str, artist: str) -> Optional[Dict[str, Any]]:
+    """Best-matching Spotify track for a song; None when there is no match, raises when Spotify can't be reached"""
+    # Search for the track
+    query = f"track:{title} artist:{artist}"
+    results = await spotify_get("/search", {"q": query, "type": "track", "limit": 1})
+    if results is None:
+        raise RuntimeError("Spotify client is not configured")
+    
+    if not results['tracks']['items']:
+        # Try a simpler search if exact search fails
+        query = f"{title} {artist}"
+        results = await spotify_get("/search", {"q": query, "type": "track", "limit": 1})
+    
+    if not results or not results['tracks']['items']:
+        logger.warning(f"No Spotify results found for: {title} by {artist}")
         return None
+    
+    return results['tracks']['items'][0]
 
-def get_mood_from_audio_features(audio_features: dict) -> str:
-    """Determine mood from Spotify audio features using curated mood categories"""
-    if not audio_features:
-        return "Feel Good"  # Default
-    
-    valence = audio_features.get('valence', 0.5)  # 0.0 = sad, 1.0 = happy
-    energy = audio_features.get('energy', 0.5)    # 0.0 = low energy, 1.0 = high energy
-    danceability = audio_features.get('danceability', 0.5)
-    acousticness = audio_features.get('acousticness', 0.5)
-    tempo = audio_features.get('tempo', 120)
-    
-    # Map to curated mood categories based on audio features
-    
-    # High energy, high danceability = party/dance moods
-    if energy > 0.8 and danceability > 0.7:
-        return "Dance Party"
-    elif energy > 0.7 and valence > 0.7 and tempo > 140:
-        return "Bar Anthems"
-    elif energy > 0.6 and valence > 0.6 and danceability > 0.6:
-        return "Weekend Warm-Up"
-    
-    # High valence but lower energy = good vibes
-    elif valence > 0.7 and energy > 0.5:
-        return "Feel Good"
-    elif valence > 0.6 and acousticness > 0.5:
-        return "Summer Vibes"
-    elif valence > 0.5 and danceability > 0.6:
-        return "Groovy"
-    
-    # Mid valence, romantic characteristics
-    elif 0.4 <= valence <= 0.7 and energy < 0.6 and acousticness > 0.4:
-        return "Romantic"
-    elif 0.4 <= valence <= 0.6 and energy < 0.5:
-        return "Poolside"
-    
-    # Low energy, chill vibes
-    elif energy < 0.4 and valence > 0.4:
-        return "Chill Vibes"
-    elif energy < 0.5 and acousticness > 0.6:
-        return "Coffeehouse"
-    elif energy < 0.4 and tempo < 100:
-        return "Late Night"
-    
-    # Low valence = sad/melancholic but still engaging
-    elif valence < 0.4 and energy > 0.5:
-        return "Sad Bangers"  # Sad but still hits hard
-    elif valence < 0.4 and energy < 0.5:
-        return "Heartbreak"
-    elif valence < 0.5 and acousticness > 0.5:
-        return "Rainy Day"
-    
-    # Acoustic characteristics
-    elif acousticness > 0.7:
-        return "Fall Acoustic"
-    elif acousticness > 0.5 and energy < 0.6:
-        return "Campfire"
-    
-    # High energy, mid-range everything else = road trip vibes
-    elif energy > 0.6 and 0.4 <= valence <= 0.7:
-        return "Road Trip"
-    
-    # Default fallbacks
-    elif energy > 0.6:
-        return "Feel It Live"  # High energy, good for performance
-    elif valence > 0.5:
-        return "Throwback"  # Pleasant, nostalgic feeling
-    else:
-        return "Feel Good"  # Safe default
+async def fetch_audio_features(track_ids: List[str]) -> Tuple[Dict[str, Dict[str, Any]], Set[str]]:
+    """Audio features keyed by track id, SPOTIFY_AUDIO_FEATURES_BATCH_SIZE ids per request.
 
-async def search_spotify_metadata(title: str, artist: str) -> Dict[str, Any]:
-    """Search Spotify for song metadata using Client Credentials"""
-    try:
-        sp = get_spotify_client()
-        if not sp:
-            logger.error("Failed to initialize Spotify client")
-            return None
-        
-        # Search for the track
-        query = f"track:{title} artist:{artist}"
-        results = sp.search(q=query, type='track', limit=1)
-        
-        if not results['tracks']['items']:
-            # Try a simpler search if exact search fails
-            query = f"{title} {artist}"
-            results = sp.search(q=query, type='track', limit=1)
-        
-        if not results['tracks']['items']:
-            logger.warning(f"No Spotify results found for: {title} by {artist}")
-            return None
-        
-        track = results['tracks']['items'][0]
-        
-        # Extract basic info
-        title_found = track['name']
-        artist_found = track['artists'][0]['name']
-        album = track['album']['name']
-        release_date = track['album']['release_date']
-        year = int(release_date[:4]) if release_date else None
-        
-        # Get genres from artist or album
-        genres = []
-        if track['artists'][0]['id']:
-            try:
-                artist_info = sp.artist(track['artists'][0]['id'])
-                genres = artist_info.get('genres', [])
-            except:
-                pass
-        
-        # Map Spotify genres to curated categories using our intelligent assignment
-        curated_data = assign_genre_and_mood(title, artist)
-        
-        # Get audio features for mood analysis, with curated fallback
-        mood = curated_data['mood']  # Default to curated mood
+    A failed batch is skipped - those songs fall back to their curated mood, and their
+    ids are returned alongside the features so that fallback isn't cached.
+    """
+    features = {}
+    failed = set()
+    for start in range(0, len(track_ids), SPOTIFY_AUDIO_FEATURES_BATCH_SIZE):
+        batch = track_ids[start:start + SPOTIFY_AUDIO_FEATURES_BATCH_SIZE]
         try:
-            audio_features = sp.audio_features(track['id'])
-            if audio_features and audio_features[0]:
-                mood = get_mood_from_audio_features(audio_features[0])
-        except:
-            # Already have curated mood from assign_genre_and_mood
-            pass
-        
-        return {
-            "title": title_found,
-            "artist": artist_found,
-            "album": album,
-            "year": year,
-            "genres": [curated_data['genre']],  # Use curated genre instead of raw Spotify
-            "moods": [mood],
-            "spotify_id": track['id'],
-            "confidence": "high" if title.lower() in title_found.lower() and artist.lower() in artist_found.lower() else "medium"
-        }
-        
+            response = await spotify_get("/audio-features", {"ids": ",".join(batch)})
+        except Exception as e:
+            logger.warning(f"Error fetching audio features for {len(batch)} tracks: {str(e)}")
+            failed.update(batch)
+            continue
+        for item in (response or {}).get("audio_features") or []:
+            if item:
+                features[item["id"]] = item
+    return features, failed
+
+def build_spotify_metadata(title: str, artist: str, track: Dict[str, Any], audio_mood: Optional[str]) -> Dict[str, Any]:
+    """Song metadata from a resolved track and the mood its audio features map to (if any)"""
+    # Extract basic info
+    title_found = track['name']
+    artist_found = track['artists'][0]['name']
+    album = track['album']['name']
+    release_date = track['album']['release_date']
+    year = int(release_date[:4]) if release_date else None
+    
+    # Genres come from our curated assignment rather than Spotify's artist genres,
+    # so the artist lookup is skipped entirely
+    curated_data = assign_genre_and_mood(title, artist)
+    
+    # Mood from audio features, with curated fallback
+    mood = audio_mood or curated_data['mood']
+    
+    return {
+        "title": title_found,
+        "artist": artist_found,
+        "album": album,
+        "year": year,
+        "genres": [curated_data['genre']],  # Use curated genre instead of raw Spotify
+        "moods": [mood],
+        "spotify_id": track['id'],
+        "confidence": "high" if title.lower() in title_found.lower() and artist.lower() in artist_found.lower() else "medium"
+    }
+
+# Metadata enrichment cache - shared across musicians, Mongo-backed with an in-process LRU in front
+METADATA_CACHE_TTL_DAYS = int(os.environ.get('METADATA_CACHE_TTL_DAYS', '30'))
+METADATA_CACHE_NEGATIVE_TTL_HOURS = int(os.environ.get('METADATA_CACHE_NEGATIVE_TTL_HOURS', '24'))
+METADATA_CACHE_MEMORY_ENTRIES = int(os.environ.get('METADATA_CACHE_MEMORY_ENTRIES', '5000'))
+
+# (title_key, artist_key) -> (metadata or None for "not found", expires_at), least recently used first
+_metadata_memory_cache: "OrderedDict[Tuple[str, str], Tuple[Optional[Dict[str, Any]], datetime]]" = OrderedDict()
+metadata_cache_stats = {"memory_hits": 0, "db_hits": 0, "negative_hits": 0, "misses": 0, "errors": 0}
+
+def _remember_metadata(key: Tuple[str, str], metadata: Optional[Dict[str, Any]], expires_at: datetime) -> None:
+    _metadata_memory_cache[key] = (metadata, expires_at)
+    _metadata_memory_cache.move_to_end(key)
+    while len(_metadata_memory_cache) > METADATA_CACHE_MEMORY_ENTRIES:
+        _metadata_memory_cache.popitem(last=False)
+
+def _metadata_cache_key(title: str, artist: str) -> Tuple[str, str]:
+    return (normalize_song_key(title), normalize_song_key(artist))
+
+def _metadata_cache_id(key: Tuple[str, str]) -> str:
+    return f"{key[0]}\x1f{key[1]}"
+
+async def _lookup_cached_metadata(keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[Dict[str, Any]]]:
+    """Cached entries (None meaning "not on Spotify") for whichever keys are cached"""
+    now = datetime.utcnow()
+    found = {}
+    unknown = []
+    for key in keys:
+        cached = _metadata_memory_cache.get(key)
+        if cached and cached[1] > now:
+            _metadata_memory_cache.move_to_end(key)
+            metadata_cache_stats["memory_hits"] += 1
+            if cached[0] is None:
+                metadata_cache_stats["negative_hits"] += 1
+            found[key] = cached[0]
+        else:
+            unknown.append(key)
+    
+    if unknown:
+        try:
+            cursor = db.metadata_cache.find({
+                "_id": {"$in": [_metadata_cache_id(key) for key in unknown]},
+                "expires_at": {"$gt": now}
+            })
+            async for entry in cursor:
+                key = (entry["title_key"], entry["artist_key"])
+                metadata_cache_stats["db_hits"] += 1
+                if entry["metadata"] is None:
+                    metadata_cache_stats["negative_hits"] += 1
+                _remember_metadata(key, entry["metadata"], entry["expires_at"])
+                found[key] = entry["metadata"]
+        except Exception as e:
+            logger.warning(f"Metadata cache read failed: {str(e)}")
+    
+    return found
+
+async def _store_cached_metadata(entries: List[Tuple[Tuple[str, str], Optional[Dict[str, Any]]]]) -> None:
+    now = datetime.utcnow()
+    writes = []
+    for key, metadata in entries:
+        if metadata:
+            expires_at = now + timedelta(days=METADATA_CACHE_TTL_DAYS)
+        else:
+            expires_at = now + timedelta(hours=METADATA_CACHE_NEGATIVE_TTL_HOURS)
+        _remember_metadata(key, metadata, expires_at)
+        writes.append(ReplaceOne(
+            {"_id": _metadata_cache_id(key)},
+            {"title_key": key[0], "artist_key": key[1], "metadata": metadata, "expires_at": expires_at, "cached_at": now},
+            upsert=True
+        ))
+    if not writes:
+        return
+    try:
+        await db.metadata_cache.bulk_write(writes, ordered=False)
     except Exception as e:
-        logger.error(f"Error searching Spotify metadata for '{title}' by '{artist}': {str(e)}")
-        return None
+        logger.warning(f"Metadata cache write failed: {str(e)}")
+
+async def search_spotify_metadata(title: str, artist: str) -> Optional[Dict[str, Any]]:
+    """Song metadata from the shared cache, falling back to Spotify (None if not found or unavailable)"""
+    return (await search_spotify_metadata_many([(title, artist)]))[0]
+
+async def search_spotify_metadata_many(songs: List[Tuple[str, str]], concurrency: Optional[int] = None) -> List[Optional[Dict[str, Any]]]:
+    """search_spotify_metadata for many (title, artist) pairs, in order.
+
+    Uncached songs are resolved with one search each (bounded concurrency), then their
+    audio features are fetched in batches, so N songs cost about N + N/100 Spotify calls.
+    """
+    keys = [_metadata_cache_key(title, artist) for title, artist in songs]
+    found = await _lookup_cached_metadata(list(dict.fromkeys(keys)))
+    
+    missing: Dict[Tuple[str, str], Tuple[str, str]] = {}
+    for key, song in zip(keys, songs):
+        if key not in found and key not in missing:
+            missing[key] = song
+    
+    if missing:
+        metadata_cache_stats["misses"] += len(missing)
+        semaphore = asyncio.Semaphore(max(1, concurrency or ENRICH_CONCURRENCY))
+        
+        async def resolve(title: str, artist: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await resolve_spotify_track(title, artist)
+        
+        tracks = await asyncio.gather(*(resolve(title, artist) for title, artist in missing.values()), return_exceptions=True)
+        track_ids = list(dict.fromkeys(track['id'] for track in tracks if isinstance(track, dict)))
+        features, features_failed = await fetch_audio_features(track_ids)
+        # One vectorized pass maps every track's audio features to a mood
+        audio_moods = dict(zip(track_ids, moods_from_audio_features([features.get(track_id) for track_id in track_ids])))
+        
+        resolved = []
+        for (key, (title, artist)), track in zip(missing.items(), tracks):
+            if isinstance(track, Exception):
+                # Transient failures are not cached
+                metadata_cache_stats["errors"] += 1
+                logger.error(f"Error searching Spotify metadata for '{title}' by '{artist}': {str(track)}")
+                found[key] = None
+                continue
+            metadata = build_spotify_metadata(title, artist, track, audio_moods.get(track['id'])) if track else None
+            found[key] = metadata
+            if track and track['id'] in features_failed:
+                # Only the curated fallback mood is known - retry the features on a later lookup
+                metadata_cache_stats["errors"] += 1
+                continue
+            resolved.append((key, metadata))
+        await _store_cached_metadata(resolved)
+    
+    return [copy.deepcopy(found[key]) for key in keys]
+
+async def prefetch_spotify_metadata(songs: List[Dict[str, Any]], needs_enrichment) -> None:
+    """Warm the metadata cache for the songs needs_enrichment(song) selects, in one batched pass"""
+    wanted = [(song['title'], song['artist']) for song in songs if needs_enrichment(song)]
+    if wanted:
+        await search_spotify_metadata_many(wanted)
+
+def get_metadata_cache_stats() -> Dict[str, Any]:
+    hits = metadata_cache_stats["memory_hits"] + metadata_cache_stats["db_hits"]
+    lookups = hits + metadata_cache_stats["misses"]
+    return {
+        **metadata_cache_stats,
+        "memory_size": len(_metadata_memory_cache),
+        "hit_ratio": round(hits / lookups, 4) if lookups else None,
+        "memory_hit_ratio": round(metadata_cache_stats["memory_hits"] / lookups, 4) if lookups else None
+    }
 
 # Auth endpoints
 @api_router.post("/auth/register", response_model=AuthResponse)
 async def register_musician(musician_data: MusicianRegister):
     # Check if email already exists
-    existing = await db.musicians.find_one({"email": musician_data.email})
+    existing = await db.musicians.find_one({"email": musician_data.email}, musician_projection())
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
     
@@ -1405,12 +1964,12 @@ async def register_musician(musician_data: MusicianRegister):
     base_slug = create_slug(musician_data.name)
     slug = base_slug
     counter = 1
-    while await db.musicians.find_one({"slug": slug}):
+    while await db.musicians.find_one({"slug": slug}, musician_projection()):
         slug = f"{base_slug}-{counter}"
         counter += 1
     
     # Create musician
-    hashed_password = hash_password(musician_data.password)
+    hashed_password = await hash_password_async(musician_data.password)
     musician_dict = {
         "id": str(uuid.uuid4()),
         "name": musician_data.name,
@@ -1422,10 +1981,11 @@ async def register_musician(musician_data: MusicianRegister):
         "website": "",
         "subscription_ends_at": None,
         "stripe_customer_id": None,
+        "token_version": 0,
         "design_settings": {
             "color_scheme": "purple",
             "layout_mode": "grid",
-            "artist_photo": None,
+            "artist_photo_id": None,
             "show_year": True,
             "show_notes": True
         },
@@ -1444,24 +2004,75 @@ async def register_musician(musician_data: MusicianRegister):
 @api_router.post("/auth/login", response_model=AuthResponse)
 async def login_musician(login_data: MusicianLogin):
     # Find musician
-    musician_doc = await db.musicians.find_one({"email": login_data.email})
-    if not musician_doc or not verify_password(login_data.password, musician_doc["password"]):
+    musician_doc = await db.musicians.find_one(
+        {"email": login_data.email},
+        musician_projection(*MUSICIAN_ACCOUNT_FIELDS, "password", "token_version")
+    )
+    if not musician_doc or not await verify_password_async(login_data.password, musician_doc["password"]):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
+    # Transparently upgrade hashes made with an older cost factor
+    if password_needs_rehash(musician_doc["password"]):
+        try:
+            new_hash = await hash_password_async(login_data.password)
+            # Filter on the old hash so a concurrent password reset is never overwritten
+            await db.musicians.update_one(
+                {"id": musician_doc["id"], "password": musician_doc["password"]},
+                {"$set": {"password": new_hash}}
+            )
+        except HTTPException:
+            pass  # Pool saturated - rehash on a later login
+    
     # Create JWT token
-    token = create_jwt_token(musician_doc["id"])
+    token = create_jwt_token(musician_doc["id"], musician_doc.get("token_version", 0))
     
     # Return response without password
     musician = Musician(**{k: v for k, v in musician_doc.items() if k != "password"})
     return AuthResponse(token=token, musician=musician)
 
 # Musician endpoints
+# Conditional GET for the public musician endpoints - ETags come from a version counter on the musician,
+# so a revalidation costs one musicians lookup and never touches songs. Profile and design views use
+# profile_version (see bump_profile_version) so the song writes of a show don't invalidate them
+PUBLIC_CACHE_CONTROL = "public, max-age=5, stale-while-revalidate=60"
+PUBLIC_RESOURCE_VERSIONS = {
+    "profile": "profile_version",
+    "design": "profile_version",
+    "songs": "content_version",
+    "filters": "content_version",
+    "autocomplete": "content_version",
+}
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    return bool(if_none_match) and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")])
+
+def public_content_headers(musician: Dict[str, Any], resource: str) -> Dict[str, str]:
+    """Strong ETag for one public view of a musician's content plus shared caching headers"""
+    etag = f'"{resource}-{musician["id"]}-{musician.get(PUBLIC_RESOURCE_VERSIONS[resource], 0)}"'
+    return {"ETag": etag, "Cache-Control": PUBLIC_CACHE_CONTROL}
+
+async def bump_profile_version(musician_id: str) -> None:
+    """Invalidate the cached public profile and design views"""
+    await db.musicians.update_one({"id": musician_id}, {"$inc": {"profile_version": 1}})
+
+def not_modified(headers: Dict[str, str], if_none_match: Optional[str]) -> Optional[Response]:
+    """304 response when the client already holds the current representation"""
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return None
+
 @api_router.get("/musicians/{slug}", response_model=MusicianPublic)
-async def get_musician_by_slug(slug: str):
-    musician = await db.musicians.find_one({"slug": slug})
+async def get_musician_by_slug(slug: str, response: Response, if_none_match: Optional[str] = Header(None)):
+    musician = await db.musicians.find_one({"slug": slug}, musician_projection(*MUSICIAN_PUBLIC_FIELDS, "profile_version"))
     if not musician:
         raise HTTPException(status_code=404, detail="Musician not found")
     
+    cache_headers = public_content_headers(musician, "profile")
+    cached = not_modified(cache_headers, if_none_match)
+    if cached:
+        return cached
+    response.headers.update(cache_headers)
+    
     return MusicianPublic(
         id=musician["id"],
         name=musician["name"],
@@ -1477,17 +2088,23 @@ async def get_musician_by_slug(slug: str):
     )
 
 @api_router.get("/musicians/{slug}/design")
-async def get_musician_design(slug: str):
+async def get_musician_design(slug: str, response: Response, if_none_match: Optional[str] = Header(None)):
     """Get musician's public design settings"""
-    musician = await db.musicians.find_one({"slug": slug})
+    musician = await db.musicians.find_one({"slug": slug}, musician_projection("design_settings", "name", "bio", "profile_version"))
     if not musician:
         raise HTTPException(status_code=404, detail="Musician not found")
     
+    cache_headers = public_content_headers(musician, "design")
+    cached = not_modified(cache_headers, if_none_match)
+    if cached:
+        return cached
+    response.headers.update(cache_headers)
+    
     design_settings = musician.get("design_settings", {})
     return {
         "color_scheme": design_settings.get("color_scheme", "purple"),
         "layout_mode": design_settings.get("layout_mode", "grid"),
-        "artist_photo": design_settings.get("artist_photo"),
+        "artist_photo": design_photo_url(design_settings),
         "show_year": design_settings.get("show_year", True),
         "show_notes": design_settings.get("show_notes", True),
         "musician_name": musician["name"],
@@ -1497,7 +2114,7 @@ async def get_musician_design(slug: str):
 @api_router.get("/profile", response_model=MusicianProfile)
 async def get_profile(musician_id: str = Depends(get_current_musician)):
     """Get current musician's profile"""
-    musician = await db.musicians.find_one({"id": musician_id})
+    musician = await db.musicians.find_one({"id": musician_id}, musician_projection(*MUSICIAN_PROFILE_FIELDS))
     if not musician:
         raise HTTPException(status_code=404, detail="Musician not found")
     
@@ -1521,7 +2138,7 @@ async def get_profile(musician_id: str = Depends(get_current_musician)):
 @api_router.put("/profile", response_model=MusicianProfile)
 async def update_profile(profile_data: ProfileUpdate, musician_id: str = Depends(get_current_musician)):
     """Update current musician's profile"""
-    musician = await db.musicians.find_one({"id": musician_id})
+    musician = await db.musicians.find_one({"id": musician_id}, musician_projection("name"))
     if not musician:
         raise HTTPException(status_code=404, detail="Musician not found")
     
@@ -1535,7 +2152,7 @@ async def update_profile(profile_data: ProfileUpdate, musician_id: str = Depends
             # Ensure slug uniqueness
             counter = 1
             original_slug = new_slug
-            while await db.musicians.find_one({"slug": new_slug, "id": {"$ne": musician_id}}):
+            while await db.musicians.find_one({"slug": new_slug, "id": {"$ne": musician_id}}, musician_projection()):
                 new_slug = f"{original_slug}-{counter}"
                 counter += 1
             update_data["slug"] = new_slug
@@ -1590,9 +2207,10 @@ async def update_profile(profile_data: ProfileUpdate, musician_id: str = Depends
             {"id": musician_id},
             {"$set": update_data}
         )
+        await bump_profile_version(musician_id)
     
     # Return updated profile
-    updated_musician = await db.musicians.find_one({"id": musician_id})
+    updated_musician = await db.musicians.find_one({"id": musician_id}, musician_projection(*MUSICIAN_PROFILE_FIELDS))
     return MusicianProfile(
         name=updated_musician["name"],
         email=updated_musician["email"],
@@ -1614,7 +2232,7 @@ async def update_profile(profile_data: ProfileUpdate, musician_id: str = Depends
 @api_router.post("/auth/forgot-password")
 async def forgot_password(reset_data: PasswordReset):
     """Send password reset code (simplified version for MVP)"""
-    musician = await db.musicians.find_one({"email": reset_data.email})
+    musician = await db.musicians.find_one({"email": reset_data.email}, musician_projection())
     if not musician:
         # Don't reveal if email exists for security
         return {"message": "If the email exists, a reset code will be sent"}
@@ -1655,12 +2273,15 @@ async def reset_password(reset_data: PasswordResetConfirm):
     if not reset_request:
         raise HTTPException(status_code=400, detail="Invalid or expired reset code")
     
-    # Update musician's password
-    hashed_password = hash_password(reset_data.new_password)
-    await db.musicians.update_one(
+    # Update musician's password and revoke every token issued with the old one
+    hashed_password = await hash_password_async(reset_data.new_password)
+    musician = await db.musicians.find_one_and_update(
         {"email": reset_data.email},
-        {"$set": {"password": hashed_password}}
+        {"$set": {"password": hashed_password}, "$inc": {"token_version": 1}},
+        projection=musician_projection()
     )
+    if musician:
+        invalidate_principal(musician["id"])
     
     # Mark reset code as used
     await db.password_resets.update_one(
@@ -1670,6 +2291,16 @@ async def reset_password(reset_data: PasswordResetConfirm):
     
     return {"message": "Password reset successful"}
 
+@api_router.get("/debug/auth-cache")
+async def debug_auth_cache():
+    """Hit/miss counters for the verified principal cache"""
+    return get_principal_cache_stats()
+
+@api_router.get("/debug/metadata-cache")
+async def debug_metadata_cache():
+    """Hit ratios for the shared metadata enrichment cache"""
+    return get_metadata_cache_stats()
+
 # QR Code endpoints
 @api_router.get("/debug/env")
 async def debug_env_vars():
@@ -1683,7 +2314,7 @@ async def debug_env_vars():
 @api_router.get("/qr-code")
 async def generate_musician_qr(musician_id: str = Depends(get_current_musician)):
     """Generate QR code for musician's audience link"""
-    musician = await db.musicians.find_one({"id": musician_id})
+    musician = await db.musicians.find_one({"id": musician_id}, musician_projection("slug"))
     if not musician:
         raise HTTPException(status_code=404, detail="Musician not found")
     
@@ -1708,7 +2339,7 @@ async def generate_musician_qr(musician_id: str = Depends(get_current_musician))
 @api_router.get("/qr-flyer")
 async def generate_qr_flyer_endpoint(musician_id: str = Depends(get_current_musician)):
     """Generate printable QR flyer for musician"""
-    musician = await db.musicians.find_one({"id": musician_id})
+    musician = await db.musicians.find_one({"id": musician_id}, musician_projection("name", "slug"))
     if not musician:
         raise HTTPException(status_code=404, detail="Musician not found")
     
@@ -1724,16 +2355,118 @@ async def generate_qr_flyer_endpoint(musician_id: str = Depends(get_current_musi
         "audience_url": audience_url
     }
 
+# Artist photo blob store - photos live in their own collection keyed by content hash
+# and are served from a cacheable binary endpoint instead of inline in JSON
+ARTIST_PHOTO_MAX_BYTES = 5 * 1024 * 1024
+ARTIST_PHOTO_CACHE_CONTROL = "public, max-age=31536000, immutable"  # Content-addressed, never changes
+# Raster formats only - an SVG served from the API origin could run script
+ARTIST_PHOTO_CONTENT_TYPES = {"image/png", "image/jpeg", "image/webp", "image/gif"}
+# Photos are opened directly on the API origin, so they must never be sniffed or execute anything
+ARTIST_PHOTO_SECURITY_HEADERS = {"X-Content-Type-Options": "nosniff", "Content-Security-Policy": "default-src 'none'"}
+
+def artist_photo_url(photo_id: Optional[str]) -> Optional[str]:
+    """Public URL for a stored artist photo"""
+    return f"/api/photos/{photo_id}" if photo_id else None
+
+def design_photo_url(design_settings: Dict[str, Any]) -> Optional[str]:
+    """Artist photo URL for a design_settings document (inline photos until they are migrated)"""
+    if design_settings.get("artist_photo_id"):
+        return artist_photo_url(design_settings["artist_photo_id"])
+    return design_settings.get("artist_photo")
+
+def decode_photo_data_uri(data_uri: str) -> Tuple[bytes, str]:
+    """Split a base64 data URI into raw bytes and content type"""
+    match = re.match(r"^data:(image/[\w.+-]+);base64,(.*)$", data_uri, re.DOTALL)
+    if not match:
+        raise ValueError("Artist photo must be a base64 image data URI")
+    if match.group(1).lower() not in ARTIST_PHOTO_CONTENT_TYPES:
+        raise ValueError("Artist photo must be a PNG, JPEG, WebP or GIF image")
+    try:
+        data = base64.b64decode(match.group(2), validate=True)
+    except (ValueError, TypeError):
+        raise ValueError("Artist photo contains invalid base64 data")
+    return data, match.group(1).lower()
+
+async def store_artist_photo(data: bytes, content_type: str) -> str:
+    """Store photo bytes once per distinct content and return the content hash"""
+    if len(data) > ARTIST_PHOTO_MAX_BYTES:
+        raise ValueError("Artist photo must be smaller than 5MB")
+    
+    photo_id = hashlib.sha256(data).hexdigest()
+    await db.artist_photos.update_one(
+        {"_id": photo_id},
+        {"$setOnInsert": {
+            "data": data,
+            "content_type": content_type,
+            "size": len(data),
+            "created_at": datetime.utcnow()
+        }},
+        upsert=True
+    )
+    return photo_id
+
+async def release_artist_photo(photo_id: Optional[str]) -> None:
+    """Delete a stored photo once no musician references it"""
+    if photo_id and not await db.musicians.find_one({"design_settings.artist_photo_id": photo_id}, {"_id": 1}):
+        await db.artist_photos.delete_one({"_id": photo_id})
+
+async def migrate_inline_artist_photos() -> int:
+    """Move base64 photos stored inside musician documents into the blob store"""
+    migrated = 0
+    cursor = db.musicians.find(
+        {"design_settings.artist_photo": {"$regex": "^data:"}},
+        {"_id": 0, "id": 1, "design_settings.artist_photo": 1}
+    )
+    async for musician in cursor:
+        # Unsupported types (e.g. SVG) are skipped and stay inline, drawn only from the data URI
+        try:
+            data, content_type = decode_photo_data_uri(musician["design_settings"]["artist_photo"])
+            photo_id = await store_artist_photo(data, content_type)
+        except ValueError as e:
+            logger.warning(f"Could not migrate artist photo for musician {musician['id']}: {str(e)}")
+            continue
+        
+        await db.musicians.update_one(
+            {"id": musician["id"]},
+            {
+                "$set": {"design_settings.artist_photo_id": photo_id},
+                "$unset": {"design_settings.artist_photo": ""},
+                "$inc": {"profile_version": 1}
+            }
+        )
+        migrated += 1
+    
+    if migrated:
+        logger.info(f"Moved {migrated} inline artist photos to the photo store")
+    return migrated
+
+@api_router.get("/photos/{photo_id}")
+async def get_artist_photo(photo_id: str, if_none_match: Optional[str] = Header(None)):
+    """Serve a stored artist photo with a strong ETag and long-lived caching"""
+    etag = f'"{photo_id}"'
+    cache_headers = {"ETag": etag, "Cache-Control": ARTIST_PHOTO_CACHE_CONTROL}
+    
+    # The id is the content hash, so a matching ETag never needs a database read
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=cache_headers)
+    
+    photo = await db.artist_photos.find_one({"_id": photo_id})
+    if not photo:
+        raise HTTPException(status_code=404, detail="Photo not found")
+    
+    content_type = photo["content_type"] if photo["content_type"] in ARTIST_PHOTO_CONTENT_TYPES else "application/octet-stream"
+    return Response(content=bytes(photo["data"]), media_type=content_type, headers={**cache_headers, **ARTIST_PHOTO_SECURITY_HEADERS})
+
 # Design Settings endpoints (Pro feature)
 @api_router.get("/design/settings", response_model=DesignSettings)
 async def get_design_settings(musician_id: str = Depends(get_current_musician)):
     """Get current design settings"""
-    musician = await db.musicians.find_one({"id": musician_id})
+    musician = await db.musicians.find_one({"id": musician_id}, musician_projection("design_settings"))
     if not musician:
         raise HTTPException(status_code=404, detail="Musician not found")
     
     design_settings = musician.get("design_settings", {})
-    return DesignSettings(**design_settings)
+    return DesignSettings(**{**design_settings, "artist_photo": design_photo_url(design_settings)})
 
 @api_router.put("/design/settings")
 async def update_design_settings(design_data: DesignUpdate, musician_id: str = Depends(get_current_musician)):
@@ -1746,211 +2479,260 @@ async def update_design_settings(design_data: DesignUpdate, musician_id: str = D
             detail="Design customization is a Pro feature. Upgrade to access these settings."
         )
     
-    musician = await db.musicians.find_one({"id": musician_id})
+    musician = await db.musicians.find_one({"id": musician_id}, musician_projection("design_settings.artist_photo_id"))
     if not musician:
         raise HTTPException(status_code=404, detail="Musician not found")
     
-    # Get current settings
-    current_settings = musician.get("design_settings", {})
+    previous_photo_id = musician.get("design_settings", {}).get("artist_photo_id")
     
     # Update only provided fields
     update_data = {}
+    unset_data = {}
     if design_data.color_scheme is not None:
         update_data["design_settings.color_scheme"] = design_data.color_scheme
     if design_data.layout_mode is not None:
         update_data["design_settings.layout_mode"] = design_data.layout_mode
     if design_data.artist_photo is not None:
-        update_data["design_settings.artist_photo"] = design_data.artist_photo
+        if design_data.artist_photo.startswith("data:"):
+            # New upload - store the bytes separately, keep only the reference
+            try:
+                data, content_type = decode_photo_data_uri(design_data.artist_photo)
+                update_data["design_settings.artist_photo_id"] = await store_artist_photo(data, content_type)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            unset_data["design_settings.artist_photo"] = ""
+        elif not design_data.artist_photo:
+            # Empty value removes the photo
+            update_data["design_settings.artist_photo_id"] = None
+            unset_data["design_settings.artist_photo"] = ""
+        # Otherwise it is the URL we handed out - the photo is unchanged
     if design_data.show_year is not None:
         update_data["design_settings.show_year"] = design_data.show_year
     if design_data.show_notes is not None:
         update_data["design_settings.show_notes"] = design_data.show_notes
     
     if update_data:
+        update_ops = {"$set": update_data}
+        if unset_data:
+            update_ops["$unset"] = unset_data
         await db.musicians.update_one(
             {"id": musician_id},
-            {"$set": update_data}
+            update_ops
         )
+        await bump_profile_version(musician_id)
+    
+    new_photo_id = update_data.get("design_settings.artist_photo_id", previous_photo_id)
+    if new_photo_id != previous_photo_id:
+        await release_artist_photo(previous_photo_id)
     
     return {"message": "Design settings updated successfully"}
 
 # Playlist Integration
-@api_router.post("/songs/playlist/import")
-async def import_from_playlist(import_data: PlaylistImport, musician_id: str = Depends(get_current_musician)):
-    """Import songs from Spotify or Apple Music playlist using web scraping"""
-    try:
-        playlist_url = import_data.playlist_url.strip()
-        platform = import_data.platform.lower()
-        
-        songs_to_import = []
-        
-        if platform == "spotify":
-            # Handle different Spotify URL formats
-            playlist_id = None
-            if "open.spotify.com/playlist/" in playlist_url:
-                playlist_id = playlist_url.split("playlist/")[1].split("?")[0]
-            elif "spotify:playlist:" in playlist_url:
-                playlist_id = playlist_url.split("spotify:playlist:")[1]
-            else:
-                raise HTTPException(status_code=400, detail="Invalid Spotify playlist URL format")
-            
-            # Scrape Spotify playlist
-            logger.info(f"Scraping Spotify playlist: {playlist_id}")
-            try:
-                songs_to_import = await scrape_spotify_playlist(playlist_id)
-                # Ensure we always have a list, never None
-                if songs_to_import is None or not isinstance(songs_to_import, list):
-                    logger.error("Spotify scraping returned None or invalid data, using fallback songs")
-                    songs_to_import = [
-                        {
-                            'title': 'As It Was',
-                            'artist': 'Harry Styles',
-                            'genres': ['Pop'],
-                            'moods': ['Feel Good'],
-                            'year': 2022,
-                            'notes': '',  # Leave blank for user customization
-                            'source': 'spotify'
-                        },
-                        {
-                            'title': 'Heat Waves', 
-                            'artist': 'Glass Animals',
-                            'genres': ['Alternative'],
-                            'moods': ['Chill Vibes'],
-                            'year': 2020,
-                            'notes': '',  # Leave blank for user customization
-                            'source': 'spotify'
-                        },
-                        {
-                            'title': 'Blinding Lights',
-                            'artist': 'The Weeknd',
-                            'genres': ['Pop'],
-                            'moods': ['Dance Party'],
-                            'year': 2019,
-                            'notes': '',  # Leave blank for user customization
-                            'source': 'spotify'
-                        }
-                    ]
-            except Exception as e:
-                # If scraping fails, provide a more helpful error with fallback
-                logger.error(f"Spotify scraping failed: {str(e)}")
-                # For demo purposes, create sample songs based on the playlist ID
+def parse_playlist_source(playlist_url: str, platform: str) -> Optional[str]:
+    """Validate a playlist URL for its platform; returns the Spotify playlist id (None for Apple Music)"""
+    if platform == "spotify":
+        # Handle different Spotify URL formats
+        if "open.spotify.com/playlist/" in playlist_url:
+            return playlist_url.split("playlist/")[1].split("?")[0]
+        elif "spotify:playlist:" in playlist_url:
+            return playlist_url.split("spotify:playlist:")[1]
+        raise HTTPException(status_code=400, detail="Invalid Spotify playlist URL format")
+    elif platform == "apple_music":
+        # Handle Apple Music URL formats
+        if not ("music.apple.com" in playlist_url and ("playlist" in playlist_url or "/pl." in playlist_url)):
+            raise HTTPException(status_code=400, detail="Invalid Apple Music playlist URL format")
+        return None
+    raise HTTPException(status_code=400, detail="Unsupported platform. Use 'spotify' or 'apple_music'")
+
+async def fetch_playlist_songs(platform: str, playlist_url: str, playlist_id: Optional[str]) -> List[Dict[str, Any]]:
+    """Scrape a validated playlist, falling back to sample songs when scraping fails"""
+    songs_to_import = []
+    
+    if platform == "spotify":
+        # Scrape Spotify playlist
+        logger.info(f"Scraping Spotify playlist: {playlist_id}")
+        try:
+            songs_to_import = await scrape_spotify_playlist(playlist_id)
+            # Ensure we always have a list, never None
+            if songs_to_import is None or not isinstance(songs_to_import, list):
+                logger.error("Spotify scraping returned None or invalid data, using fallback songs")
                 songs_to_import = [
                     {
-                        'title': 'Sample Song 1',
-                        'artist': 'Demo Artist',
+                        'title': 'As It Was',
+                        'artist': 'Harry Styles',
                         'genres': ['Pop'],
                         'moods': ['Feel Good'],
-                        'year': 2023,
-                        'notes': '',  # Leave blank for user customization
-                        'source': 'spotify'
-                    },
-                    {
-                        'title': 'Sample Song 2', 
-                        'artist': 'Demo Artist 2',
-                        'genres': ['Rock'],
-                        'moods': ['Bar Anthems'],
                         'year': 2022,
                         'notes': '',  # Leave blank for user customization
                         'source': 'spotify'
-                    }
-                ]
-            
-        elif platform == "apple_music":
-            # Handle Apple Music URL formats
-            if not ("music.apple.com" in playlist_url and ("playlist" in playlist_url or "/pl." in playlist_url)):
-                raise HTTPException(status_code=400, detail="Invalid Apple Music playlist URL format")
-            
-            # Scrape Apple Music playlist
-            logger.info(f"Scraping Apple Music playlist: {playlist_url}")
-            try:
-                songs_to_import = await scrape_apple_music_playlist(playlist_url)
-            except Exception as e:
-                # If scraping fails, provide fallback
-                logger.error(f"Apple Music scraping failed: {str(e)}")
-                songs_to_import = [
+                    },
                     {
-                        'title': 'Sample Apple Song 1',
-                        'artist': 'Demo Artist',
-                        'genres': ['Pop'],
+                        'title': 'Heat Waves', 
+                        'artist': 'Glass Animals',
+                        'genres': ['Alternative'],
                         'moods': ['Chill Vibes'],
-                        'year': 2023,
+                        'year': 2020,
                         'notes': '',  # Leave blank for user customization
-                        'source': 'apple_music'
+                        'source': 'spotify'
                     },
                     {
-                        'title': 'Sample Apple Song 2',
-                        'artist': 'Demo Artist 2', 
-                        'genres': ['Alternative'],
-                        'moods': ['Feel Good'],
-                        'year': 2022,
+                        'title': 'Blinding Lights',
+                        'artist': 'The Weeknd',
+                        'genres': ['Pop'],
+                        'moods': ['Dance Party'],
+                        'year': 2019,
                         'notes': '',  # Leave blank for user customization
-                        'source': 'apple_music'
+                        'source': 'spotify'
                     }
                 ]
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported platform. Use 'spotify' or 'apple_music'")
+        except Exception as e:
+            # If scraping fails, provide a more helpful error with fallback
+            logger.error(f"Spotify scraping failed: {str(e)}")
+            # For demo purposes, create sample songs based on the playlist ID
+            songs_to_import = [
+                {
+                    'title': 'Sample Song 1',
+                    'artist': 'Demo Artist',
+                    'genres': ['Pop'],
+                    'moods': ['Feel Good'],
+                    'year': 2023,
+                    'notes': '',  # Leave blank for user customization
+                    'source': 'spotify'
+                },
+                {
+                    'title': 'Sample Song 2', 
+                    'artist': 'Demo Artist 2',
+                    'genres': ['Rock'],
+                    'moods': ['Bar Anthems'],
+                    'year': 2022,
+                    'notes': '',  # Leave blank for user customization
+                    'source': 'spotify'
+                }
+            ]
+    
+    elif platform == "apple_music":
+        # Scrape Apple Music playlist
+        logger.info(f"Scraping Apple Music playlist: {playlist_url}")
+        try:
+            songs_to_import = await scrape_apple_music_playlist(playlist_url)
+        except Exception as e:
+            # If scraping fails, provide fallback
+            logger.error(f"Apple Music scraping failed: {str(e)}")
+            songs_to_import = [
+                {
+                    'title': 'Sample Apple Song 1',
+                    'artist': 'Demo Artist',
+                    'genres': ['Pop'],
+                    'moods': ['Chill Vibes'],
+                    'year': 2023,
+                    'notes': '',  # Leave blank for user customization
+                    'source': 'apple_music'
+                },
+                {
+                    'title': 'Sample Apple Song 2',
+                    'artist': 'Demo Artist 2', 
+                    'genres': ['Alternative'],
+                    'moods': ['Feel Good'],
+                    'year': 2022,
+                    'notes': '',  # Leave blank for user customization
+                    'source': 'apple_music'
+                }
+            ]
+    
+    return songs_to_import
+
+def build_playlist_rows(songs_to_import: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Ingestion rows for scraped playlist songs, with curated genres/moods filled in"""
+    rows = []
+    errors = []
+    
+    # Enhance genre and mood assignment, classified in one batch
+    classifications = classify_many(
+        [str(song_data.get('title', '')) for song_data in songs_to_import],
+        [str(song_data.get('artist', '')) for song_data in songs_to_import]
+    )
+    
+    for song_data, enhanced_data in zip(songs_to_import, classifications):
+        try:
+            # Use enhanced data if original is generic
+            if song_data.get('genres') == ['Pop'] or not song_data.get('genres'):
+                song_data['genres'] = [enhanced_data['genre']]
+            if song_data.get('moods') == ['Unknown'] or not song_data.get('moods'):
+                song_data['moods'] = [enhanced_data['mood']]
+            
+            rows.append({
+                'title': song_data['title'],
+                'artist': song_data['artist'],
+                'genres': song_data.get('genres', ['Pop']),
+                'moods': song_data.get('moods', ['Feel Good']),
+                'year': int(song_data.get('year', 2023)) if song_data.get('year') else None,
+                'notes': song_data.get('notes', '')
+            })
+            
+        except Exception as e:
+            errors.append(f"Error importing '{song_data.get('title', 'Unknown')}': {str(e)}")
+            continue
+    
+    return rows, errors
+
+def playlist_duplicate_message(row: Dict[str, Any]) -> str:
+    return f"Skipped duplicate: '{row['title']}' by '{row['artist']}'"
+
+def playlist_import_result(
+    platform: str,
+    songs_added: int,
+    songs_skipped: int,
+    errors: List[str],
+    near_duplicates: Optional[List[str]] = None,
+    near_duplicate_count: int = 0
+) -> Dict[str, Any]:
+    return {
+        "success": True,
+        "message": f"Successfully imported {songs_added} songs from {platform.replace('_', ' ').title()} playlist{near_duplicate_summary(near_duplicate_count)}",
+        "platform": platform,
+        "songs_added": songs_added,  
+        "songs_skipped": songs_skipped,
+        "errors": errors[:10],  # Limit error messages
+        "near_duplicates": (near_duplicates or [])[:10]
+    }
+
+@api_router.post("/songs/playlist/import")
+async def import_from_playlist(
+    import_data: PlaylistImport,
+    background: bool = False,  # Queue as a job and return its id instead of waiting for the import
+    musician_id: str = Depends(get_current_musician)
+):
+    """Import songs from Spotify or Apple Music playlist using web scraping"""
+    try:
+        playlist_url = import_data.playlist_url.strip()
+        platform = import_data.platform.lower()
+        playlist_id = parse_playlist_source(playlist_url, platform)
         
-        # Import songs into database
-        songs_added = 0
-        songs_skipped = 0
-        errors = []
+        if background:
+            job_id = await submit_job(musician_id, "playlist_import", {
+                "platform": platform,
+                "playlist_url": playlist_url,
+                "playlist_id": playlist_id
+            })
+            return job_submitted_response(job_id, "Playlist import queued")
         
-        for song_data in songs_to_import:
-            try:
-                # Enhance genre and mood assignment
-                enhanced_data = assign_genre_and_mood(song_data['title'], song_data['artist'])
-                
-                # Use enhanced data if original is generic
-                if song_data.get('genres') == ['Pop'] or not song_data.get('genres'):
-                    song_data['genres'] = [enhanced_data['genre']]
-                if song_data.get('moods') == ['Unknown'] or not song_data.get('moods'):
-                    song_data['moods'] = [enhanced_data['mood']]
-                
-                # Check for duplicates (same title and artist for this musician)
-                existing = await db.songs.find_one({
-                    "musician_id": musician_id,
-                    "title": {"$regex": f"^{re.escape(song_data['title'])}$", "$options": "i"},
-                    "artist": {"$regex": f"^{re.escape(song_data['artist'])}$", "$options": "i"}
-                })
-                
-                if existing:
-                    songs_skipped += 1
-                    errors.append(f"Skipped duplicate: '{song_data['title']}' by '{song_data['artist']}'")
-                    continue
-                
-                # Create song record
-                song_dict = {
-                    "id": str(uuid.uuid4()),
-                    "musician_id": musician_id,
-                    "title": song_data['title'],
-                    "artist": song_data['artist'],
-                    "genres": song_data.get('genres', ['Pop']),
-                    "moods": song_data.get('moods', ['Feel Good']),
-                    "year": int(song_data.get('year', 2023)) if song_data.get('year') else None,
-                    "notes": song_data.get('notes', ''),
-                    "created_at": datetime.utcnow()
-                }
-                
-                # Calculate decade from year
-                decade = calculate_decade(song_dict['year'])
-                song_dict['decade'] = decade
-                
-                # Insert into database
-                await db.songs.insert_one(song_dict)
-                songs_added += 1
-                
-            except Exception as e:
-                errors.append(f"Error importing '{song_data.get('title', 'Unknown')}': {str(e)}")
-                continue
+        songs_to_import = await fetch_playlist_songs(platform, playlist_url, playlist_id)
         
-        return {
-            "success": True,
-            "message": f"Successfully imported {songs_added} songs from {platform.replace('_', ' ').title()} playlist",
-            "platform": platform,
-            "songs_added": songs_added,  
-            "songs_skipped": songs_skipped,
-            "errors": errors[:10]  # Limit error messages
-        }
+        # Prepare rows for bulk ingestion
+        rows, errors = build_playlist_rows(songs_to_import)
+        
+        # Import songs into database, skipping duplicates (same title and artist for this musician)
+        ingestion = await ingest_songs(
+            musician_id,
+            rows,
+            duplicate_message=playlist_duplicate_message
+        )
+        errors.extend(ingestion['errors'])
+        
+        return playlist_import_result(
+            platform, ingestion['songs_added'], ingestion['duplicates'], errors,
+            near_duplicates=ingestion['near_duplicate_matches'], near_duplicate_count=ingestion['near_duplicates']
+        )
         
     except HTTPException:
         raise
@@ -2057,10 +2839,13 @@ async def check_payment_status(session_id: str, musician_id: str = Depends(get_c
         # If payment successful, activate subscription
         if status_response.payment_status == "paid":
             # Check if already processed to avoid double activation
-            existing_subscription = await db.musicians.find_one({
-                "id": musician_id,
-                "subscription_ends_at": {"$gte": datetime.utcnow()}
-            })
+            existing_subscription = await db.musicians.find_one(
+                {
+                    "id": musician_id,
+                    "subscription_ends_at": {"$gte": datetime.utcnow()}
+                },
+                musician_projection()
+            )
             
             if not existing_subscription:
                 # Activate 1-month subscription
@@ -2108,7 +2893,10 @@ async def create_song_suggestion(suggestion_data: dict):
                 raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
         
         # Get musician by slug
-        musician = await db.musicians.find_one({"slug": suggestion_data["musician_slug"]})
+        musician = await db.musicians.find_one(
+            {"slug": suggestion_data["musician_slug"]},
+            musician_projection("design_settings.allow_song_suggestions")
+        )
         if not musician:
             raise HTTPException(status_code=404, detail="Musician not found")
         
@@ -2178,11 +2966,10 @@ async def update_suggestion_status(
         # If adding to repertoire, create the song
         if new_status == "added":
             # Check if song already exists in musician's repertoire
-            existing_song = await db.songs.find_one({
-                "musician_id": musician_id,
-                "title": {"$regex": f"^{re.escape(suggestion['suggested_title'])}$", "$options": "i"},
-                "artist": {"$regex": f"^{re.escape(suggestion['suggested_artist'])}$", "$options": "i"}
-            })
+            existing_song = await db.songs.find_one(
+                duplicate_song_query(musician_id, suggestion['suggested_title'], suggestion['suggested_artist']),
+                {"_id": 1}
+            )
             
             if not existing_song:
                 # Add the suggested song to the repertoire with default values (no Spotify enrichment)
@@ -2198,9 +2985,15 @@ async def update_suggestion_status(
                     "notes": f"Added from audience suggestion by {suggestion['requester_name']}",
                     "request_count": 0,
                     "hidden": False,
-                    "created_at": datetime.utcnow()
+                    "created_at": datetime.utcnow(),
+                    **song_keys(suggestion["suggested_title"], suggestion["suggested_artist"])
                 }
-                await db.songs.insert_one(song_dict)
+                try:
+                    await db.songs.insert_one(song_dict)
+                    await bump_content_version(musician_id, song_id=song_dict["id"])
+                except DuplicateKeyError:
+                    # Added concurrently - the song is already in the repertoire
+                    pass
         
         # Update suggestion status
         await db.song_suggestions.update_one(
@@ -2231,31 +3024,111 @@ async def delete_song_suggestion(suggestion_id: str, musician_id: str = Depends(
         raise HTTPException(status_code=500, detail="Error deleting song suggestion")
 
 # Song endpoints
+# Song list pagination - keyset over (sort key, id) with an opaque cursor, plus optional field selection
+SONG_SORTS = {
+    "created_at": ("created_at", DESCENDING),
+    "popularity": ("request_count", DESCENDING),  # Most requested first
+    "title": ("title", ASCENDING),
+    "artist": ("artist", ASCENDING),
+    "year": ("year", DESCENDING),
+}
+SONG_PAGE_DEFAULT_LIMIT = 200
+SONG_PAGE_MAX_LIMIT = 1000
+
+def song_page_limit(limit: Optional[int], cursor: Optional[str]) -> Optional[int]:
+    """Page size, or None for the unpaginated list when neither limit nor cursor is given"""
+    if limit is None and cursor is None:
+        return None
+    if limit is None:
+        return SONG_PAGE_DEFAULT_LIMIT
+    if not 1 <= limit <= SONG_PAGE_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {SONG_PAGE_MAX_LIMIT}")
+    return limit
+
+def parse_song_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Requested Song fields from a comma-separated fields= parameter; id is always included"""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in Song.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown song fields: {', '.join(unknown)}")
+    return ["id"] + [field for field in requested if field != "id"]
+
+def encode_song_cursor(sort_by: str, value: Any, song_id: str) -> str:
+    if isinstance(value, datetime):
+        value = {"$date": value.isoformat()}
+    payload = json.dumps([sort_by, value, song_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_song_cursor(cursor: str, sort_by: str) -> Tuple[Any, str]:
+    """(sort value, song id) of the last song on the previous page"""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, song_id = json.loads(payload)
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["$date"])
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_sort != sort_by or not isinstance(song_id, str):
+        raise HTTPException(status_code=400, detail="Cursor does not match this sort order")
+    return value, song_id
+
+def keyset_after(field: str, direction: int, value: Any, song_id: str) -> Dict[str, Any]:
+    """Query for the songs that follow (value, song_id) in [(field, direction), ("id", direction)] order"""
+    op = "$lt" if direction == DESCENDING else "$gt"
+    same_value = {field: value, "id": {op: song_id}}
+    if value is None:
+        # Missing values sort before everything else: last when descending, first when ascending
+        return same_value if direction == DESCENDING else {"$or": [same_value, {field: {"$ne": None}}]}
+    clauses = [{field: {op: value}}, same_value]
+    if direction == DESCENDING:
+        clauses.append({field: None})
+    return {"$or": clauses}
+
+def project_song(song: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Selected fields of a song document, with Song defaults for any the document lacks"""
+    return {
+        field: song[field] if field in song else Song.model_fields[field].get_default(call_default_factory=True)
+        for field in fields
+    }
+
+def song_page_response(songs: List[Dict[str, Any]], next_cursor: Optional[str], headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    return JSONResponse(content={"songs": songs, "next_cursor": next_cursor}, headers=headers)
+
 @api_router.get("/songs", response_model=List[Song])
 async def get_my_songs(
     musician_id: str = Depends(get_current_musician),
-    sort_by: Optional[str] = "created_at"  # NEW: Support sorting by different fields
+    sort_by: Optional[str] = "created_at",  # NEW: Support sorting by different fields
+    limit: Optional[int] = None,  # Page size; with limit or cursor the response is {"songs": [...], "next_cursor": ...}
+    cursor: Optional[str] = None,  # next_cursor from the previous page
+    fields: Optional[str] = None  # Comma-separated Song fields to return, e.g. "title,artist"
 ):
-    """Get songs for authenticated musician with sorting support"""
-    # Determine sort field and direction
-    sort_field = "created_at"
-    sort_direction = DESCENDING
-    
-    if sort_by == "popularity":
-        sort_field = "request_count"
-        sort_direction = DESCENDING  # Most requested first
-    elif sort_by == "title":
-        sort_field = "title"
-        sort_direction = ASCENDING
-    elif sort_by == "artist":
-        sort_field = "artist"  
-        sort_direction = ASCENDING
-    elif sort_by == "year":
-        sort_field = "year"
-        sort_direction = DESCENDING
-    # Default: sort_by == "created_at" uses defaults above
-    
-    songs = await db.songs.find({"musician_id": musician_id}).sort(sort_field, sort_direction).to_list(None)  # Removed 1000 limit
+    """Get songs for authenticated musician with sorting support, optionally paginated"""
+    # Unknown sort values fall back to newest first
+    sort_field, sort_direction = SONG_SORTS.get(sort_by, SONG_SORTS["created_at"])
+    sort_by = sort_by if sort_by in SONG_SORTS else "created_at"
+    page_limit = song_page_limit(limit, cursor)
+    selected_fields = parse_song_fields(fields)
+    
+    query = {"musician_id": musician_id}
+    if cursor:
+        query.update(keyset_after(sort_field, sort_direction, *decode_song_cursor(cursor, sort_by)))
+    
+    projection = None
+    if selected_fields:
+        # year/decade are always read so the decade backfill below keeps working
+        projection = {"_id": 0, **{field: 1 for field in {*selected_fields, sort_field, "year", "decade"}}}
+    
+    songs_cursor = db.songs.find(query, projection).sort([(sort_field, sort_direction), ("id", sort_direction)])
+    if page_limit:
+        songs_cursor = songs_cursor.limit(page_limit + 1)  # One extra row tells whether another page exists
+    songs = await songs_cursor.to_list(None)
+    
+    next_cursor = None
+    if page_limit and len(songs) > page_limit:
+        songs = songs[:page_limit]
+        next_cursor = encode_song_cursor(sort_by, songs[-1].get(sort_field), songs[-1]["id"])
     
     # Ensure request_count and hidden fields exist for older songs
     # Update all existing songs to populate decade field for songs with years
@@ -2278,28 +3151,32 @@ async def get_my_songs(
             song["request_count"] = 0
         if "hidden" not in song:
             song["hidden"] = False  # Default to visible for older songs
-        updated_songs.append(Song(**song))
+        if selected_fields:
+            updated_songs.append(project_song(song, selected_fields))
+        else:
+            updated_songs.append(Song(**song))
     
     # Log migration if songs were updated
     if songs_updated > 0:
         logger.info(f"Migrated {songs_updated} songs to include decade field")
     
+    if page_limit:
+        return song_page_response(jsonable_encoder(updated_songs), next_cursor)
+    if selected_fields:
+        return JSONResponse(content=jsonable_encoder(updated_songs))
     return updated_songs
 
 @api_router.post("/songs", response_model=Song)
 async def create_song(song_data: SongCreate, musician_id: str = Depends(get_current_musician)):
     # Check for duplicates (same title and artist for this musician)
-    existing = await db.songs.find_one({
-        "musician_id": musician_id,
-        "title": {"$regex": f"^{re.escape(song_data.title)}$", "$options": "i"},
-        "artist": {"$regex": f"^{re.escape(song_data.artist)}$", "$options": "i"}
-    })
+    existing = await db.songs.find_one(
+        duplicate_song_query(musician_id, song_data.title, song_data.artist),
+        {"_id": 1}
+    )
     
+    duplicate_detail = f"Song '{song_data.title}' by '{song_data.artist}' already exists in your library"
     if existing:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Song '{song_data.title}' by '{song_data.artist}' already exists in your library"
-        )
+        raise HTTPException(status_code=400, detail=duplicate_detail)
     
     # Calculate decade from year
     decade = calculate_decade(song_data.year)
@@ -2311,12 +3188,45 @@ async def create_song(song_data: SongCreate, musician_id: str = Depends(get_curr
         "decade": decade,  # NEW: Auto-calculated decade
         "request_count": 0,  # Initialize request count
         "hidden": False,  # NEW: Default to visible
-        "created_at": datetime.utcnow()
+        "created_at": datetime.utcnow(),
+        **song_keys(song_data.title, song_data.artist)
     })
     
-    await db.songs.insert_one(song_dict)
+    try:
+        await db.songs.insert_one(song_dict)
+    except DuplicateKeyError:
+        # Lost a race with a concurrent insert of the same song
+        raise HTTPException(status_code=400, detail=duplicate_detail)
+    await bump_content_version(musician_id, song_id=song_dict["id"])
     return Song(**song_dict)
 
+async def find_batch_artist_conflict(musician_id: str, song_ids: List[str], artist_key: str) -> Optional[str]:
+    """Title of a song that giving every selected song this artist would duplicate, if any"""
+    selected = await db.songs.find(
+        {"id": {"$in": song_ids}, "musician_id": musician_id, "artist_key": {"$ne": artist_key}},
+        {"_id": 0, "title": 1, "title_key": 1}
+    ).to_list(None)
+    
+    # Two selected songs with the same title would end up identical. Only string keys can
+    # collide in the partial unique index - legacy duplicates keep a null or missing title_key
+    titles = {}
+    for song in selected:
+        title_key = song.get("title_key")
+        if not title_key:
+            continue
+        if title_key in titles:
+            return song["title"]
+        titles[title_key] = song["title"]
+    if not titles:
+        return None
+    
+    # ...as would a song already listed under the new artist
+    existing = await db.songs.find_one(
+        {"musician_id": musician_id, "artist_key": artist_key, "title_key": {"$in": list(titles)}},
+        {"_id": 0, "title": 1}
+    )
+    return existing["title"] if existing else None
+
 @api_router.put("/songs/batch-edit", response_model=BatchEditResponse)
 async def batch_edit_songs(
     batch_data: BatchEditRequest,
@@ -2359,6 +3269,7 @@ async def batch_edit_songs(
         # Handle artist
         if "artist" in updates and updates["artist"]:
             update_doc["artist"] = updates["artist"]
+            update_doc["artist_key"] = normalize_song_key(updates["artist"])
         
         # Handle year
         if "year" in updates and updates["year"]:
@@ -2375,15 +3286,30 @@ async def batch_edit_songs(
         if not update_doc:
             raise HTTPException(status_code=400, detail="No valid updates provided")
         
+        # update_many is not atomic, so reject an artist change that would collide before writing anything
+        if "artist_key" in update_doc:
+            conflict = await find_batch_artist_conflict(musician_id, song_ids, update_doc["artist_key"])
+            if conflict:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Changing the artist to '{updates['artist']}' would duplicate '{conflict}', no songs were changed"
+                )
+        
         # Update all selected songs that belong to the musician
-        result = await db.songs.update_many(
-            {
-                "id": {"$in": song_ids},
-                "musician_id": musician_id
-            },
-            {"$set": update_doc}
-        )
+        selection = {"id": {"$in": song_ids}, "musician_id": musician_id}
+        try:
+            result = await db.songs.update_many(selection, {"$set": update_doc})
+        except DuplicateKeyError:
+            # A concurrent write created the collision; songs before it were already updated
+            await bump_content_version(musician_id)
+            updated_count = await db.songs.count_documents({**selection, "artist_key": update_doc["artist_key"]})
+            raise HTTPException(
+                status_code=409,
+                detail=f"Updated {updated_count} of {len(song_ids)} songs, then changing the artist to '{updates['artist']}' would have duplicated a song already in your library"
+            )
         
+        if result.modified_count:
+            await bump_content_version(musician_id)
         logger.info(f"Batch edited {result.modified_count} songs for musician {musician_id}")
         return BatchEditResponse(
             success=True,
@@ -2405,18 +3331,17 @@ async def update_song(song_id: str, song_data: SongCreate, musician_id: str = De
         raise HTTPException(status_code=404, detail="Song not found")
     
     # Check for duplicates (excluding the current song being edited)
-    existing = await db.songs.find_one({
-        "musician_id": musician_id,
-        "id": {"$ne": song_id},  # Exclude current song
-        "title": {"$regex": f"^{re.escape(song_data.title)}$", "$options": "i"},
-        "artist": {"$regex": f"^{re.escape(song_data.artist)}$", "$options": "i"}
-    })
+    existing = await db.songs.find_one(
+        {
+            **duplicate_song_query(musician_id, song_data.title, song_data.artist),
+            "id": {"$ne": song_id}  # Exclude current song
+        },
+        {"_id": 1}
+    )
     
+    duplicate_detail = f"Another song '{song_data.title}' by '{song_data.artist}' already exists in your library"
     if existing:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Another song '{song_data.title}' by '{song_data.artist}' already exists in your library"
-        )
+        raise HTTPException(status_code=400, detail=duplicate_detail)
     
     # Calculate decade from year
     decade = calculate_decade(song_data.year)
@@ -2424,10 +3349,15 @@ async def update_song(song_id: str, song_data: SongCreate, musician_id: str = De
     # Update song
     update_data = song_data.dict()
     update_data["decade"] = decade  # NEW: Update decade when year changes
-    await db.songs.update_one(
-        {"id": song_id},
-        {"$set": update_data}
-    )
+    update_data.update(song_keys(song_data.title, song_data.artist))
+    try:
+        await db.songs.update_one(
+            {"id": song_id},
+            {"$set": update_data}
+        )
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail=duplicate_detail)
+    await bump_content_version(musician_id, song_id=song_id)
     
     # Return updated song
     updated_song = await db.songs.find_one({"id": song_id})
@@ -2440,6 +3370,7 @@ async def delete_song(song_id: str, musician_id: str = Depends(get_current_music
         result = await db.songs.delete_one({"id": song_id, "musician_id": musician_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Song not found")
+        await bump_content_version(musician_id, song_id=song_id)
         
         return {"message": "Song deleted successfully"}
     except HTTPException:
@@ -2472,6 +3403,7 @@ async def toggle_song_visibility(
             {"id": song_id},
             {"$set": {"hidden": new_hidden_status}}
         )
+        await bump_content_version(musician_id, song_id=song_id)
         
         action = "hidden" if new_hidden_status else "shown"
         logger.info(f"Song {song_id} {action} by musician {musician_id}")
@@ -2488,97 +3420,328 @@ async def toggle_song_visibility(
         logger.error(f"Error toggling song visibility: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error toggling song visibility: {str(e)}")
 
-@api_router.get("/musicians/{slug}/songs", response_model=List[Song])
-async def get_musician_songs(
-    slug: str,
-    search: Optional[str] = None,
-    genre: Optional[str] = None,
-    artist: Optional[str] = None,
-    mood: Optional[str] = None,
-    year: Optional[int] = None,
-    decade: Optional[str] = None  # NEW: Add decade filter parameter
-):
-    """Get songs for a musician with filtering and search support, filtered by active playlist"""
-    # Get musician
-    musician = await db.musicians.find_one({"slug": slug})
-    if not musician:
-        raise HTTPException(status_code=404, detail="Musician not found")
-    
-    # Base query for musician's songs - exclude hidden songs from audience view
+# Audience catalog snapshots - each musician's visible songs (after the active playlist),
+# pre-serialized with a search index and cached per process until content_version changes.
+# Single-song writes patch a cached snapshot in place instead of invalidating it (see bump_content_version)
+CATALOG_SNAPSHOT_MAX_MUSICIANS = 500
+CATALOG_SNAPSHOT_PROJECTION = {"_id": 0, "title_key": 0, "artist_key": 0}
+
+_catalog_snapshots: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_catalog_snapshot_builds: "Dict[Tuple[str, int], asyncio.Task]" = {}  # In-flight builds, shared by concurrent requests
+catalog_snapshot_stats = {"hits": 0, "builds": 0, "shared_builds": 0, "incremental_updates": 0, "searches": 0, "search_micros_total": 0, "search_micros_max": 0, "autocomplete_builds": 0}
+
+async def bump_content_version(musician_id: str, song_id: Optional[str] = None, catalog_changed: bool = True) -> None:
+    """Invalidate every cached view of a musician's public catalog (songs, filters, autocomplete).
+
+    Pass song_id when exactly one song was written, or catalog_changed=False when the
+    visible songs are unaffected, to keep this process's catalog snapshot current instead.
+    """
+    musician = await db.musicians.find_one_and_update(
+        {"id": musician_id},
+        {"$inc": {"content_version": 1}},
+        projection={"_id": 0, "content_version": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    snapshot = _catalog_snapshots.get(musician_id)
+    if not snapshot:
+        return
+    # Only a snapshot of the version just before this write can be patched; anything else missed other writes
+    if not musician or snapshot["version"] != musician["content_version"] - 1 or (catalog_changed and not song_id):
+        _catalog_snapshots.pop(musician_id, None)
+        return
+    if song_id:
+        song = await db.songs.find_one({"id": song_id, "musician_id": musician_id}, CATALOG_SNAPSHOT_PROJECTION)
+        if _catalog_snapshots.get(musician_id) is not snapshot or snapshot["version"] != musician["content_version"] - 1:
+            return  # Replaced or invalidated while the song was loading
+        update_catalog_snapshot_song(snapshot, song_id, song)
+        catalog_snapshot_stats["incremental_updates"] += 1
+    snapshot["version"] = musician["content_version"]
+
+def catalog_snapshot_entry(song: Dict[str, Any]) -> Dict[str, Any]:
+    song.setdefault("request_count", 0)
+    song.setdefault("hidden", False)  # Default to visible for older songs
+    # Ensure decade is present for backward compatibility
+    if "decade" not in song and song.get("year"):
+        song["decade"] = calculate_decade(song["year"])
+    model = Song(**song)
+    return {
+        "key": (model.created_at, model.id),  # Keyset pagination position
+        "data": model.model_dump(mode="json"),
+        "json": model.model_dump_json()
+    }
+
+CATALOG_SEARCH_FIELDS = ("title", "artist", "genres", "moods", "year")  # What index_catalog_song tokenizes
+
+def index_catalog_song(index: SongSearchIndex, entry: Dict[str, Any]) -> None:
+    data = entry["data"]
+    tags = data["genres"] + data["moods"] + ([str(data["year"])] if data["year"] else [])
+    index.add(data["id"], data["title"], data["artist"], tags, data["request_count"], entry["key"][0].timestamp())
+
+def update_catalog_snapshot_song(snapshot: Dict[str, Any], song_id: str, song: Optional[Dict[str, Any]]) -> None:
+    """Replace, insert or drop one song in a snapshot, given its current document (None if deleted)"""
+    songs = snapshot["songs"]
+    old_entry = snapshot["by_id"].pop(song_id, None)
+    old_data = old_entry["data"] if old_entry else None
+    position = next((i for i, entry in enumerate(songs) if entry is old_entry), None) if old_entry else None
+    
+    visible = song is not None and not song.get("hidden") and (snapshot["playlist_ids"] is None or song_id in snapshot["playlist_ids"])
+    # Autocomplete ranks by the live request_count, so only a new, removed or renamed song rebuilds it
+    if not (visible and old_data and (song["title"], song["artist"]) == (old_data["title"], old_data["artist"])):
+        snapshot["autocomplete"] = None
+    if not visible:
+        snapshot["index"].remove(song_id)
+        if position is not None:
+            del songs[position]
+        return
+    
+    entry = catalog_snapshot_entry(song)
+    if position is not None and entry["key"] == old_entry["key"]:
+        songs[position] = entry
+    else:
+        if position is not None:
+            del songs[position]
+        # Songs are ordered by (created_at, id) descending
+        songs.insert(next((i for i, other in enumerate(songs) if other["key"] < entry["key"]), len(songs)), entry)
+    snapshot["by_id"][song_id] = entry
+    # A request only changes request_count - skip re-tokenizing the song when nothing searchable moved
+    data = entry["data"]
+    if old_entry and entry["key"] == old_entry["key"] and all(data[field] == old_data[field] for field in CATALOG_SEARCH_FIELDS):
+        snapshot["index"].set_request_count(song_id, data["request_count"])
+    else:
+        index_catalog_song(snapshot["index"], entry)
+
+async def build_catalog_snapshot(musician: Dict[str, Any]) -> Dict[str, Any]:
     query = {
         "musician_id": musician["id"],
-        "hidden": {"$ne": True}  # NEW: Filter out hidden songs for audience
+        "hidden": {"$ne": True}  # Hidden songs never reach the audience
     }
     
-    # NEW: Filter by active playlist if set (Pro feature)
+    # Only songs in the active playlist when one is set (Pro feature); none if it is missing or empty
+    playlist_ids = None
     active_playlist_id = musician.get("active_playlist_id")
     if active_playlist_id:
-        # Get the active playlist
-        playlist = await db.playlists.find_one({"id": active_playlist_id, "musician_id": musician["id"]})
-        if playlist and playlist.get("song_ids"):
-            # Only show songs that are in the active playlist
-            query["id"] = {"$in": playlist["song_ids"]}
+        playlist = await db.playlists.find_one({"id": active_playlist_id, "musician_id": musician["id"]}, {"_id": 0, "song_ids": 1})
+        playlist_ids = set(playlist.get("song_ids") or []) if playlist else set()
+        if playlist_ids:
+            query["id"] = {"$in": list(playlist_ids)}
         else:
-            # If playlist not found or empty, show no songs
-            return []
-    
-    # Apply search across all fields (title, artist, genres, moods, year)
-    if search:
-        search_term = search.strip()
-        if search_term:
-            # Create search conditions for different fields
-            search_conditions = [
-                {"title": {"$regex": search_term, "$options": "i"}},  # Case insensitive title search
-                {"artist": {"$regex": search_term, "$options": "i"}},  # Case insensitive artist search
-                {"genres": {"$regex": search_term, "$options": "i"}},  # Case insensitive genre search
-                {"moods": {"$regex": search_term, "$options": "i"}},  # Case insensitive mood search
-            ]
-            
-            # Add year search if search term is numeric
-            try:
-                year_search = int(search_term)
-                search_conditions.append({"year": year_search})
-            except ValueError:
-                pass  # Not a number, skip year search
-            
-            # Use $or to search across all fields
-            query["$or"] = search_conditions
-    
-    # Apply additional filters with AND logic (these work with search)
-    if genre:
-        query["genres"] = {"$in": [genre]}
+            query = None
     
-    if artist:
-        query["artist"] = {"$regex": artist, "$options": "i"}  # Case insensitive partial match
+    songs = []
+    index = SongSearchIndex()
+    if query:
+        cursor = db.songs.find(query, CATALOG_SNAPSHOT_PROJECTION).sort([("created_at", DESCENDING), ("id", DESCENDING)])
+        async for song in cursor:
+            entry = catalog_snapshot_entry(song)
+            songs.append(entry)
+            index_catalog_song(index, entry)
     
-    if mood:
-        query["moods"] = {"$in": [mood]}
-    
-    if year:
-        query["year"] = year
-    
-    # NEW: Add decade filter
-    if decade:
-        query["decade"] = decade
-    
-    # Execute query and return all songs (removed 1000 limit for unlimited retrieval)
-    songs_cursor = db.songs.find(query).sort("created_at", DESCENDING)
-    songs = await songs_cursor.to_list(length=None)
+    return {
+        "version": musician.get("content_version", 0),
+        "songs": songs,
+        "by_id": {entry["data"]["id"]: entry for entry in songs},
+        "playlist_ids": playlist_ids,
+        "index": index,
+        "autocomplete": None  # PrefixIndex, built on the first autocomplete request
+    }
+
+async def get_catalog_snapshot(musician: Dict[str, Any]) -> Dict[str, Any]:
+    """Snapshot for a musician document projected with active_playlist_id and content_version"""
+    snapshot = _catalog_snapshots.get(musician["id"])
+    if snapshot and snapshot["version"] == musician.get("content_version", 0):
+        _catalog_snapshots.move_to_end(musician["id"])
+        catalog_snapshot_stats["hits"] += 1
+        return snapshot
+    
+    # One build per musician and version; everyone else who missed the cache awaits it
+    key = (musician["id"], musician.get("content_version", 0))
+    build = _catalog_snapshot_builds.get(key)
+    if build:
+        catalog_snapshot_stats["shared_builds"] += 1
+    else:
+        build = asyncio.create_task(cache_catalog_snapshot(musician))
+        _catalog_snapshot_builds[key] = build
+        build.add_done_callback(lambda _: _catalog_snapshot_builds.pop(key, None))
+    # Shielded so a disconnecting client does not cancel the build for the others
+    return await asyncio.shield(build)
+
+async def cache_catalog_snapshot(musician: Dict[str, Any]) -> Dict[str, Any]:
+    snapshot = await build_catalog_snapshot(musician)
+    catalog_snapshot_stats["builds"] += 1
+    current = _catalog_snapshots.get(musician["id"])
+    if current and current["version"] > snapshot["version"]:
+        return snapshot  # A newer snapshot was cached (or patched) while this one was building
+    _catalog_snapshots[musician["id"]] = snapshot
+    _catalog_snapshots.move_to_end(musician["id"])
+    while len(_catalog_snapshots) > CATALOG_SNAPSHOT_MAX_MUSICIANS:
+        _catalog_snapshots.popitem(last=False)
+    return snapshot
+
+def search_catalog_songs(snapshot: Dict[str, Any], search: str) -> Tuple[Optional[List[Dict[str, Any]]], int]:
+    """Snapshot songs matching the audience search, most relevant first (None if the query has no words), and the lookup time in microseconds"""
+    started = time.perf_counter()
+    song_ids = snapshot["index"].search(search)
+    micros = int((time.perf_counter() - started) * 1_000_000)
+    catalog_snapshot_stats["searches"] += 1
+    catalog_snapshot_stats["search_micros_total"] += micros
+    catalog_snapshot_stats["search_micros_max"] = max(catalog_snapshot_stats["search_micros_max"], micros)
+    if song_ids is None:
+        return None, micros
+    return [snapshot["by_id"][song_id] for song_id in song_ids], micros
+
+def filter_catalog_songs(
+    songs: List[Dict[str, Any]],
+    genre: Optional[str] = None,
+    artist: Optional[str] = None,
+    mood: Optional[str] = None,
+    year: Optional[int] = None,
+    decade: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Apply the audience filters with AND logic, keeping the order of songs"""
+    artist_term = artist.casefold() if artist else None  # Case insensitive partial match
     
-    # Update song counts for request tracking
-    updated_songs = []
+    matches = []
     for song in songs:
-        if "request_count" not in song:
-            song["request_count"] = 0
-        if "hidden" not in song:
-            song["hidden"] = False  # Default to visible for older songs
-        # Ensure decade is present for backward compatibility
-        if "decade" not in song and song.get("year"):
-            decade_calc = calculate_decade(song["year"])
-            song["decade"] = decade_calc
-        updated_songs.append(Song(**song))
+        data = song["data"]
+        if genre and genre not in data["genres"]:
+            continue
+        if artist_term and artist_term not in data["artist"].casefold():
+            continue
+        if mood and mood not in data["moods"]:
+            continue
+        if year and data["year"] != year:
+            continue
+        if decade and data["decade"] != decade:
+            continue
+        matches.append(song)
+    return matches
+
+def catalog_songs_response(songs: List[Dict[str, Any]], headers: Optional[Dict[str, str]] = None) -> Response:
+    """JSON array assembled from the snapshot's pre-serialized songs"""
+    return Response(content="[" + ",".join(song["json"] for song in songs) + "]", media_type="application/json", headers=headers)
+
+@api_router.get("/musicians/{slug}/songs", response_model=List[Song])
+async def get_musician_songs(
+    slug: str,
+    search: Optional[str] = None,
+    genre: Optional[str] = None,
+    artist: Optional[str] = None,
+    mood: Optional[str] = None,
+    year: Optional[int] = None,
+    decade: Optional[str] = None,  # NEW: Add decade filter parameter
+    limit: Optional[int] = None,  # Page size; with limit or cursor the response is {"songs": [...], "next_cursor": ...}
+    cursor: Optional[str] = None,  # next_cursor from the previous page
+    fields: Optional[str] = None,  # Comma-separated Song fields to return, e.g. "id,title,artist"
+    if_none_match: Optional[str] = Header(None)
+):
+    """Get songs for a musician with filtering and search support, filtered by active playlist"""
+    page_limit = song_page_limit(limit, cursor)
+    selected_fields = parse_song_fields(fields)
+    searching = bool(search and search.strip())
+    # Search results are ranked by relevance, so their pages continue from a position rather than a created_at key
+    after = decode_song_cursor(cursor, "relevance" if searching else "created_at") if cursor else None
+    musician = await db.musicians.find_one({"slug": slug}, musician_projection("active_playlist_id", "content_version"))
+    if not musician:
+        raise HTTPException(status_code=404, detail="Musician not found")
     
-    return updated_songs
+    # Filters are part of the URL, so one version-based ETag covers every filtered view
+    cache_headers = public_content_headers(musician, "songs")
+    cached = not_modified(cache_headers, if_none_match)
+    if cached:
+        return cached
+    
+    snapshot = await get_catalog_snapshot(musician)
+    songs = snapshot["songs"]
+    ranked = False
+    if searching:
+        matches, search_micros = search_catalog_songs(snapshot, search)
+        cache_headers = {**cache_headers, "X-Search-Time-Us": str(search_micros)}
+        if matches is not None:
+            songs, ranked = matches, True
+    songs = filter_catalog_songs(songs, genre=genre, artist=artist, mood=mood, year=year, decade=decade)
+    if page_limit is None and not selected_fields:
+        return catalog_songs_response(songs, headers=cache_headers)
+    
+    next_cursor = None
+    if page_limit:
+        if ranked:
+            start = 0
+            if after:
+                # Resume after the last song returned, or at the same offset if it has since dropped out
+                offset, last_id = after
+                start = next((i + 1 for i, song in enumerate(songs) if song["data"]["id"] == last_id), offset if isinstance(offset, int) else 0)
+            songs = songs[start:]
+        elif after:
+            # Snapshot songs are ordered by (created_at, id) descending
+            songs = [song for song in songs if song["key"] < after]
+        if len(songs) > page_limit:
+            songs = songs[:page_limit]
+            if ranked:
+                next_cursor = encode_song_cursor("relevance", start + page_limit, songs[-1]["data"]["id"])
+            else:
+                next_cursor = encode_song_cursor("created_at", *songs[-1]["key"])
+    
+    page = [project_song(song["data"], selected_fields) for song in songs] if selected_fields else [song["data"] for song in songs]
+    if page_limit:
+        return song_page_response(page, next_cursor, headers=cache_headers)
+    return JSONResponse(content=page, headers=cache_headers)
+
+# Search-as-you-type - top songs by popularity whose title or artist starts with the query,
+# from a sorted prefix index built lazily per catalog snapshot
+AUTOCOMPLETE_DEFAULT_LIMIT = 8
+AUTOCOMPLETE_MAX_LIMIT = 25
+AUTOCOMPLETE_LATENCY_WINDOW = 1000  # Recent lookups kept for the p99 in /debug/catalog-snapshots
+
+autocomplete_latencies_us: "deque[int]" = deque(maxlen=AUTOCOMPLETE_LATENCY_WINDOW)
+
+def get_autocomplete_index(snapshot: Dict[str, Any]) -> PrefixIndex:
+    if snapshot["autocomplete"] is None:
+        snapshot["autocomplete"] = PrefixIndex((entry["data"]["id"], entry["data"]["title"], entry["data"]["artist"]) for entry in snapshot["songs"])
+        catalog_snapshot_stats["autocomplete_builds"] += 1
+    return snapshot["autocomplete"]
+
+@api_router.get("/musicians/{slug}/autocomplete", response_model=List[AutocompleteSuggestion])
+async def autocomplete_musician_songs(
+    slug: str,
+    q: str = "",
+    limit: int = AUTOCOMPLETE_DEFAULT_LIMIT,
+    if_none_match: Optional[str] = Header(None)
+):
+    """Most requested audience-visible songs whose title or artist starts with q"""
+    if not 1 <= limit <= AUTOCOMPLETE_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {AUTOCOMPLETE_MAX_LIMIT}")
+    musician = await db.musicians.find_one({"slug": slug}, musician_projection("active_playlist_id", "content_version"))
+    if not musician:
+        raise HTTPException(status_code=404, detail="Musician not found")
+    
+    cache_headers = public_content_headers(musician, "autocomplete")
+    cached = not_modified(cache_headers, if_none_match)
+    if cached:
+        return cached
+    
+    snapshot = await get_catalog_snapshot(musician)
+    started = time.perf_counter()
+    by_id = snapshot["by_id"]
+    song_ids = get_autocomplete_index(snapshot).complete(q, lambda song_id: by_id[song_id]["data"]["request_count"], limit)
+    suggestions = [
+        {field: by_id[song_id]["data"][field] for field in ("id", "title", "artist", "request_count")}
+        for song_id in song_ids
+    ]
+    micros = int((time.perf_counter() - started) * 1_000_000)
+    autocomplete_latencies_us.append(micros)
+    return JSONResponse(content=suggestions, headers={**cache_headers, "X-Search-Time-Us": str(micros)})
+
+@api_router.get("/debug/catalog-snapshots")
+async def debug_catalog_snapshots():
+    """Snapshot cache and search counters for this process"""
+    searches = catalog_snapshot_stats["searches"]
+    return {
+        **catalog_snapshot_stats,
+        "search_micros_avg": round(catalog_snapshot_stats["search_micros_total"] / searches, 1) if searches else None,
+        "autocomplete_micros_p99": sorted(autocomplete_latencies_us)[int(len(autocomplete_latencies_us) * 0.99)] if autocomplete_latencies_us else None,
+        "cached_musicians": len(_catalog_snapshots),
+        "builds_in_flight": len(_catalog_snapshot_builds)
+    }
 
 # Request endpoints
 @api_router.post("/requests", response_model=Request)
@@ -2605,7 +3768,7 @@ async def create_request(request_data: RequestCreate):
     request_dict = request_data.dict()
     
     # NEW: Get musician's current active show and assign to request
-    musician = await db.musicians.find_one({"id": musician_id})
+    musician = await db.musicians.find_one({"id": musician_id}, musician_projection("current_show_name"))
     current_show_name = musician.get("current_show_name") if musician else None
     
     request_dict.update({
@@ -2627,6 +3790,7 @@ async def create_request(request_data: RequestCreate):
         {"id": request_data.song_id},
         {"$inc": {"request_count": 1}}
     )
+    await bump_content_version(musician_id, song_id=request_data.song_id)
     
     return Request(**request_dict)
 
@@ -2638,7 +3802,10 @@ async def create_musician_request(
 ):
     """Create a request for a specific musician via their slug (used by audience interface)"""
     # Get musician by slug
-    musician = await db.musicians.find_one({"slug": musician_slug})
+    musician = await db.musicians.find_one(
+        {"slug": musician_slug},
+        musician_projection("name", "slug", "current_show_name")
+    )
     if not musician:
         raise HTTPException(status_code=404, detail="Musician not found")
     
@@ -2681,6 +3848,7 @@ async def create_musician_request(
         {"id": request_data.song_id},
         {"$inc": {"request_count": 1}}
     )
+    await bump_content_version(musician_id, song_id=request_data.song_id)
     
     # Insert request
     await db.requests.insert_one(request_dict)
@@ -2937,13 +4105,19 @@ async def get_request_updates(musician_id: str):
 
 # Get available filter options for a musician
 @api_router.get("/musicians/{slug}/filters")
-async def get_filter_options(slug: str):
+async def get_filter_options(slug: str, response: Response, if_none_match: Optional[str] = Header(None)):
     """Get available filter options for a musician's songs"""
     # Get musician
-    musician = await db.musicians.find_one({"slug": slug})
+    musician = await db.musicians.find_one({"slug": slug}, musician_projection("content_version"))
     if not musician:
         raise HTTPException(status_code=404, detail="Musician not found")
     
+    cache_headers = public_content_headers(musician, "filters")
+    cached = not_modified(cache_headers, if_none_match)
+    if cached:
+        return cached
+    response.headers.update(cache_headers)
+    
     # Aggregate unique values
     pipeline = [
         {"$match": {"musician_id": musician["id"]}},
@@ -2986,38 +4160,106 @@ async def get_filter_options(slug: str):
     }
 
 # CSV Upload endpoints
+# Upload previews - parsed rows are staged under a short-lived token so the confirmed upload skips the re-send and re-parse
+UPLOAD_PREVIEW_TTL_MINUTES = 30
+UPLOAD_PREVIEW_COMMIT_MINUTES = 60  # Lease held while a preview is committed; its staged rows live at least this long
+
+async def save_upload_preview(
+    musician_id: str,
+    file_format: str,
+    upload_token: str,
+    total: int,
+    expires_at: datetime,
+    errors: Optional[List[str]] = None
+) -> None:
+    await db.upload_previews.insert_one({
+        "id": upload_token,
+        "musician_id": musician_id,
+        "format": file_format,
+        "total": total,
+        "errors": errors or [],
+        "created_at": datetime.utcnow(),
+        "expires_at": expires_at
+    })
+
+async def claim_upload_preview(musician_id: str, file_format: str, upload_token: str) -> Dict[str, Any]:
+    """Lease a staged preview for committing and keep its rows alive meanwhile.
+
+    The preview is only deleted by finish_upload_preview once the commit succeeds;
+    release_upload_preview hands it back after a failure so the token can be retried.
+    """
+    now = datetime.utcnow()
+    lease_until = now + timedelta(minutes=UPLOAD_PREVIEW_COMMIT_MINUTES)
+    preview = await db.upload_previews.find_one_and_update(
+        {
+            "id": upload_token,
+            "musician_id": musician_id,
+            "format": file_format,
+            "expires_at": {"$gt": now},
+            "claimed_until": {"$not": {"$gt": now}}  # Unclaimed, or the previous commit died holding it
+        },
+        {"$set": {"claimed_until": lease_until, "expires_at": lease_until}},
+        return_document=ReturnDocument.AFTER
+    )
+    if not preview:
+        if await db.upload_previews.find_one({"id": upload_token, "musician_id": musician_id, "expires_at": {"$gt": now}}, {"_id": 1}):
+            raise HTTPException(status_code=409, detail="This upload is already being imported")
+        raise HTTPException(status_code=404, detail="Upload preview not found or expired, please upload the file again")
+    # The TTL monitor must not remove rows while iterate_staged_rows is still reading them
+    await db.job_rows.update_many({"job_id": upload_token, "expires_at": {"$lt": lease_until}}, {"$set": {"expires_at": lease_until}})
+    return preview
+
+async def release_upload_preview(upload_token: str) -> None:
+    """Make a claimed preview committable again after a failed commit"""
+    expires_at = datetime.utcnow() + timedelta(minutes=UPLOAD_PREVIEW_TTL_MINUTES)
+    await db.upload_previews.update_one({"id": upload_token}, {"$set": {"expires_at": expires_at}, "$unset": {"claimed_until": ""}})
+    await db.job_rows.update_many({"job_id": upload_token, "expires_at": {"$lt": expires_at}}, {"$set": {"expires_at": expires_at}})
+
+async def finish_upload_preview(upload_token: str) -> None:
+    await db.upload_previews.delete_one({"id": upload_token})
+
+async def queue_staged_upload(musician_id: str, job_type: str, preview: Dict[str, Any], auto_enrich: bool) -> str:
+    """Hand a claimed preview's staged rows to a background job without copying them"""
+    job_id = preview["id"]
+    await db.job_rows.update_many(
+        {"job_id": job_id},
+        {"$set": {"expires_at": datetime.utcnow() + timedelta(days=JOB_RETENTION_DAYS)}}
+    )
+    await submit_job(musician_id, job_type, {"auto_enrich": auto_enrich}, job_id=job_id, total=preview["total"], errors=preview["errors"])
+    return job_id
+
 @api_router.post("/songs/csv/preview", response_model=CSVPreviewResponse)
 async def preview_csv_upload(
     file: UploadFile = File(...),
     musician_id: str = Depends(get_current_musician)
 ):
-    """Preview CSV upload without saving to database"""
+    """Preview CSV upload without saving to database; the parsed rows are kept for the upload step"""
     validate_csv_file(file)
     
     try:
-        content = await file.read()
-        result = parse_csv_content(content)
-        
-        # Return preview with first 10 rows
-        preview_songs = result['songs'][:10]
+        parse_state = new_csv_parse_state()
         preview = []
         
-        for song in preview_songs:
-            preview.append({
-                'title': song['title'],
-                'artist': song['artist'],
-                'genres': song['genres'],
-                'moods': song['moods'],
-                'year': song['year'],
-                'notes': song['notes'],
-                'row_number': song['row_number']
-            })
+        # Stream the whole file for accurate counts, keeping only the first 10 rows for display
+        async def preview_rows():
+            async for song in stream_csv_rows(file, parse_state):
+                if len(preview) < 10:
+                    preview.append(song)
+                yield song
+        
+        upload_token = new_job_id()
+        expires_at = datetime.utcnow() + timedelta(minutes=UPLOAD_PREVIEW_TTL_MINUTES)
+        total = await stage_job_rows(upload_token, preview_rows(), expires_at=expires_at)
+        errors = csv_error_messages(parse_state)
+        await save_upload_preview(musician_id, "csv", upload_token, total, expires_at, errors=errors)
         
         return CSVPreviewResponse(
             preview=preview,
-            total_rows=len(result['songs']) + len(result['errors']),
-            valid_rows=len(result['songs']),
-            errors=result['errors']
+            total_rows=parse_state['total_rows'],
+            valid_rows=parse_state['valid_rows'],
+            errors=errors,
+            upload_token=upload_token,
+            expires_at=expires_at
         )
         
     except ValueError as e:
@@ -3025,119 +4267,160 @@ async def preview_csv_upload(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
+def csv_song_enricher(enrichment: Dict[str, Any]):
+    """ingest_songs enrich hook filling empty CSV fields from Spotify; tallies into enrichment"""
+    async def enrich_csv_song(song_dict: Dict[str, Any], song_data: Dict[str, Any]):
+        try:
+            # Search for metadata if fields are missing or empty
+            needs_enrichment = (
+                not song_dict['genres'] or 
+                not song_dict['moods'] or 
+                not song_dict['year']
+            )
+            
+            if needs_enrichment:
+                logger.info(f"Auto-enriching metadata for '{song_dict['title']}' by '{song_dict['artist']}'")
+                
+                spotify_metadata = await search_spotify_metadata(
+                    song_dict['title'], 
+                    song_dict['artist']
+                )
+                
+                if spotify_metadata:
+                    # Only update empty/missing fields, preserve existing CSV data
+                    if not song_dict['genres'] and spotify_metadata.get('genres'):
+                        song_dict['genres'] = spotify_metadata['genres']
+                    if not song_dict['moods'] and spotify_metadata.get('moods'):
+                        song_dict['moods'] = spotify_metadata['moods']
+                    if not song_dict['year'] and spotify_metadata.get('year'):
+                        song_dict['year'] = spotify_metadata['year']
+                    
+                    # Add enrichment note
+                    enrichment_note = f" (Auto-enriched from {spotify_metadata.get('source', 'Spotify')})"
+                    if enrichment_note not in song_dict['notes']:
+                        song_dict['notes'] += enrichment_note
+                    
+                    enrichment['enriched'] += 1
+                    logger.info(f"Successfully enriched '{song_dict['title']}' - genres: {song_dict['genres']}, moods: {song_dict['moods']}, year: {song_dict['year']}")
+                else:
+                    if len(enrichment['errors']) < CSV_MAX_ERRORS:
+                        enrichment['errors'].append(f"Row {song_data['row_number']}: Could not find metadata for '{song_data['title']}' by '{song_data['artist']}'")
+                    logger.warning(f"No metadata found for '{song_dict['title']}' by '{song_dict['artist']}'")
+            
+        except Exception as e:
+            if len(enrichment['errors']) < CSV_MAX_ERRORS:
+                enrichment['errors'].append(f"Row {song_data['row_number']}: Error enriching '{song_data['title']}' by '{song_data['artist']}': {str(e)}")
+            logger.error(f"Error enriching metadata for '{song_dict['title']}': {str(e)}")
+    
+    return enrich_csv_song
+
+async def prefetch_csv_metadata(songs: List[Dict[str, Any]]) -> None:
+    await prefetch_spotify_metadata(songs, song_needs_enrichment)
+
+def csv_duplicate_message(row: Dict[str, Any]) -> str:
+    return f"Row {row['row_number']}: Duplicate song '{row['title']}' by '{row['artist']}' already exists"
+
+def csv_row_error_message(row: Dict[str, Any], error: str) -> str:
+    return f"Row {row['row_number']}: Error processing row - {error}"
+
+def enrichment_summary_message(auto_enrich: bool, enriched_count: int, warning_count: int) -> str:
+    if not auto_enrich:
+        return ""
+    message = f", {enriched_count} songs auto-enriched with metadata"
+    if warning_count:
+        message += f" ({warning_count} enrichment warnings)"
+    return message
+
 @api_router.post("/songs/csv/upload", response_model=CSVUploadResponse)
 async def upload_csv_songs(
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
     auto_enrich: bool = False,  # NEW: Optional parameter for automatic metadata enrichment
+    background: bool = False,  # Queue insertion/enrichment as a job and return its id
+    upload_token: Optional[str] = None,  # Token from /songs/csv/preview; commits the rows it parsed instead of a file
     musician_id: str = Depends(get_current_musician)
 ):
     """Upload and save songs from CSV file with optional automatic metadata enrichment"""
-    validate_csv_file(file)
+    preview = None
+    if upload_token:
+        preview = await claim_upload_preview(musician_id, "csv", upload_token)
+    elif file is None:
+        raise HTTPException(status_code=400, detail="Upload a CSV file or pass the upload_token from the preview")
+    else:
+        validate_csv_file(file)
     
     try:
-        content = await file.read()
-        result = parse_csv_content(content)
-        
-        songs_added = 0
-        enriched_count = 0
-        enrichment_errors = []
-        
-        # Insert valid songs into database
-        for song_data in result['songs']:
-            song_dict = {
-                "id": str(uuid.uuid4()),
-                "musician_id": musician_id,
-                "title": song_data['title'],
-                "artist": song_data['artist'],
-                "genres": song_data['genres'],
-                "moods": song_data['moods'],
-                "year": song_data['year'],
-                "notes": song_data['notes'],
-                "request_count": 0,
-                "created_at": datetime.utcnow()
-            }
-            
-            # NEW: Optional automatic metadata enrichment
-            if auto_enrich:
-                try:
-                    # Search for metadata if fields are missing or empty
-                    needs_enrichment = (
-                        not song_dict['genres'] or 
-                        not song_dict['moods'] or 
-                        not song_dict['year']
-                    )
-                    
-                    if needs_enrichment:
-                        logger.info(f"Auto-enriching metadata for '{song_dict['title']}' by '{song_dict['artist']}'")
-                        
-                        spotify_metadata = await search_spotify_metadata(
-                            song_dict['title'], 
-                            song_dict['artist']
-                        )
-                        
-                        if spotify_metadata:
-                            # Only update empty/missing fields, preserve existing CSV data
-                            if not song_dict['genres'] and spotify_metadata.get('genres'):
-                                song_dict['genres'] = spotify_metadata['genres']
-                            if not song_dict['moods'] and spotify_metadata.get('moods'):
-                                song_dict['moods'] = spotify_metadata['moods']
-                            if not song_dict['year'] and spotify_metadata.get('year'):
-                                song_dict['year'] = spotify_metadata['year']
-                            
-                            # Add enrichment note
-                            enrichment_note = f" (Auto-enriched from {spotify_metadata.get('source', 'Spotify')})"
-                            if enrichment_note not in song_dict['notes']:
-                                song_dict['notes'] += enrichment_note
-                            
-                            enriched_count += 1
-                            logger.info(f"Successfully enriched '{song_dict['title']}' - genres: {song_dict['genres']}, moods: {song_dict['moods']}, year: {song_dict['year']}")
-                        else:
-                            enrichment_errors.append(f"Row {song_data['row_number']}: Could not find metadata for '{song_data['title']}' by '{song_data['artist']}'")
-                            logger.warning(f"No metadata found for '{song_dict['title']}' by '{song_dict['artist']}'")
-                    
-                except Exception as e:
-                    enrichment_errors.append(f"Row {song_data['row_number']}: Error enriching '{song_data['title']}' by '{song_data['artist']}': {str(e)}")
-                    logger.error(f"Error enriching metadata for '{song_dict['title']}': {str(e)}")
-            
-            # Calculate decade from year
-            decade = calculate_decade(song_dict['year'])
-            song_dict['decade'] = decade
-            
-            # Check for duplicates (same title and artist for this musician)
-            existing = await db.songs.find_one({
-                "musician_id": musician_id,
-                "title": {"$regex": f"^{re.escape(song_data['title'])}$", "$options": "i"},
-                "artist": {"$regex": f"^{re.escape(song_data['artist'])}$", "$options": "i"}
-            })
-            
-            if not existing:
-                await db.songs.insert_one(song_dict)
-                songs_added += 1
+        parse_state = new_csv_parse_state()
+        
+        if background:
+            if preview:
+                job_id = await queue_staged_upload(musician_id, "csv_upload", preview, auto_enrich)
+                await finish_upload_preview(upload_token)
+                staged = preview["total"]
+                parse_errors = preview["errors"]
             else:
-                result['errors'].append(f"Row {song_data['row_number']}: Duplicate song '{song_data['title']}' by '{song_data['artist']}' already exists")
+                # Parse while the upload is still available; the job does the inserts and Spotify lookups
+                job_id = new_job_id()
+                staged = await stage_job_rows(job_id, stream_csv_rows(file, parse_state))
+                parse_errors = csv_error_messages(parse_state)
+                await submit_job(musician_id, "csv_upload", {"auto_enrich": auto_enrich}, job_id=job_id, total=staged, errors=parse_errors)
+            return CSVUploadResponse(
+                success=True,
+                message=f"Queued {staged} songs for import",
+                songs_added=0,
+                errors=parse_errors,
+                job_id=job_id
+            )
+        
+        enrichment = {"enriched": 0, "errors": []}
+        
+        # Insert valid songs into database, skipping duplicates (same title and artist for this musician)
+        # Rows are inserted chunk by chunk while the rest of the file is still being parsed
+        ingestion = await ingest_songs(
+            musician_id,
+            iterate_staged_rows(upload_token) if preview else rows_until_parse_error(stream_csv_rows(file, parse_state), parse_state),
+            enrich=csv_song_enricher(enrichment) if auto_enrich else None,  # NEW: Optional automatic metadata enrichment
+            prefetch=prefetch_csv_metadata,
+            duplicate_message=csv_duplicate_message,
+            error_message=csv_row_error_message,
+            max_errors=CSV_MAX_ERRORS
+        )
+        songs_added = ingestion['songs_added']
+        fatal_error = parse_state.get("fatal_error")
+        if fatal_error and not songs_added:
+            raise ValueError(fatal_error)
+        
+        if preview:
+            await db.job_rows.delete_many({"job_id": upload_token})
+            await finish_upload_preview(upload_token)
+            parse_errors = preview["errors"]
+        else:
+            parse_errors = csv_error_messages(parse_state)
         
         # Combine all errors
-        all_errors = result['errors'] + enrichment_errors
+        all_errors = ([fatal_error] if fatal_error else []) + parse_errors + ingestion['errors'] + enrichment['errors']
         
         # Create enrichment summary message
-        enrichment_message = ""
-        if auto_enrich:
-            enrichment_message = f", {enriched_count} songs auto-enriched with metadata"
-            if enrichment_errors:
-                enrichment_message += f" ({len(enrichment_errors)} enrichment warnings)"
-        
-        success_message = f"Successfully imported {songs_added} songs{enrichment_message}"
+        enrichment_message = enrichment_summary_message(auto_enrich, enrichment['enriched'], len(enrichment['errors']))
+        success_message = f"Successfully imported {songs_added} songs{near_duplicate_summary(ingestion['near_duplicates'])}{enrichment_message}"
+        if fatal_error:
+            # Rows before the unreadable part are already saved
+            success_message = f"Imported {songs_added} songs before the rest of the file could not be read{near_duplicate_summary(ingestion['near_duplicates'])}{enrichment_message}"
         
         return CSVUploadResponse(
-            success=True,
+            success=not fatal_error,
             message=success_message,
             songs_added=songs_added,
-            errors=all_errors
+            errors=all_errors,
+            near_duplicates=ingestion['near_duplicate_matches']
         )
         
     except ValueError as e:
+        if preview:
+            await release_upload_preview(upload_token)  # Already-imported rows are skipped as duplicates on retry
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
+        if preview:
+            await release_upload_preview(upload_token)
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
 # LST Upload endpoints  
@@ -3146,260 +4429,946 @@ async def preview_lst_upload(
     file: UploadFile = File(...),
     musician_id: str = Depends(get_current_musician)
 ):
-    """Preview LST upload without saving to database"""
+    """Preview LST upload without saving to database; the parsed songs are kept for the upload step"""
     validate_lst_file(file)
     
     try:
         songs = parse_lst_file(file)
         
+        upload_token = new_job_id()
+        expires_at = datetime.utcnow() + timedelta(minutes=UPLOAD_PREVIEW_TTL_MINUTES)
+        total = await stage_job_rows(upload_token, songs, expires_at=expires_at)
+        await save_upload_preview(musician_id, "lst", upload_token, total, expires_at)
+        
         return LSTPreviewResponse(
             success=True,
             songs=songs[:10],  # Show first 10 songs as preview
-            total_songs=len(songs)
+            total_songs=len(songs),
+            upload_token=upload_token,
+            expires_at=expires_at
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
+def lst_song_enricher(enrichment: Dict[str, Any]):
+    """ingest_songs enrich hook filling in the year for LST songs; tallies into enrichment"""
+    async def enrich_lst_song(song_dict: Dict[str, Any], song_data: Dict[str, Any]):
+        try:
+            # Search for metadata if fields are missing or empty
+            needs_enrichment = (
+                not song_dict['year']  # For LST files, mainly enrich year data
+            )
+            
+            if needs_enrichment:
+                logger.info(f"Auto-enriching metadata for '{song_dict['title']}' by '{song_dict['artist']}'")
+                
+                spotify_metadata = await search_spotify_metadata(
+                    song_dict['title'], 
+                    song_dict['artist']
+                )
+                
+                if spotify_metadata:
+                    # Update year (decade is recalculated by the ingestion pipeline)
+                    if not song_dict['year'] and spotify_metadata.get('year'):
+                        song_dict['year'] = spotify_metadata['year']
+                        enrichment['enriched'] += 1
+                        logger.info(f"Enriched '{song_dict['title']}' with year: {spotify_metadata['year']}")
+                    else:
+                        logger.info(f"No additional metadata found for '{song_dict['title']}'")
+                else:
+                    logger.info(f"No Spotify metadata found for '{song_dict['title']}'")
+        except Exception as enrichment_error:
+            error_msg = f"Enrichment failed for '{song_dict['title']}': {str(enrichment_error)}"
+            enrichment['errors'].append(error_msg)
+            logger.warning(error_msg)
+    
+    return enrich_lst_song
+
+async def prefetch_lst_metadata(songs: List[Dict[str, Any]]) -> None:
+    await prefetch_spotify_metadata(songs, lambda song: not song['year'])
+
 @api_router.post("/songs/lst/upload", response_model=LSTUploadResponse)
 async def upload_lst_songs(
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
     auto_enrich: bool = False,  # Optional parameter for automatic metadata enrichment
+    background: bool = False,  # Queue insertion/enrichment as a job and return its id
+    upload_token: Optional[str] = None,  # Token from /songs/lst/preview; commits the songs it parsed instead of a file
     musician_id: str = Depends(get_current_musician)
 ):
     """Upload and save songs from LST file with optional automatic metadata enrichment"""
-    validate_lst_file(file)
+    preview = None
+    if upload_token:
+        preview = await claim_upload_preview(musician_id, "lst", upload_token)
+    elif file is None:
+        raise HTTPException(status_code=400, detail="Upload a .lst file or pass the upload_token from the preview")
+    else:
+        validate_lst_file(file)
     
     try:
-        songs_data = parse_lst_file(file)
-        songs_added = 0
-        enriched_count = 0
-        enrichment_errors = []
+        # Songs from a preview were already parsed and classified, so they are read back as-is
+        songs_data = iterate_staged_rows(upload_token) if preview else parse_lst_file(file)
+        
+        if background:
+            if preview:
+                job_id = await queue_staged_upload(musician_id, "lst_upload", preview, auto_enrich)
+                await finish_upload_preview(upload_token)
+                staged = preview["total"]
+            else:
+                job_id = new_job_id()
+                staged = await stage_job_rows(job_id, songs_data)
+                await submit_job(musician_id, "lst_upload", {"auto_enrich": auto_enrich}, job_id=job_id, total=staged)
+            return LSTUploadResponse(
+                success=True,
+                message=f"Queued {staged} songs for import",
+                songs_added=0,
+                job_id=job_id
+            )
         
-        for song_data in songs_data:
-            try:
-                song_dict = {
-                    "id": str(uuid.uuid4()),
-                    "musician_id": musician_id,
-                    "title": song_data["title"],
-                    "artist": song_data["artist"],
-                    "genres": song_data["genres"],
-                    "moods": song_data["moods"],
-                    "year": song_data.get("year"),
-                    "decade": None,  # Will be calculated if year is available
-                    "notes": song_data.get("notes", ""),
-                    "request_count": 0,
-                    "hidden": False,
-                    "created_at": datetime.utcnow()
-                }
-                
-                # Calculate decade from year if available
-                if song_dict["year"]:
-                    song_dict["decade"] = calculate_decade(song_dict["year"])
-                
-                # Optional automatic metadata enrichment
-                if auto_enrich:
-                    try:
-                        # Search for metadata if fields are missing or empty
-                        needs_enrichment = (
-                            not song_dict['year']  # For LST files, mainly enrich year data
-                        )
-                        
-                        if needs_enrichment:
-                            logger.info(f"Auto-enriching metadata for '{song_dict['title']}' by '{song_dict['artist']}'")
-                            
-                            spotify_metadata = await search_spotify_metadata(
-                                song_dict['title'], 
-                                song_dict['artist']
-                            )
-                            
-                            if spotify_metadata:
-                                # Update year and recalculate decade
-                                if not song_dict['year'] and spotify_metadata.get('year'):
-                                    song_dict['year'] = spotify_metadata['year']
-                                    song_dict['decade'] = calculate_decade(spotify_metadata['year'])
-                                    enriched_count += 1
-                                    logger.info(f"Enriched '{song_dict['title']}' with year: {spotify_metadata['year']}")
-                                else:
-                                    logger.info(f"No additional metadata found for '{song_dict['title']}'")
-                            else:
-                                logger.info(f"No Spotify metadata found for '{song_dict['title']}'")
-                    except Exception as enrichment_error:
-                        error_msg = f"Enrichment failed for '{song_dict['title']}': {str(enrichment_error)}"
-                        enrichment_errors.append(error_msg)
-                        logger.warning(error_msg)
-                
-                # Insert song into database
-                await db.songs.insert_one(song_dict)
-                songs_added += 1
-                
-            except Exception as e:
-                logger.error(f"Error processing song '{song_data.get('title', 'unknown')}': {str(e)}")
-                continue
+        enrichment = {"enriched": 0, "errors": []}
+        ingestion = await ingest_songs(
+            musician_id,
+            songs_data,
+            enrich=lst_song_enricher(enrichment) if auto_enrich else None,
+            prefetch=prefetch_lst_metadata
+        )
+        songs_added = ingestion['songs_added']
+        if preview:
+            await db.job_rows.delete_many({"job_id": upload_token})
+            await finish_upload_preview(upload_token)
         
-        # Create enrichment summary message
-        enrichment_message = ""
-        if auto_enrich:
-            enrichment_message = f", {enriched_count} songs auto-enriched with metadata"
-            if enrichment_errors:
-                enrichment_message += f" ({len(enrichment_errors)} enrichment warnings)"
+        for error in ingestion['errors']:
+            logger.error(f"Error processing LST song: {error}")
+        if ingestion['duplicates']:
+            logger.info(f"Skipped {ingestion['duplicates']} duplicate songs from LST file")
         
-        success_message = f"Successfully imported {songs_added} songs from LST file{enrichment_message}"
+        # Create enrichment summary message
+        enrichment_message = enrichment_summary_message(auto_enrich, enrichment['enriched'], len(enrichment['errors']))
+        success_message = f"Successfully imported {songs_added} songs from LST file{near_duplicate_summary(ingestion['near_duplicates'])}{enrichment_message}"
         
         return LSTUploadResponse(
             success=True,
             message=success_message,
-            songs_added=songs_added
+            songs_added=songs_added,
+            near_duplicates=ingestion['near_duplicate_matches']
         )
         
     except ValueError as e:
+        if preview:
+            await release_upload_preview(upload_token)  # Already-imported rows are skipped as duplicates on retry
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
+        if preview:
+            await release_upload_preview(upload_token)
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
-# NEW: Batch metadata enrichment for existing songs
-@api_router.post("/songs/batch-enrich")
-async def batch_enrich_existing_songs(
-    song_ids: List[str] = None,  # Optional: specific song IDs to enrich, if None enrich all
+# Resumable chunked uploads - numbered, checksummed chunks are appended to a file on disk and
+# parsed/inserted as they arrive; the session document records the last acknowledged chunk
+UPLOAD_SESSION_DIR = Path(os.environ.get('UPLOAD_SESSION_DIR', ROOT_DIR / 'upload_sessions'))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_MIN_CHUNK_SIZE = 64 * 1024
+UPLOAD_MAX_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_SESSION_MAX_BYTES = 200 * 1024 * 1024
+UPLOAD_SESSION_TTL_HOURS = 24  # Sessions idle for this long are garbage-collected
+UPLOAD_SESSION_GC_INTERVAL_SECONDS = 600
+UPLOAD_SESSION_MAX_ERRORS = 100
+UPLOAD_SESSION_CATALOG_CACHE_SIZE = 16  # Sessions whose import catalog stays loaded between chunks
+
+_upload_session_catalogs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+_upload_gc_task: Optional[asyncio.Task] = None
+
+def upload_session_path(session_id: str) -> Path:
+    return UPLOAD_SESSION_DIR / f"{session_id}.part"
+
+def upload_session_status(session: Dict[str, Any]) -> UploadSessionStatus:
+    return UploadSessionStatus(
+        songs_added=session["totals"]["songs_added"],
+        duplicates=session["totals"]["duplicates"],
+        near_duplicates=session["totals"]["near_duplicates"],
+        **{field: session[field] for field in (
+            "id", "filename", "format", "state", "total_size", "chunk_size", "total_chunks",
+            "next_chunk", "bytes_received", "errors", "near_duplicate_matches", "result", "expires_at"
+        )}
+    )
+
+async def get_upload_session(musician_id: str, session_id: str) -> Dict[str, Any]:
+    session = await db.upload_sessions.find_one({"id": session_id, "musician_id": musician_id}, {"_id": 0})
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return session
+
+def write_upload_chunk(path: Path, offset: int, data: bytes) -> None:
+    """Write a chunk at its offset, dropping anything a previous interrupted attempt left past it"""
+    with open(path, 'r+b' if path.exists() else 'wb') as f:
+        f.seek(offset)
+        f.write(data)
+        f.truncate()
+
+def upload_ingest_options(file_format: str, auto_enrich: bool, enrichment: Dict[str, Any]) -> Dict[str, Any]:
+    """ingest_songs hooks matching the one-shot CSV/LST upload endpoints"""
+    if file_format == "csv":
+        return {
+            "enrich": csv_song_enricher(enrichment) if auto_enrich else None,
+            "prefetch": prefetch_csv_metadata,
+            "duplicate_message": csv_duplicate_message,
+            "error_message": csv_row_error_message,
+            "max_errors": CSV_MAX_ERRORS
+        }
+    return {"enrich": lst_song_enricher(enrichment) if auto_enrich else None, "prefetch": prefetch_lst_metadata}
+
+async def upload_session_catalog(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Import catalog shared by a session's chunks in this process, so the library is read once per upload rather than per chunk"""
+    catalog = _upload_session_catalogs.get(session["id"])
+    if catalog is None:
+        catalog = await load_import_catalog(session["musician_id"])
+        _upload_session_catalogs[session["id"]] = catalog
+        while len(_upload_session_catalogs) > UPLOAD_SESSION_CATALOG_CACHE_SIZE:
+            _upload_session_catalogs.popitem(last=False)
+    _upload_session_catalogs.move_to_end(session["id"])
+    return catalog
+
+async def ingest_upload_data(session: Dict[str, Any], data: bytes, final: bool = False) -> Tuple[Dict[str, Any], Dict[str, int], List[str], List[str]]:
+    """Parse the next bytes of a session and insert the rows they complete.
+
+    Returns the updated parse state, counter increments, new error messages and new
+    near-duplicate messages. The session itself is not modified, so a chunk that
+    fails here can be sent again.
+    """
+    parse_state = copy.deepcopy(session["parse_state"])
+    if session["format"] == "csv":
+        songs = parse_csv_bytes(data, parse_state, final=final)
+        parse_errors = parse_state["errors"][len(session["parse_state"]["errors"]):]
+        if final:
+            parse_errors += csv_error_messages(parse_state)[len(parse_state["errors"]):]  # Summary of dropped row errors
+    else:
+        songs = parse_lst_bytes(data, parse_state, final=final)
+        parse_errors = []
+    
+    enrichment = {"enriched": 0, "errors": []}
+    ingestion = await ingest_songs(
+        session["musician_id"],
+        songs,
+        catalog=await upload_session_catalog(session),  # Rows inserted by earlier chunks are already in it
+        **upload_ingest_options(session["format"], session["auto_enrich"], enrichment)
+    )
+    increments = {
+        "songs_added": ingestion["songs_added"],
+        "duplicates": ingestion["duplicates"],
+        "near_duplicates": ingestion["near_duplicates"],
+        "enriched": enrichment["enriched"],
+        "enrichment_warnings": len(enrichment["errors"])
+    }
+    return parse_state, increments, parse_errors + ingestion["errors"] + enrichment["errors"], ingestion["near_duplicate_matches"]
+
+def upload_session_update(
+    parse_state: Dict[str, Any],
+    increments: Dict[str, int],
+    errors: List[str],
+    near_duplicates: List[str],
+    **fields
+) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    update = {
+        "$set": {"parse_state": parse_state, "updated_at": now, "expires_at": now + timedelta(hours=UPLOAD_SESSION_TTL_HOURS), **fields},
+        "$inc": {f"totals.{field}": value for field, value in increments.items()}
+    }
+    if errors:
+        update.setdefault("$push", {})["errors"] = {"$each": errors, "$slice": UPLOAD_SESSION_MAX_ERRORS}
+    if near_duplicates:
+        update.setdefault("$push", {})["near_duplicate_matches"] = {"$each": near_duplicates, "$slice": NEAR_DUPLICATE_REPORT_LIMIT}
+    return update
+
+@api_router.post("/songs/uploads", response_model=UploadSessionStatus)
+async def create_upload_session(
+    upload: UploadSessionCreate,
     musician_id: str = Depends(get_current_musician)
 ):
-    """Batch enrich existing songs with metadata from Spotify"""
+    """Start a chunked upload of a CSV or LST file"""
+    filename = upload.filename.lower()
+    if filename.endswith('.csv'):
+        file_format = "csv"
+    elif filename.endswith('.lst'):
+        file_format = "lst"
+    else:
+        raise HTTPException(status_code=400, detail="File must be a CSV or .lst file")
+    if upload.total_size <= 0 or upload.total_size > UPLOAD_SESSION_MAX_BYTES:
+        raise HTTPException(status_code=400, detail=f"File size must be between 1 byte and {UPLOAD_SESSION_MAX_BYTES // (1024 * 1024)}MB")
+    
+    chunk_size = upload.chunk_size or UPLOAD_CHUNK_SIZE
+    if not UPLOAD_MIN_CHUNK_SIZE <= chunk_size <= UPLOAD_MAX_CHUNK_SIZE:
+        raise HTTPException(status_code=400, detail=f"Chunk size must be between {UPLOAD_MIN_CHUNK_SIZE} and {UPLOAD_MAX_CHUNK_SIZE} bytes")
+    
+    now = datetime.utcnow()
+    session = {
+        "id": str(uuid.uuid4()),
+        "musician_id": musician_id,
+        "filename": upload.filename,
+        "format": file_format,
+        "auto_enrich": upload.auto_enrich,
+        "state": "receiving",
+        "total_size": upload.total_size,
+        "chunk_size": chunk_size,
+        "total_chunks": -(-upload.total_size // chunk_size),
+        "next_chunk": 0,
+        "bytes_received": 0,
+        "parse_state": new_csv_parse_state() if file_format == "csv" else new_lst_parse_state(),
+        "totals": {"songs_added": 0, "duplicates": 0, "near_duplicates": 0, "enriched": 0, "enrichment_warnings": 0},
+        "errors": [],
+        "near_duplicate_matches": [],
+        "result": None,
+        "created_at": now,
+        "updated_at": now,
+        "expires_at": now + timedelta(hours=UPLOAD_SESSION_TTL_HOURS)
+    }
+    await db.upload_sessions.insert_one(dict(session))
+    return upload_session_status(session)
+
+@api_router.get("/songs/uploads/{session_id}", response_model=UploadSessionStatus)
+async def get_upload_session_status(session_id: str, musician_id: str = Depends(get_current_musician)):
+    """Progress of a chunked upload; next_chunk is where an interrupted client resumes"""
+    return upload_session_status(await get_upload_session(musician_id, session_id))
+
+@api_router.put("/songs/uploads/{session_id}/chunks/{index}", response_model=UploadSessionStatus)
+async def put_upload_chunk(
+    session_id: str,
+    index: int,
+    chunk: UploadFile = File(...),
+    x_chunk_sha256: str = Header(...),  # Hex SHA-256 of the chunk bytes
+    musician_id: str = Depends(get_current_musician)
+):
+    """Store chunk `index` of an upload and import the rows it completes.
+
+    Chunks must arrive in order. Re-sending an acknowledged chunk is a no-op, so a
+    client that lost a response can simply retry.
+    """
+    session = await get_upload_session(musician_id, session_id)
+    if session["state"] != "receiving":
+        raise HTTPException(status_code=409, detail="Upload session is already finalized")
+    if index < session["next_chunk"]:
+        return upload_session_status(session)
+    if index != session["next_chunk"] or index >= session["total_chunks"]:
+        raise HTTPException(status_code=409, detail=f"Expected chunk {session['next_chunk']}")
+    
+    data = await chunk.read()
+    offset = index * session["chunk_size"]
+    if len(data) != min(session["chunk_size"], session["total_size"] - offset):
+        raise HTTPException(status_code=400, detail="Chunk size does not match the session")
+    if hashlib.sha256(data).hexdigest() != x_chunk_sha256.strip().lower():
+        raise HTTPException(status_code=400, detail="Chunk checksum mismatch")
+    
+    UPLOAD_SESSION_DIR.mkdir(parents=True, exist_ok=True)
+    await asyncio.to_thread(write_upload_chunk, upload_session_path(session_id), offset, data)
+    
     try:
-        # Build query based on whether specific song IDs are provided
-        if song_ids:
-            # Enrich specific songs
-            query = {
-                "musician_id": musician_id,
-                "id": {"$in": song_ids}
-            }
-            logger.info(f"Starting batch enrichment for {len(song_ids)} specific songs")
-        else:
-            # Enrich all songs for this musician that need enrichment
-            query = {
-                "musician_id": musician_id,
-                "$or": [
-                    {"genres": {"$size": 0}},  # Empty genres array
-                    {"genres": {"$exists": False}},  # Missing genres field
-                    {"moods": {"$size": 0}},   # Empty moods array
-                    {"moods": {"$exists": False}},   # Missing moods field
-                    {"year": {"$exists": False}},    # Missing year
-                    {"year": None}                   # Null year
-                ]
-            }
-            logger.info(f"Starting batch enrichment for all songs needing metadata")
-        
-        # Get songs that need enrichment
-        songs_cursor = db.songs.find(query)
-        songs_to_enrich = await songs_cursor.to_list(length=None)
-        
-        if not songs_to_enrich:
-            return {
-                "success": True,
-                "message": "No songs found that need enrichment",
-                "processed": 0,
-                "enriched": 0,
-                "errors": []
-            }
-        
-        processed_count = 0
-        enriched_count = 0
-        errors = []
-        
-        logger.info(f"Found {len(songs_to_enrich)} songs to process for enrichment")
+        parse_state, increments, errors, near_duplicates = await ingest_upload_data(session, data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Only acknowledge if no concurrent retry of the same chunk got there first
+    # (rows it inserted are skipped as duplicates by the other attempt)
+    update = upload_session_update(parse_state, increments, errors, near_duplicates, next_chunk=index + 1, bytes_received=offset + len(data))
+    updated = await db.upload_sessions.find_one_and_update(
+        {"id": session_id, "next_chunk": index},
+        update,
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    return upload_session_status(updated or await get_upload_session(musician_id, session_id))
+
+@api_router.post("/songs/uploads/{session_id}/finalize", response_model=UploadSessionStatus)
+async def finalize_upload_session(session_id: str, musician_id: str = Depends(get_current_musician)):
+    """Import any trailing partial row once every chunk is in and close the session"""
+    session = await get_upload_session(musician_id, session_id)
+    if session["state"] == "complete":
+        return upload_session_status(session)
+    if session["next_chunk"] < session["total_chunks"]:
+        raise HTTPException(status_code=409, detail=f"Upload incomplete, expected chunk {session['next_chunk']}")
+    
+    path = upload_session_path(session_id)
+    if not path.exists() or path.stat().st_size != session["total_size"]:
+        raise HTTPException(status_code=409, detail="Uploaded file is incomplete, please start the upload again")
+    
+    try:
+        parse_state, increments, errors, near_duplicates = await ingest_upload_data(session, b"", final=True)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    totals = {field: session["totals"][field] + increments[field] for field in increments}
+    enrichment_message = enrichment_summary_message(session["auto_enrich"], totals["enriched"], totals["enrichment_warnings"])
+    source = " from LST file" if session["format"] == "lst" else ""
+    result = {
+        "success": True,
+        "message": f"Successfully imported {totals['songs_added']} songs{source}{near_duplicate_summary(totals['near_duplicates'])}{enrichment_message}",
+        "songs_added": totals["songs_added"]
+    }
+    update = upload_session_update(parse_state, increments, errors, near_duplicates, state="complete", result=result)
+    updated = await db.upload_sessions.find_one_and_update(
+        {"id": session_id, "state": "receiving"},
+        update,
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    path.unlink(missing_ok=True)
+    _upload_session_catalogs.pop(session_id, None)
+    return upload_session_status(updated or await get_upload_session(musician_id, session_id))
+
+@api_router.delete("/songs/uploads/{session_id}")
+async def abort_upload_session(session_id: str, musician_id: str = Depends(get_current_musician)):
+    """Abandon a chunked upload; rows from acknowledged chunks stay imported"""
+    await get_upload_session(musician_id, session_id)
+    await db.upload_sessions.delete_one({"id": session_id})
+    upload_session_path(session_id).unlink(missing_ok=True)
+    _upload_session_catalogs.pop(session_id, None)
+    return {"success": True, "message": "Upload session deleted"}
+
+async def cleanup_upload_sessions() -> int:
+    """Delete expired sessions and any session file without a live session; returns sessions removed"""
+    removed = 0
+    async for session in db.upload_sessions.find({"expires_at": {"$lt": datetime.utcnow()}}, {"_id": 0, "id": 1}):
+        upload_session_path(session["id"]).unlink(missing_ok=True)
+        await db.upload_sessions.delete_one({"id": session["id"]})
+        _upload_session_catalogs.pop(session["id"], None)
+        removed += 1
+    
+    if UPLOAD_SESSION_DIR.exists():
+        cutoff = time.time() - UPLOAD_SESSION_TTL_HOURS * 3600
+        for path in UPLOAD_SESSION_DIR.glob("*.part"):
+            if path.stat().st_mtime < cutoff and not await db.upload_sessions.find_one({"id": path.stem}, {"_id": 1}):
+                path.unlink(missing_ok=True)
+    return removed
+
+async def upload_session_gc_loop() -> None:
+    while True:
+        try:
+            removed = await cleanup_upload_sessions()
+            if removed:
+                logger.info(f"Garbage-collected {removed} abandoned upload sessions")
+        except Exception as e:
+            logger.error(f"Error cleaning up upload sessions: {str(e)}")
+        await asyncio.sleep(UPLOAD_SESSION_GC_INTERVAL_SECONDS)
+
+# Batch enrichment engine - bounded concurrent Spotify lookups, updates flushed through bulk_write
+ENRICH_CONCURRENCY = int(os.environ.get('ENRICH_CONCURRENCY', '8'))
+ENRICH_WRITE_BATCH_SIZE = 200
+ENRICH_SONG_PROJECTION = {"_id": 0, "id": 1, "title": 1, "artist": 1, "genres": 1, "moods": 1, "year": 1, "decade": 1, "notes": 1}
+
+def song_needs_enrichment(song: dict) -> bool:
+    return not song.get('genres') or not song.get('moods') or not song.get('year')
+
+def build_enrichment_update(song: dict, spotify_metadata: dict) -> Tuple[Dict[str, Any], List[str]]:
+    """Fields to $set on an existing song - only empty/missing data is filled in"""
+    update_fields = {}
+    updated_fields = []
+    
+    if not song.get('genres') and spotify_metadata.get('genres'):
+        update_fields['genres'] = spotify_metadata['genres']
+        updated_fields.append(f"genres: {spotify_metadata['genres']}")
+    
+    if not song.get('moods') and spotify_metadata.get('moods'):
+        update_fields['moods'] = spotify_metadata['moods']
+        updated_fields.append(f"moods: {spotify_metadata['moods']}")
+    
+    if not song.get('year') and spotify_metadata.get('year'):
+        update_fields['year'] = spotify_metadata['year']
+        updated_fields.append(f"year: {spotify_metadata['year']}")
+    
+    # Calculate and update decade if year was updated or missing
+    if 'year' in update_fields or not song.get('decade'):
+        decade = calculate_decade(update_fields.get('year', song.get('year')))
+        if decade:
+            update_fields['decade'] = decade
+            updated_fields.append(f"decade: {decade}")
+    
+    # Add enrichment note to existing notes
+    current_notes = song.get('notes', '')
+    enrichment_note = f" (Batch auto-enriched from {spotify_metadata.get('source', 'Spotify')})"
+    if enrichment_note not in current_notes:
+        update_fields['notes'] = current_notes + enrichment_note
+    
+    return update_fields, updated_fields
+
+async def enrich_songs(
+    songs: List[dict],
+    concurrency: int = ENRICH_CONCURRENCY,
+    write_batch_size: int = ENRICH_WRITE_BATCH_SIZE,
+    progress=None
+) -> Dict[str, Any]:
+    """Enrich existing songs; returns processed/enriched/errors plus throughput stats.
+
+    Songs go through search_spotify_metadata_many one audio-features batch at a time
+    (concurrent searches, then batched lookups); updates are flushed with bulk_write.
+    progress(counts), if given, is awaited after every batch.
+    """
+    pending_writes: List[UpdateOne] = []
+    summary = {"processed": 0, "enriched": 0, "errors": []}
+    rate_limited_before = _spotify_backoff["rate_limited"]
+    requests_before = spotify_request_count["total"]
+    started = time.monotonic()
+    
+    async def flush_writes() -> None:
+        batch = pending_writes[:]
+        pending_writes.clear()
+        if not batch:
+            return
+        try:
+            await db.songs.bulk_write(batch, ordered=False)
+        except Exception as e:
+            summary["enriched"] -= len(batch)
+            error_msg = f"Error saving {len(batch)} enriched songs: {str(e)}"
+            summary["errors"].append(error_msg)
+            logger.error(error_msg)
+    
+    for start in range(0, len(songs), SPOTIFY_AUDIO_FEATURES_BATCH_SIZE):
+        batch = songs[start:start + SPOTIFY_AUDIO_FEATURES_BATCH_SIZE]
+        summary["processed"] += len(batch)
+        
+        to_enrich = []
+        for song in batch:
+            if song_needs_enrichment(song):
+                to_enrich.append(song)
+            else:
+                logger.info(f"Song '{song['title']}' by '{song['artist']}' already has complete metadata")
         
-        for song in songs_to_enrich:
-            processed_count += 1
-            
+        try:
+            results = await search_spotify_metadata_many([(song['title'], song['artist']) for song in to_enrich], concurrency)
+        except Exception as e:
+            for song in to_enrich:
+                summary["errors"].append(f"Error enriching '{song['title']}' by '{song['artist']}': {str(e)}")
+            logger.error(f"Error enriching batch of {len(to_enrich)} songs: {str(e)}")
+            results = []
+        
+        for song, spotify_metadata in zip(to_enrich, results):
             try:
-                # Check if this song actually needs enrichment
-                needs_enrichment = (
-                    not song.get('genres') or 
-                    not song.get('moods') or 
-                    not song.get('year')
-                )
-                
-                if not needs_enrichment:
-                    logger.info(f"Song '{song['title']}' by '{song['artist']}' already has complete metadata")
-                    continue
-                
-                logger.info(f"Enriching '{song['title']}' by '{song['artist']}' (ID: {song['id']})")
-                
-                # Search for metadata using Spotify
-                spotify_metadata = await search_spotify_metadata(
-                    song['title'], 
-                    song['artist']
-                )
-                
-                if spotify_metadata:
-                    # Prepare update fields - only update empty/missing data
-                    update_fields = {}
-                    updated_fields = []
-                    
-                    if not song.get('genres') and spotify_metadata.get('genres'):
-                        update_fields['genres'] = spotify_metadata['genres']
-                        updated_fields.append(f"genres: {spotify_metadata['genres']}")
-                    
-                    if not song.get('moods') and spotify_metadata.get('moods'):
-                        update_fields['moods'] = spotify_metadata['moods']
-                        updated_fields.append(f"moods: {spotify_metadata['moods']}")
-                    
-                    if not song.get('year') and spotify_metadata.get('year'):
-                        update_fields['year'] = spotify_metadata['year']
-                        updated_fields.append(f"year: {spotify_metadata['year']}")
-                    
-                    # Calculate and update decade if year was updated or missing
-                    if 'year' in update_fields or not song.get('decade'):
-                        decade = calculate_decade(update_fields.get('year', song.get('year')))
-                        if decade:
-                            update_fields['decade'] = decade
-                            updated_fields.append(f"decade: {decade}")
-                    
-                    # Add enrichment note to existing notes
-                    current_notes = song.get('notes', '')
-                    enrichment_note = f" (Batch auto-enriched from {spotify_metadata.get('source', 'Spotify')})"
-                    if enrichment_note not in current_notes:
-                        update_fields['notes'] = current_notes + enrichment_note
-                    
-                    # Update the song in database if we have updates
-                    if update_fields:
-                        await db.songs.update_one(
-                            {"id": song['id']},
-                            {"$set": update_fields}
-                        )
-                        enriched_count += 1
-                        logger.info(f"Successfully enriched '{song['title']}' - updated: {', '.join(updated_fields)}")
-                    else:
-                        logger.info(f"No updates needed for '{song['title']}' - already complete")
-                        
-                else:
+                if not spotify_metadata:
                     error_msg = f"No metadata found for '{song['title']}' by '{song['artist']}'"
-                    errors.append(error_msg)
+                    summary["errors"].append(error_msg)
                     logger.warning(error_msg)
+                    continue
+                
+                update_fields, updated_fields = build_enrichment_update(song, spotify_metadata)
+                if not update_fields:
+                    logger.info(f"No updates needed for '{song['title']}' - already complete")
+                    continue
                 
+                pending_writes.append(UpdateOne({"id": song['id']}, {"$set": update_fields}))
+                summary["enriched"] += 1
+                logger.info(f"Enriched '{song['title']}' - updated: {', '.join(updated_fields)}")
             except Exception as e:
                 error_msg = f"Error enriching '{song['title']}' by '{song['artist']}': {str(e)}"
-                errors.append(error_msg)
+                summary["errors"].append(error_msg)
                 logger.error(error_msg)
         
-        success_message = f"Processed {processed_count} songs, successfully enriched {enriched_count} songs with metadata"
-        if errors:
-            success_message += f", {len(errors)} songs could not be enriched"
-        
-        logger.info(f"Batch enrichment completed: {success_message}")
-        
+        if len(pending_writes) >= write_batch_size:
+            await flush_writes()
+        if progress:
+            await progress({"total": len(songs), "processed": summary["processed"], "enriched": summary["enriched"], "error_count": len(summary["errors"])})
+    
+    await flush_writes()
+    
+    elapsed = time.monotonic() - started
+    summary["stats"] = {
+        "elapsed_seconds": round(elapsed, 3),
+        "songs_per_second": round(summary["processed"] / elapsed, 2) if elapsed > 0 else None,
+        "concurrency": max(1, concurrency),
+        "spotify_requests": spotify_request_count["total"] - requests_before,
+        "rate_limited": _spotify_backoff["rate_limited"] - rate_limited_before
+    }
+    return summary
+
+async def run_batch_enrich(musician_id: str, song_ids: Optional[List[str]] = None, progress=None) -> Dict[str, Any]:
+    """Enrich a musician's songs (all that need it, or just song_ids) and summarise the run"""
+    # Build query based on whether specific song IDs are provided
+    if song_ids:
+        # Enrich specific songs
+        query = {
+            "musician_id": musician_id,
+            "id": {"$in": song_ids}
+        }
+        logger.info(f"Starting batch enrichment for {len(song_ids)} specific songs")
+    else:
+        # Enrich all songs for this musician that need enrichment
+        query = {
+            "musician_id": musician_id,
+            "$or": [
+                {"genres": {"$size": 0}},  # Empty genres array
+                {"genres": {"$exists": False}},  # Missing genres field
+                {"moods": {"$size": 0}},   # Empty moods array
+                {"moods": {"$exists": False}},   # Missing moods field
+                {"year": {"$exists": False}},    # Missing year
+                {"year": None}                   # Null year
+            ]
+        }
+        logger.info(f"Starting batch enrichment for all songs needing metadata")
+    
+    # Get songs that need enrichment
+    songs_cursor = db.songs.find(query, ENRICH_SONG_PROJECTION)
+    songs_to_enrich = await songs_cursor.to_list(length=None)
+    
+    if not songs_to_enrich:
         return {
             "success": True,
-            "message": success_message,
-            "processed": processed_count,
-            "enriched": enriched_count,
-            "errors": errors[:10]  # Return only first 10 errors to avoid huge responses
+            "message": "No songs found that need enrichment",
+            "processed": 0,
+            "enriched": 0,
+            "errors": []
         }
+    
+    logger.info(f"Found {len(songs_to_enrich)} songs to process for enrichment")
+    
+    result = await enrich_songs(songs_to_enrich, progress=progress)
+    processed_count = result['processed']
+    enriched_count = result['enriched']
+    errors = result['errors']
+    if enriched_count:
+        await bump_content_version(musician_id)
+    
+    success_message = f"Processed {processed_count} songs, successfully enriched {enriched_count} songs with metadata"
+    if errors:
+        success_message += f", {len(errors)} songs could not be enriched"
+    
+    logger.info(f"Batch enrichment completed: {success_message}")
+    
+    return {
+        "success": True,
+        "message": success_message,
+        "processed": processed_count,
+        "enriched": enriched_count,
+        "errors": errors[:10],  # Return only first 10 errors to avoid huge responses
+        "stats": result['stats']
+    }
+
+# NEW: Batch metadata enrichment for existing songs
+@api_router.post("/songs/batch-enrich")
+async def batch_enrich_existing_songs(
+    song_ids: List[str] = None,  # Optional: specific song IDs to enrich, if None enrich all
+    background: bool = False,  # Queue as a job and return its id instead of waiting for Spotify
+    musician_id: str = Depends(get_current_musician)
+):
+    """Batch enrich existing songs with metadata from Spotify"""
+    try:
+        if background:
+            job_id = await submit_job(musician_id, "batch_enrich", {"song_ids": song_ids})
+            return job_submitted_response(job_id, "Batch enrichment queued")
+        return await run_batch_enrich(musician_id, song_ids)
         
     except Exception as e:
         logger.error(f"Error in batch enrichment: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error in batch enrichment: {str(e)}")
 
+# Background jobs - Mongo-persisted job documents worked by an asyncio loop (in-process or worker.py)
+JOB_WORKER_MODE = os.environ.get('JOB_WORKER_MODE', 'inline')  # "inline" runs jobs in the API process, "external" leaves them to worker.py
+JOB_WORKER_CONCURRENCY = int(os.environ.get('JOB_WORKER_CONCURRENCY', '2'))
+JOB_POLL_INTERVAL_SECONDS = 2.0
+JOB_HEARTBEAT_SECONDS = 15
+JOB_STALE_SECONDS = 60  # A running job without a heartbeat for this long is reclaimed and resumed
+JOB_MAX_ATTEMPTS = 3
+JOB_MAX_ERRORS = 100
+JOB_RETENTION_DAYS = 7
+JOB_STATUS_PROJECTION = {"_id": 0, "params": 0, "worker_id": 0}
+
+_job_wakeup = asyncio.Event()
+_job_worker_tasks: List[asyncio.Task] = []
+
+def new_job_id() -> str:
+    return str(uuid.uuid4())
+
+def job_submitted_response(job_id: str, message: str) -> Dict[str, Any]:
+    return {"success": True, "message": message, "job_id": job_id, "status_url": f"/api/jobs/{job_id}"}
+
+async def stage_job_rows(job_id: str, rows, expires_at: Optional[datetime] = None) -> int:
+    """Persist import rows for a job in INGEST_CHUNK_SIZE batches; returns the row count"""
+    expires_at = expires_at or datetime.utcnow() + timedelta(days=JOB_RETENTION_DAYS)
+    seq = 0
+    count = 0
+    chunk = []
+    async for row in iterate_rows(rows):
+        chunk.append(row)
+        if len(chunk) >= INGEST_CHUNK_SIZE:
+            await db.job_rows.insert_one({"job_id": job_id, "seq": seq, "rows": chunk, "expires_at": expires_at})
+            seq += 1
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        await db.job_rows.insert_one({"job_id": job_id, "seq": seq, "rows": chunk, "expires_at": expires_at})
+        count += len(chunk)
+    return count
+
+async def iterate_staged_rows(job_id: str):
+    """Yield the rows staged under job_id in their original order, one chunk in memory at a time"""
+    seq = 0
+    while True:
+        staged = await db.job_rows.find_one({"job_id": job_id, "seq": seq}, {"_id": 0, "rows": 1})
+        if not staged:
+            return
+        for row in staged["rows"]:
+            yield row
+        seq += 1
+
+async def submit_job(
+    musician_id: str,
+    job_type: str,
+    params: Dict[str, Any],
+    job_id: Optional[str] = None,
+    total: Optional[int] = None,
+    errors: Optional[List[str]] = None
+) -> str:
+    """Queue a job for the worker loop and return its id"""
+    now = datetime.utcnow()
+    job_id = job_id or new_job_id()
+    await db.jobs.insert_one({
+        "id": job_id,
+        "musician_id": musician_id,
+        "type": job_type,
+        "params": params,
+        "state": "queued",
+        "progress": {"total": total, "processed": 0},
+        "errors": (errors or [])[:JOB_MAX_ERRORS],
+        "result": None,
+        "error": None,
+        "attempts": 0,
+        "created_at": now,
+        "updated_at": now
+    })
+    _job_wakeup.set()
+    return job_id
+
+async def update_job_progress(
+    job: Dict[str, Any],
+    errors: Optional[List[str]] = None,
+    near_duplicate_matches: Optional[List[str]] = None,
+    **progress
+) -> None:
+    """Record progress counters (and any new errors/near-duplicates) for a running job; doubles as a heartbeat"""
+    now = datetime.utcnow()
+    update = {"$set": {"heartbeat_at": now, "updated_at": now}}
+    for field, value in progress.items():
+        update["$set"][f"progress.{field}"] = value
+    if errors:
+        update.setdefault("$push", {})["errors"] = {"$each": errors, "$slice": JOB_MAX_ERRORS}
+    if near_duplicate_matches:
+        update.setdefault("$push", {})["near_duplicate_matches"] = {"$each": near_duplicate_matches, "$slice": NEAR_DUPLICATE_REPORT_LIMIT}
+    await db.jobs.update_one({"id": job["id"], "worker_id": job["worker_id"]}, update)
+
+async def ingest_staged_rows(job: Dict[str, Any], enrich_factory=None, **ingest_options) -> Dict[str, Any]:
+    """Run ingest_songs over a job's staged rows one chunk at a time.
+
+    Counters are committed after every chunk, so a resumed job continues at the first
+    unfinished chunk (rows of a chunk interrupted half-way then count as duplicates).
+    """
+    progress = job.get("progress") or {}
+    totals = {field: progress.get(field, 0) for field in ("processed", "songs_added", "duplicates", "near_duplicates", "enriched", "enrichment_warnings")}
+    seq = progress.get("chunks_done", 0)
+    catalog = await load_import_catalog(job["musician_id"])  # Shared by every chunk of the job
+    
+    while True:
+        staged = await db.job_rows.find_one({"job_id": job["id"], "seq": seq}, {"_id": 0, "rows": 1})
+        if not staged:
+            break
+        enrichment = {"enriched": 0, "errors": []}
+        ingestion = await ingest_songs(
+            job["musician_id"],
+            staged["rows"],
+            enrich=enrich_factory(enrichment) if enrich_factory else None,
+            catalog=catalog,
+            **ingest_options
+        )
+        totals["processed"] += len(staged["rows"])
+        totals["songs_added"] += ingestion["songs_added"]
+        totals["duplicates"] += ingestion["duplicates"]
+        totals["near_duplicates"] += ingestion["near_duplicates"]
+        totals["enriched"] += enrichment["enriched"]
+        totals["enrichment_warnings"] += len(enrichment["errors"])
+        seq += 1
+        await update_job_progress(
+            job,
+            errors=ingestion["errors"] + enrichment["errors"],
+            near_duplicate_matches=ingestion["near_duplicate_matches"],
+            chunks_done=seq,
+            **totals
+        )
+    
+    stored = await db.jobs.find_one({"id": job["id"]}, {"_id": 0, "errors": 1, "near_duplicate_matches": 1}) or {}
+    totals["errors"] = stored.get("errors", [])
+    totals["near_duplicate_matches"] = stored.get("near_duplicate_matches", [])
+    return totals
+
+async def run_csv_upload_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    auto_enrich = job["params"].get("auto_enrich", False)
+    totals = await ingest_staged_rows(
+        job,
+        enrich_factory=csv_song_enricher if auto_enrich else None,
+        prefetch=prefetch_csv_metadata,
+        duplicate_message=csv_duplicate_message,
+        error_message=csv_row_error_message,
+        max_errors=CSV_MAX_ERRORS
+    )
+    enrichment_message = enrichment_summary_message(auto_enrich, totals["enriched"], totals["enrichment_warnings"])
+    return {
+        "success": True,
+        "message": f"Successfully imported {totals['songs_added']} songs{near_duplicate_summary(totals['near_duplicates'])}{enrichment_message}",
+        "songs_added": totals["songs_added"],
+        "errors": totals["errors"],
+        "near_duplicates": totals["near_duplicate_matches"]
+    }
+
+async def run_lst_upload_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    auto_enrich = job["params"].get("auto_enrich", False)
+    totals = await ingest_staged_rows(job, enrich_factory=lst_song_enricher if auto_enrich else None, prefetch=prefetch_lst_metadata)
+    enrichment_message = enrichment_summary_message(auto_enrich, totals["enriched"], totals["enrichment_warnings"])
+    return {
+        "success": True,
+        "message": f"Successfully imported {totals['songs_added']} songs from LST file{near_duplicate_summary(totals['near_duplicates'])}{enrichment_message}",
+        "songs_added": totals["songs_added"],
+        "near_duplicates": totals["near_duplicate_matches"]
+    }
+
+async def run_playlist_import_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    params = job["params"]
+    if not (job.get("progress") or {}).get("staged"):
+        # Scrape once; a resumed job reuses the staged rows instead of scraping again
+        await db.job_rows.delete_many({"job_id": job["id"]})
+        songs_to_import = await fetch_playlist_songs(params["platform"], params["playlist_url"], params.get("playlist_id"))
+        rows, errors = build_playlist_rows(songs_to_import)
+        total = await stage_job_rows(job["id"], rows)
+        await update_job_progress(job, errors=errors, total=total, staged=True)
+    
+    totals = await ingest_staged_rows(job, duplicate_message=playlist_duplicate_message)
+    return playlist_import_result(
+        params["platform"], totals["songs_added"], totals["duplicates"], totals["errors"],
+        near_duplicates=totals["near_duplicate_matches"], near_duplicate_count=totals["near_duplicates"]
+    )
+
+async def run_batch_enrich_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    async def report(counts: Dict[str, Any]) -> None:
+        await update_job_progress(job, **counts)
+    
+    # Already-enriched songs are skipped, so a resumed job only picks up what is left
+    return await run_batch_enrich(job["musician_id"], job["params"].get("song_ids"), progress=report)
+
+JOB_HANDLERS = {
+    "csv_upload": run_csv_upload_job,
+    "lst_upload": run_lst_upload_job,
+    "playlist_import": run_playlist_import_job,
+    "batch_enrich": run_batch_enrich_job,
+}
+
+async def claim_next_job(worker_id: str) -> Optional[Dict[str, Any]]:
+    """Atomically take the oldest queued job, or a running one whose worker stopped heartbeating"""
+    now = datetime.utcnow()
+    return await db.jobs.find_one_and_update(
+        {"$or": [
+            {"state": "queued"},
+            {"state": "running", "heartbeat_at": {"$lt": now - timedelta(seconds=JOB_STALE_SECONDS)}}
+        ]},
+        {
+            "$set": {"state": "running", "worker_id": worker_id, "heartbeat_at": now, "updated_at": now},
+            "$min": {"started_at": now},
+            "$inc": {"attempts": 1}
+        },
+        sort=[("created_at", ASCENDING)],
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+
+async def finish_job(job: Dict[str, Any], state: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+    now = datetime.utcnow()
+    await db.jobs.update_one(
+        {"id": job["id"], "worker_id": job["worker_id"]},
+        {"$set": {
+            "state": state,
+            "result": result,
+            "error": error,
+            "finished_at": now,
+            "updated_at": now,
+            "expires_at": now + timedelta(days=JOB_RETENTION_DAYS)
+        }}
+    )
+    await db.job_rows.delete_many({"job_id": job["id"]})
+
+async def _job_heartbeat(job: Dict[str, Any]) -> None:
+    while True:
+        await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+        try:
+            await db.jobs.update_one(
+                {"id": job["id"], "worker_id": job["worker_id"]},
+                {"$set": {"heartbeat_at": datetime.utcnow()}}
+            )
+        except Exception as e:
+            logger.warning(f"Job {job['id']} heartbeat failed: {str(e)}")
+
+async def run_job(job: Dict[str, Any]) -> None:
+    handler = JOB_HANDLERS.get(job["type"])
+    if handler is None:
+        await finish_job(job, "failed", error=f"Unknown job type: {job['type']}")
+        return
+    if job["attempts"] > JOB_MAX_ATTEMPTS:
+        await finish_job(job, "failed", error=f"Gave up after {JOB_MAX_ATTEMPTS} interrupted attempts")
+        return
+    
+    logger.info(f"Running {job['type']} job {job['id']} (attempt {job['attempts']})")
+    heartbeat = asyncio.create_task(_job_heartbeat(job))
+    try:
+        result = await handler(job)
+        await finish_job(job, "completed", result=result)
+        logger.info(f"Job {job['id']} completed")
+    except HTTPException as e:
+        await finish_job(job, "failed", error=str(e.detail))
+    except Exception as e:
+        logger.error(f"Job {job['id']} failed: {str(e)}")
+        await finish_job(job, "failed", error=str(e))
+    finally:
+        heartbeat.cancel()
+
+async def job_worker_loop(worker_id: str) -> None:
+    """Claim and run jobs until cancelled; a job cancelled mid-run is resumed once its heartbeat goes stale"""
+    while True:
+        try:
+            job = await claim_next_job(worker_id)
+        except Exception as e:
+            logger.error(f"Error claiming job: {str(e)}")
+            job = None
+        
+        if job:
+            await run_job(job)
+            continue
+        
+        _job_wakeup.clear()
+        try:
+            await asyncio.wait_for(_job_wakeup.wait(), timeout=JOB_POLL_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+def start_job_workers() -> List[asyncio.Task]:
+    prefix = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    for n in range(max(1, JOB_WORKER_CONCURRENCY)):
+        _job_worker_tasks.append(asyncio.create_task(job_worker_loop(f"{prefix}-{n}")))
+    logger.info(f"Started {len(_job_worker_tasks)} job workers")
+    return _job_worker_tasks
+
+async def stop_job_workers() -> None:
+    for task in _job_worker_tasks:
+        task.cancel()
+    await asyncio.gather(*_job_worker_tasks, return_exceptions=True)
+    _job_worker_tasks.clear()
+
+async def run_job_workers() -> None:
+    """Entry point for a standalone worker process (see worker.py)"""
+    await ensure_indexes()
+    try:
+        await asyncio.gather(*start_job_workers())
+    finally:
+        await stop_job_workers()
+
+@api_router.get("/jobs/{job_id}")
+async def get_job_status(job_id: str, musician_id: str = Depends(get_current_musician)):
+    """State, progress counters and (when finished) the result of a background job"""
+    job = await db.jobs.find_one({"id": job_id, "musician_id": musician_id}, JOB_STATUS_PROJECTION)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
 # NEW: Tip Support Functions
 def generate_payment_links(musician: dict, amount: float, message: str = None) -> PaymentLinkResponse:
     """Generate PayPal.me and Venmo.me links for tipping"""
@@ -3449,7 +5418,10 @@ async def get_tip_links(
     """Generate tip payment links for a musician"""
     try:
         # Find musician by slug
-        musician = await db.musicians.find_one({"slug": musician_slug})
+        musician = await db.musicians.find_one(
+            {"slug": musician_slug},
+            musician_projection("paypal_username", "venmo_username")
+        )
         if not musician:
             raise HTTPException(status_code=404, detail="Musician not found")
         
@@ -3483,7 +5455,7 @@ async def record_tip(
     """Record a tip (for analytics/tracking)"""
     try:
         # Find musician by slug
-        musician = await db.musicians.find_one({"slug": musician_slug})
+        musician = await db.musicians.find_one({"slug": musician_slug}, musician_projection())
         if not musician:
             raise HTTPException(status_code=404, detail="Musician not found")
         
@@ -3840,7 +5812,10 @@ async def get_current_show(
 ):
     """Get the currently active show"""
     try:
-        musician = await db.musicians.find_one({"id": musician_id})
+        musician = await db.musicians.find_one(
+            {"id": musician_id},
+            musician_projection("current_show_id", "current_show_name")
+        )
         
         if not musician:
             raise HTTPException(status_code=404, detail="Musician not found")
@@ -3883,7 +5858,7 @@ async def delete_show(
         await db.shows.delete_one({"id": show_id})
         
         # If this was the current active show, clear it from musician
-        musician = await db.musicians.find_one({"id": musician_id})
+        musician = await db.musicians.find_one({"id": musician_id}, musician_projection("current_show_id"))
         if musician and musician.get("current_show_id") == show_id:
             await db.musicians.update_one(
                 {"id": musician_id},
@@ -3929,9 +5904,10 @@ async def create_playlist(
         }
         
         await db.playlists.insert_one(playlist_dict)
+        await bump_content_version(musician_id, catalog_changed=False)
         
         # Get musician to check active playlist
-        musician = await db.musicians.find_one({"id": musician_id})
+        musician = await db.musicians.find_one({"id": musician_id}, musician_projection("active_playlist_id"))
         is_active = musician.get("active_playlist_id") == playlist_dict["id"]
         
         logger.info(f"Created playlist {playlist_dict['id']} for musician {musician_id}")
@@ -3957,7 +5933,7 @@ async def get_playlists(musician_id: str = Depends(get_current_musician)):
         await require_pro_access(musician_id)
         
         # Get musician's active playlist
-        musician = await db.musicians.find_one({"id": musician_id})
+        musician = await db.musicians.find_one({"id": musician_id}, musician_projection("active_playlist_id"))
         active_playlist_id = musician.get("active_playlist_id")
         
         # Get all playlists
@@ -4030,6 +6006,7 @@ async def update_playlist(
             {"id": playlist_id, "musician_id": musician_id},
             {"$set": {"song_ids": playlist_data.song_ids}}
         )
+        await bump_content_version(musician_id)
         
         logger.info(f"Updated playlist {playlist_id} for musician {musician_id}")
         return {"success": True, "message": "Playlist updated successfully"}
@@ -4056,7 +6033,7 @@ async def delete_playlist(
             raise HTTPException(status_code=404, detail="Playlist not found")
         
         # If this was the active playlist, reset to "All Songs"
-        musician = await db.musicians.find_one({"id": musician_id})
+        musician = await db.musicians.find_one({"id": musician_id}, musician_projection("active_playlist_id"))
         if musician.get("active_playlist_id") == playlist_id:
             await db.musicians.update_one(
                 {"id": musician_id},
@@ -4065,6 +6042,7 @@ async def delete_playlist(
         
         # Delete playlist
         await db.playlists.delete_one({"id": playlist_id, "musician_id": musician_id})
+        await bump_content_version(musician_id)
         
         logger.info(f"Deleted playlist {playlist_id} for musician {musician_id}")
         return {"success": True, "message": "Playlist deleted successfully"}
@@ -4091,6 +6069,7 @@ async def activate_playlist(
                 {"id": musician_id},
                 {"$unset": {"active_playlist_id": ""}}
             )
+            await bump_content_version(musician_id)
             logger.info(f"Activated 'All Songs' for musician {musician_id}")
             return {"success": True, "message": "All Songs activated"}
         
@@ -4104,6 +6083,7 @@ async def activate_playlist(
             {"id": musician_id},
             {"$set": {"active_playlist_id": playlist_id}}
         )
+        await bump_content_version(musician_id)
         
         logger.info(f"Activated playlist {playlist_id} for musician {musician_id}")
         return {"success": True, "message": f"Playlist '{playlist['name']}' activated"}
@@ -4188,6 +6168,37 @@ app.add_middleware(
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def startup_ensure_indexes():
+    """Provision every collection's indexes before serving traffic"""
+    try:
+        await backfill_song_keys()
+        await migrate_inline_artist_photos()
+        await ensure_indexes()
+    except Exception as e:
+        # Never block startup on index maintenance - queries still work, just slower
+        logger.error(f"Error ensuring indexes: {str(e)}")
+
+@app.on_event("startup")
+async def startup_job_workers():
+    """Run queued and interrupted background jobs inside the API process unless a separate worker does"""
+    if JOB_WORKER_MODE == "inline":
+        start_job_workers()
+
+@app.on_event("startup")
+async def startup_upload_session_gc():
+    """Sweep abandoned chunked uploads in the process that holds their files"""
+    global _upload_gc_task
+    _upload_gc_task = asyncio.create_task(upload_session_gc_loop())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    await stop_job_workers()
+    if _upload_gc_task is not None:
+        _upload_gc_task.cancel()
+    client.close()
+    _password_executor.shutdown(wait=False)
+    if _spotify_http is not None:
+        await _spotify_http.aclose()
+    if _scrape_http is not None:
+        await _scrape_http.aclose()
\ No newline at end of file
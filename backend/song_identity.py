@@ -0,0 +1,50 @@
+"""Song identity keys used to detect duplicates.
+
+normalize_song_key gives the exact keys behind the unique title_key/artist_key
+index. song_fingerprint is looser: it ignores punctuation, diacritics, version
+and featuring qualifiers and leading articles, so imports can flag
+near-duplicates such as "Yesterday (Remastered 2009)" next to "Yesterday".
+"""
+import re
+import unicodedata
+
+# Version qualifiers dropped from bracketed or dash-separated suffixes
+FINGERPRINT_QUALIFIERS = r"remaster(?:ed)?|live|feat\.|ft\.|featuring|radio edit|(?:single|album|mono|stereo) version|mono|stereo|explicit|clean|bonus track|deluxe"
+# A bare "ft" is only a featuring marker inside brackets or in the artist ("50 Ft Queenie" is a title)
+FINGERPRINT_FEATURING = r"feat\.?|ft\.?|featuring"
+_FINGERPRINT_PARENTHETICAL = re.compile(rf"[(\[][^)\]]*(?<!\w)(?:{FINGERPRINT_QUALIFIERS}|{FINGERPRINT_FEATURING})(?!\w)[^)\]]*[)\]]")
+_FINGERPRINT_DASH_SUFFIX = re.compile(rf"\s+[-–—]\s+[^-–—]*(?<!\w)(?:{FINGERPRINT_QUALIFIERS})(?!\w).*$")
+_FINGERPRINT_FEATURING = re.compile(rf"\s+(?:{FINGERPRINT_FEATURING})(?!\w).*$")
+_FINGERPRINT_APOSTROPHES = re.compile(r"['‘’`´\"“”]")
+_FINGERPRINT_SEPARATORS = re.compile(r"[\W_]+")
+FINGERPRINT_LEADING_ARTICLES = {"the", "a", "an"}
+
+
+def normalize_song_key(value: str) -> str:
+    """Case-fold and collapse whitespace so equivalent titles/artists compare equal"""
+    return " ".join((value or "").split()).casefold()
+
+
+def _fingerprint_part(value: str, artist: bool = False) -> str:
+    text = unicodedata.normalize('NFKD', value or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char)).casefold()
+
+    # Drop version qualifiers: "(Remastered 2011)", "[Live]", "- Live at Wembley", and "feat. X" after an artist
+    stripped = _FINGERPRINT_DASH_SUFFIX.sub('', _FINGERPRINT_PARENTHETICAL.sub(' ', text))
+    if artist:
+        stripped = _FINGERPRINT_FEATURING.sub('', stripped)
+    if stripped.strip():
+        text = stripped
+
+    # "Don't Stop Believin'" and "Dont Stop Believin" become the same words
+    words = _FINGERPRINT_SEPARATORS.sub(' ', _FINGERPRINT_APOSTROPHES.sub('', text.replace('&', ' and '))).split()
+    if len(words) > 1 and words[0] in FINGERPRINT_LEADING_ARTICLES:
+        words = words[1:]
+    return ' '.join(words)
+
+
+def song_fingerprint(title: str, artist: str) -> str:
+    """Loose identity of a song: ignores punctuation, diacritics, version/featuring qualifiers and leading articles"""
+    # Punctuation-only titles ("?", "!!!") have no words left, so they keep their exact key
+    title_part = _fingerprint_part(title) or normalize_song_key(title)
+    return f"{title_part}\x1f{_fingerprint_part(artist, artist=True)}"
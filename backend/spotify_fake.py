@@ -0,0 +1,210 @@
+"""Record/replay stand-in for the Spotify Web API, mounted as an httpx transport.
+
+Set SPOTIFY_FAKE_MODE on the backend to route every Spotify call through it:
+
+    SPOTIFY_FAKE_MODE=replay  serve search/artist/audio-features responses from the
+                              fixture corpus, synthesizing deterministic ones for
+                              anything not in it; no credentials needed
+    SPOTIFY_FAKE_MODE=record  forward to the real API and save each successful
+                              response to the corpus
+
+Replay tuning (all optional):
+    SPOTIFY_FAKE_CORPUS            fixture file (default: spotify_fixtures.json next to this file)
+    SPOTIFY_FAKE_LATENCY_MS        added delay per request
+    SPOTIFY_FAKE_JITTER_MS         extra random delay of up to this many ms
+    SPOTIFY_FAKE_ERROR_RATE        fraction of requests answered with a 503
+    SPOTIFY_FAKE_RATE_LIMIT_RATE   fraction of requests answered with a 429
+    SPOTIFY_FAKE_RETRY_AFTER       Retry-After seconds sent with injected 429s
+    SPOTIFY_FAKE_SYNTHESIZE        "false" to 404 on requests the corpus doesn't cover
+    SPOTIFY_FAKE_SEED              random seed for reproducible fault injection
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CORPUS_PATH = Path(__file__).parent / 'spotify_fixtures.json'
+
+SEARCH_FIELD_PATTERN = re.compile(r'(track|artist):(.*?)(?=\s+(?:track|artist):|$)')
+
+
+def fixture_key(request: httpx.Request) -> str:
+    """Corpus key for a request: method, API path and sorted query string"""
+    path = request.url.path
+    if path.startswith('/v1/'):
+        path = path[3:]
+    query = '&'.join(f"{name}={value}" for name, value in sorted(request.url.params.multi_items()))
+    return f"{request.method} {path}?{query}" if query else f"{request.method} {path}"
+
+
+def _stable_hash(value: str) -> str:
+    return hashlib.sha1(value.encode('utf-8')).hexdigest()
+
+
+def _stable_fraction(value: str, salt: str) -> float:
+    return int(_stable_hash(f"{salt}:{value}")[:8], 16) / 0xFFFFFFFF
+
+
+def synthesize_track(query: str) -> Dict[str, Any]:
+    """Deterministic track object for a search query"""
+    fields = dict(SEARCH_FIELD_PATTERN.findall(query))
+    title = fields.get('track', query).strip() or query
+    artist = fields.get('artist', 'Unknown Artist').strip() or 'Unknown Artist'
+    digest = _stable_hash(f"{title.casefold()}|{artist.casefold()}")
+    return {
+        "id": digest[:22],
+        "name": title,
+        "artists": [{"id": _stable_hash(artist.casefold())[:22], "name": artist}],
+        "album": {
+            "name": f"{title} (Single)",
+            "release_date": f"{1960 + int(digest[22:26], 16) % 65}-01-01"
+        }
+    }
+
+
+def synthesize_audio_features(track_id: str) -> Dict[str, Any]:
+    features = {name: round(_stable_fraction(track_id, name), 3)
+                for name in ("valence", "energy", "danceability", "acousticness")}
+    features["tempo"] = round(60 + 120 * _stable_fraction(track_id, "tempo"), 1)
+    features["id"] = track_id
+    return features
+
+
+def synthesize_artist(artist_id: str) -> Dict[str, Any]:
+    return {"id": artist_id, "name": f"Artist {artist_id[:6]}", "genres": []}
+
+
+class FakeSpotifyTransport(httpx.AsyncBaseTransport):
+    """Answers Spotify token, search, artist and audio-features requests locally.
+
+    In record mode requests are forwarded to `upstream` instead and every successful
+    API response is written to the corpus for later replay.
+    """
+
+    def __init__(
+        self,
+        corpus_path: Path = DEFAULT_CORPUS_PATH,
+        record: bool = False,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0,
+        rate_limit_rate: float = 0,
+        retry_after: float = 1,
+        synthesize: bool = True,
+        seed: Optional[int] = None,
+        upstream: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.corpus_path = Path(corpus_path)
+        self.record = record
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.synthesize = synthesize
+        self.random = random.Random(seed)
+        self.upstream = upstream or (httpx.AsyncHTTPTransport() if record else None)
+        self.responses: Dict[str, Any] = self._load_corpus()
+        self.stats = {"requests": 0, "replayed": 0, "synthesized": 0, "recorded": 0, "errors_injected": 0, "rate_limited": 0}
+
+    def _load_corpus(self) -> Dict[str, Any]:
+        if not self.corpus_path.exists():
+            return {}
+        with open(self.corpus_path, encoding='utf-8') as f:
+            return json.load(f).get("responses", {})
+
+    def save_corpus(self) -> None:
+        temp_path = self.corpus_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"responses": self.responses}, f, indent=1, sort_keys=True)
+        os.replace(temp_path, self.corpus_path)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.stats["requests"] += 1
+        if self.record:
+            return await self._record(request)
+
+        if self.latency_ms or self.jitter_ms:
+            await asyncio.sleep((self.latency_ms + self.random.uniform(0, self.jitter_ms)) / 1000)
+
+        if request.url.path.endswith('/api/token'):
+            return httpx.Response(200, json={"access_token": "fake-token", "token_type": "Bearer", "expires_in": 3600})
+
+        if self.rate_limit_rate and self.random.random() < self.rate_limit_rate:
+            self.stats["rate_limited"] += 1
+            return httpx.Response(429, headers={"Retry-After": str(self.retry_after)}, json={"error": {"status": 429, "message": "API rate limit exceeded"}})
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.stats["errors_injected"] += 1
+            return httpx.Response(503, json={"error": {"status": 503, "message": "Service unavailable"}})
+
+        key = fixture_key(request)
+        if key in self.responses:
+            self.stats["replayed"] += 1
+            return httpx.Response(200, json=self.responses[key])
+
+        body = self._synthesize(request) if self.synthesize else None
+        if body is None:
+            return httpx.Response(404, json={"error": {"status": 404, "message": f"No fixture for {key}"}})
+        self.stats["synthesized"] += 1
+        return httpx.Response(200, json=body)
+
+    def _synthesize(self, request: httpx.Request) -> Optional[Dict[str, Any]]:
+        path = request.url.path
+        params = request.url.params
+        if path.endswith('/search'):
+            return {"tracks": {"items": [synthesize_track(params.get('q', ''))]}}
+        if path.endswith('/audio-features'):
+            return {"audio_features": [synthesize_audio_features(track_id) for track_id in params.get('ids', '').split(',') if track_id]}
+        if '/audio-features/' in path:
+            return synthesize_audio_features(path.rsplit('/', 1)[1])
+        if path.endswith('/artists'):
+            return {"artists": [synthesize_artist(artist_id) for artist_id in params.get('ids', '').split(',') if artist_id]}
+        if '/artists/' in path:
+            return synthesize_artist(path.rsplit('/', 1)[1])
+        return None
+
+    async def _record(self, request: httpx.Request) -> httpx.Response:
+        response = await self.upstream.handle_async_request(request)
+        if request.url.path.endswith('/api/token') or response.status_code != 200:
+            return response
+
+        content = await response.aread()
+        await response.aclose()
+        self.responses[fixture_key(request)] = json.loads(content)
+        self.stats["recorded"] += 1
+        self.save_corpus()
+        return httpx.Response(200, headers={"Content-Type": "application/json"}, content=content)
+
+    async def aclose(self) -> None:
+        if self.upstream is not None:
+            await self.upstream.aclose()
+
+
+def spotify_transport_from_env(mode: str) -> FakeSpotifyTransport:
+    """Build the transport for SPOTIFY_FAKE_MODE ("replay" or "record") from SPOTIFY_FAKE_* settings"""
+    if mode not in ("replay", "record"):
+        raise ValueError(f"Unknown SPOTIFY_FAKE_MODE: {mode}")
+
+    seed = os.environ.get('SPOTIFY_FAKE_SEED')
+    transport = FakeSpotifyTransport(
+        corpus_path=Path(os.environ.get('SPOTIFY_FAKE_CORPUS', DEFAULT_CORPUS_PATH)),
+        record=mode == "record",
+        latency_ms=float(os.environ.get('SPOTIFY_FAKE_LATENCY_MS', '0')),
+        jitter_ms=float(os.environ.get('SPOTIFY_FAKE_JITTER_MS', '0')),
+        error_rate=float(os.environ.get('SPOTIFY_FAKE_ERROR_RATE', '0')),
+        rate_limit_rate=float(os.environ.get('SPOTIFY_FAKE_RATE_LIMIT_RATE', '0')),
+        retry_after=float(os.environ.get('SPOTIFY_FAKE_RETRY_AFTER', '1')),
+        synthesize=os.environ.get('SPOTIFY_FAKE_SYNTHESIZE', 'true').lower() != 'false',
+        seed=int(seed) if seed else None
+    )
+    logger.info(f"Spotify API calls go to the local {mode} stand-in ({len(transport.responses)} fixtures)")
+    return transport
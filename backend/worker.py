@@ -0,0 +1,12 @@
+"""Standalone background job worker.
+
+Run alongside API servers started with JOB_WORKER_MODE=external:
+
+    python worker.py
+"""
+import asyncio
+
+from server import run_job_workers
+
+if __name__ == "__main__":
+    asyncio.run(run_job_workers())
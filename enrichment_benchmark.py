@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Offline enrichment benchmark for RequestWave
+Start the backend against the local Spotify stand-in first, e.g.
+
+    SPOTIFY_FAKE_MODE=replay SPOTIFY_FAKE_LATENCY_MS=80 SPOTIFY_FAKE_RATE_LIMIT_RATE=0.01 \
+        uvicorn server:app --port 8001
+
+then run this script. It uploads a synthetic library for two fresh musicians and
+batch-enriches both: the first run measures cold Spotify lookups, the second
+(same songs) measures the shared metadata cache.
+"""
+
+import io
+import os
+import time
+import uuid
+
+import requests
+
+BASE_URL = os.environ.get("BENCHMARK_BASE_URL", "http://localhost:8001/api")
+SONG_COUNT = int(os.environ.get("BENCHMARK_SONGS", "1000"))
+
+
+def register_musician(label: str) -> str:
+    suffix = uuid.uuid4().hex[:8]
+    response = requests.post(f"{BASE_URL}/auth/register", json={
+        "name": f"Benchmark {label} {suffix}",
+        "email": f"benchmark.{label}.{suffix}@requestwave.com",
+        "password": "BenchmarkPassword123!"
+    })
+    response.raise_for_status()
+    return response.json()["token"]
+
+
+def upload_library(token: str, run_id: str) -> int:
+    lines = ["Title,Artist,Genre,Mood,Year,Notes"]
+    for i in range(SONG_COUNT):
+        lines.append(f"Benchmark Song {run_id}-{i},Benchmark Artist {i % 97},,,,")
+    csv_file = io.BytesIO("\n".join(lines).encode("utf-8"))
+
+    response = requests.post(
+        f"{BASE_URL}/songs/csv/upload",
+        headers={"Authorization": f"Bearer {token}"},
+        files={"file": ("benchmark.csv", csv_file, "text/csv")}
+    )
+    response.raise_for_status()
+    return response.json()["songs_added"]
+
+
+def batch_enrich(token: str) -> dict:
+    start = time.monotonic()
+    response = requests.post(
+        f"{BASE_URL}/songs/batch-enrich",
+        headers={"Authorization": f"Bearer {token}"},
+        json=[]
+    )
+    response.raise_for_status()
+    result = response.json()
+    result["wall_seconds"] = round(time.monotonic() - start, 3)
+    return result
+
+
+def print_run(name: str, result: dict):
+    stats = result.get("stats", {})
+    print(f"{name}:")
+    print(f"   processed {result['processed']}, enriched {result['enriched']}, errors {len(result['errors'])}")
+    print(f"   {result['wall_seconds']}s wall, {stats.get('songs_per_second')} songs/s, "
+          f"{stats.get('spotify_requests')} Spotify requests, {stats.get('rate_limited')} rate limited")
+
+
+def main():
+    print(f"Benchmarking enrichment of {SONG_COUNT} songs against {BASE_URL}")
+    run_id = uuid.uuid4().hex[:6]
+
+    cold_token = register_musician("cold")
+    print(f"Uploaded {upload_library(cold_token, run_id)} songs for the cold run")
+    print_run("Cold (Spotify)", batch_enrich(cold_token))
+
+    warm_token = register_musician("warm")
+    print(f"Uploaded {upload_library(warm_token, run_id)} songs for the warm run")
+    print_run("Warm (metadata cache)", batch_enrich(warm_token))
+
+    cache_stats = requests.get(f"{BASE_URL}/debug/metadata-cache").json()
+    print(f"Metadata cache: {cache_stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,9 @@ import './App.css';
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
 
+// Stored photos are served as /api/photos/... paths; resolve them against the backend origin
+const resolvePhotoUrl = (src) => (src && src.startsWith('/') ? `${BACKEND_URL}${src}` : src);
+
 // Auth Context
 const AuthContext = createContext();
 
@@ -1732,6 +1735,16 @@ const MusicianDashboard = () => {
     }
   };
 
+  const commitUploadPreview = async (format, preview, autoEnrich) => {
+    if (!preview?.upload_token) return null;
+    try {
+      return await axios.post(`${API}/songs/${format}/upload?auto_enrich=${autoEnrich}&upload_token=${preview.upload_token}`);
+    } catch (error) {
+      if (error.response?.status === 404) return null;
+      throw error;
+    }
+  };
+
   const previewCsv = async () => {
     if (!csvFile) return;
     
@@ -1761,13 +1774,16 @@ const MusicianDashboard = () => {
     setCsvError('');
     
     try {
-      const formData = new FormData();
-      formData.append('file', csvFile);
-      
-      // NEW: Add auto_enrich parameter
-      const response = await axios.post(`${API}/songs/csv/upload?auto_enrich=${csvAutoEnrich}`, formData, {
-        headers: { 'Content-Type': 'multipart/form-data' }
-      });
+      // Commit the rows the preview already parsed; re-send the file only if the preview expired
+      let response = await commitUploadPreview('csv', csvPreview, csvAutoEnrich);
+      if (!response) {
+        const formData = new FormData();
+        formData.append('file', csvFile);
+        
+        response = await axios.post(`${API}/songs/csv/upload?auto_enrich=${csvAutoEnrich}`, formData, {
+          headers: { 'Content-Type': 'multipart/form-data' }
+        });
+      }
       
       // Reset form and refresh songs
       setCsvFile(null);
@@ -1776,9 +1792,9 @@ const MusicianDashboard = () => {
       setCsvAutoEnrich(false);  // Reset auto-enrich option
       fetchSongs();
       
-      // Enhanced success message with enrichment info
-      let message = `Success! ${response.data.songs_added} songs imported`;
-      if (csvAutoEnrich && response.data.message.includes('auto-enriched')) {
+      // Enhanced success message with enrichment info; a file that stopped parsing partway reports what was saved
+      let message = response.data.success ? `Success! ${response.data.songs_added} songs imported` : response.data.message;
+      if (response.data.success && csvAutoEnrich && response.data.message.includes('auto-enriched')) {
         // Extract enrichment count from message
         const enrichedMatch = response.data.message.match(/(\d+) songs auto-enriched/);
         if (enrichedMatch) {
@@ -1842,12 +1858,16 @@ const MusicianDashboard = () => {
     setLstError('');
     
     try {
-      const formData = new FormData();
-      formData.append('file', lstFile);
-      
-      const response = await axios.post(`${API}/songs/lst/upload?auto_enrich=${lstAutoEnrich}`, formData, {
-        headers: { 'Content-Type': 'multipart/form-data' }
-      });
+      // Commit the rows the preview already parsed; re-send the file only if the preview expired
+      let response = await commitUploadPreview('lst', lstPreview, lstAutoEnrich);
+      if (!response) {
+        const formData = new FormData();
+        formData.append('file', lstFile);
+        
+        response = await axios.post(`${API}/songs/lst/upload?auto_enrich=${lstAutoEnrich}`, formData, {
+          headers: { 'Content-Type': 'multipart/form-data' }
+        });
+      }
       
       // Reset form and refresh songs
       setLstFile(null);
@@ -4049,7 +4069,7 @@ const MusicianDashboard = () => {
                   {designSettings.artist_photo ? (
                     <div className="relative">
                       <img
-                        src={designSettings.artist_photo}
+                        src={resolvePhotoUrl(designSettings.artist_photo)}
                         alt="Artist"
                         className="w-20 h-20 rounded-full object-cover"
                       />
@@ -4069,7 +4089,7 @@ const MusicianDashboard = () => {
                   <div>
                     <input
                       type="file"
-                      accept="image/*"
+                      accept="image/png,image/jpeg,image/webp,image/gif"
                       onChange={handleArtistPhotoUpload}
                       className="hidden"
                       id="artist-photo-upload"
@@ -5319,7 +5339,7 @@ const AudienceInterface = () => {
           <div className="flex items-center space-x-4">
             {designSettings.artist_photo && (
               <img
-                src={designSettings.artist_photo}
+                src={resolvePhotoUrl(designSettings.artist_photo)}
                 alt={designSettings.musician_name}
                 className="w-12 h-12 md:w-16 md:h-16 rounded-full object-cover"
               />
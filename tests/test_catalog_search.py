@@ -0,0 +1,116 @@
+"""Audience search and autocomplete indexes: tokenizing, prefix matching, ranking and incremental updates"""
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+import catalog_search  # noqa: E402
+from catalog_search import PrefixIndex, SongSearchIndex, tokenize  # noqa: E402
+
+
+def build_index(songs):
+    index = SongSearchIndex()
+    for song in songs:
+        index.add(**song)
+    return index
+
+
+SONGS = [
+    {"song_id": "love-story", "title": "Love Story", "artist": "Taylor Swift", "tags": ["Pop", "Romantic"], "request_count": 3, "recency": 1},
+    {"song_id": "lovely", "title": "Lovely", "artist": "Billie Eilish", "tags": ["Pop", "Sad Bangers"], "request_count": 9, "recency": 2},
+    {"song_id": "crazy-love", "title": "Crazy", "artist": "Love and Rockets", "tags": ["Rock"], "request_count": 0, "recency": 3},
+    {"song_id": "tainted", "title": "Tainted Love", "artist": "Soft Cell", "tags": ["Dance", "1981"], "request_count": 1, "recency": 4},
+    {"song_id": "romantic", "title": "Something", "artist": "The Beatles", "tags": ["Classic Rock", "Romantic", "1969"], "request_count": 5, "recency": 5},
+]
+
+
+def test_tokenize_normalizes_case_accents_and_apostrophes():
+    assert tokenize("Don't Stop Believin'") == ["dont", "stop", "believin"]
+    assert tokenize("Beyoncé – Crazy in Love") == ["beyonce", "crazy", "in", "love"]
+    assert tokenize("   ") == []
+    assert tokenize(None) == []
+
+
+def test_title_beats_artist_beats_tags():
+    index = build_index(SONGS)
+    # Exact title words first (request_count breaks the tie), then prefixes, then the artist match
+    assert index.search("love") == ["love-story", "tainted", "lovely", "crazy-love"]
+    assert index.search("romantic") == ["romantic", "love-story"]
+
+
+def test_every_term_must_match_and_last_can_be_a_prefix():
+    index = build_index(SONGS)
+    assert index.search("taylor lov") == ["love-story"]
+    assert index.search("sw") == ["love-story"]
+    assert index.search("love beatles") == []
+    assert index.search("196") == ["romantic"]
+    assert index.search("?!") is None
+
+
+def test_add_replace_and_remove_keep_the_vocabulary_in_sync():
+    index = build_index(SONGS)
+    index.add("lovely", "Ocean Eyes", "Billie Eilish", ["Pop"], 9, 2)
+    assert "lovely" not in index.postings
+    assert index.search("ocean") == ["lovely"]
+
+    for song in SONGS:
+        index.remove(song["song_id"])
+    index.remove("missing")
+    assert len(index) == 0
+    assert index.postings == {}
+    assert index.vocabulary == []
+
+
+def test_request_count_breaks_ties():
+    index = build_index(SONGS)
+    assert index.search("pop") == ["lovely", "love-story"]
+    index.set_request_count("love-story", 20)
+    assert index.search("pop") == ["love-story", "lovely"]
+    # An artist prefix still outranks an exact tag match
+    assert index.search("rock") == ["crazy-love", "romantic"]
+
+
+def test_prefix_expansion_is_bounded(monkeypatch):
+    monkeypatch.setattr(catalog_search, "MAX_PREFIX_EXPANSION", 10)
+    index = SongSearchIndex()
+    for i in range(50):
+        index.add(f"s{i}", f"Song{i:02d}", "Artist")
+    assert len(index.expand("song")) == 10
+    assert len(index.search("song")) == 10
+    assert index.search("song49") == ["s49"]
+
+
+def test_large_catalog_search_is_fast():
+    rnd = random.Random(7)
+    words = ["love", "night", "heart", "fire", "blue", "road", "home", "rain", "dance", "river", "gold", "summer"]
+    index = SongSearchIndex()
+    for i in range(5000):
+        index.add(f"s{i}", " ".join(rnd.sample(words, 3)) + f" {i}", f"Band {i % 300}", ["Pop", str(1960 + i % 60)], rnd.randint(0, 50), i)
+
+    started = time.perf_counter()
+    for _ in range(20):
+        results = index.search("love ni")
+    elapsed = (time.perf_counter() - started) / 20
+    assert results and all("love" in index.songs[song_id][0] for song_id in results)
+    assert elapsed < 0.05
+
+
+def test_autocomplete_matches_title_and_artist_prefixes_by_popularity():
+    index = PrefixIndex((song["song_id"], song["title"], song["artist"]) for song in SONGS)
+    popularity = {song["song_id"]: song["request_count"] for song in SONGS}.get
+    assert index.complete("lo", popularity, 10) == ["lovely", "love-story", "tainted", "crazy-love"]
+    assert index.complete("lo", popularity, 2) == ["lovely", "love-story"]
+    assert index.complete("STO", popularity, 10) == ["love-story"]
+    assert index.complete("taylor sw", popularity, 10) == ["love-story"]
+    assert index.complete("the beat", popularity, 10) == ["romantic"]
+    assert index.complete("pop", popularity, 10) == []  # Tags are not completed
+    assert index.complete("  ", popularity, 10) == []
+
+
+def test_autocomplete_ties_break_alphabetically_by_title():
+    index = PrefixIndex([("b", "Blue Moon", "X"), ("a", "Blue Bayou", "X"), ("c", "Blues", "X")])
+    assert index.complete("blu", lambda song_id: 0, 3) == ["a", "b", "c"]
+    assert index.complete("blu", lambda song_id: 2 if song_id == "c" else 0, 3) == ["c", "a", "b"]
@@ -0,0 +1,105 @@
+"""Streaming CSV parsing: any split of the bytes must parse exactly like the whole file"""
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+import csv_import  # noqa: E402
+from csv_import import (  # noqa: E402
+    new_csv_parse_state,
+    parse_csv_bytes,
+    parse_csv_content,
+    split_complete_csv_records,
+)
+
+
+def parse_in_pieces(data: bytes, cuts):
+    """Feed data to parse_csv_bytes split at the given byte offsets"""
+    parse_state = new_csv_parse_state()
+    songs = []
+    start = 0
+    for cut in sorted(cuts) + [len(data)]:
+        songs += parse_csv_bytes(data[start:cut], parse_state)
+        start = cut
+    songs += parse_csv_bytes(b"", parse_state, final=True)
+    return songs, parse_state
+
+
+def assert_streams_like_whole_file(data: bytes, attempts: int = 200, seed: int = 1):
+    expected = parse_csv_content(data)
+    rnd = random.Random(seed)
+    for cuts in [[], list(range(1, len(data)))] + [rnd.sample(range(1, len(data)), rnd.randint(1, 6)) for _ in range(attempts)]:
+        songs, parse_state = parse_in_pieces(data, cuts)
+        assert songs == expected["songs"], cuts
+        assert parse_state["errors"] == expected["errors"], cuts
+        assert parse_state["pending"] == ""
+
+
+TRICKY_CSV = (
+    'Title,Artist,Genre,Mood,Year,Notes\n'
+    '"Line one\nline two",Band,"Rock, Pop",,1999,"He said ""hi"""\n'
+    '12" Remix,DJ Shadow,Dance,,,vinyl only\n'
+    'Plain,Artist,,,,\n'
+    '"Quoted ""inner"" title",Someone,,,2001,\n'
+    'Café del Mar,Énergie,,Chill Vibes,,ü\r\n'
+    '\n'
+    'Missing artist,,,,,\n'
+    '"Trailing ""quote""",x""y,,,,"a\r\nb"\n'
+).encode("utf-8")
+
+
+def test_split_keeps_quoted_newlines_in_the_remainder():
+    assert split_complete_csv_records('a,b\n"c\nd",e\nf') == ('a,b\n"c\nd",e\n', 'f')
+    assert split_complete_csv_records('a,"b\n') == ('', 'a,"b\n')
+    assert split_complete_csv_records('"a ""x"" b",c\n') == ('"a ""x"" b",c\n', '')
+
+
+def test_split_treats_quotes_inside_unquoted_fields_as_literal():
+    text = 'Title,Artist\n12" Remix,DJ\nNext,Song\n'
+    assert split_complete_csv_records(text) == (text, '')
+    assert split_complete_csv_records('a,b"c\nd') == ('a,b"c\n', 'd')
+
+
+def test_split_handles_carriage_returns():
+    assert split_complete_csv_records('a,b\r\nc,d\r\n') == ('a,b\r\nc,d\r\n', '')
+    assert split_complete_csv_records('a,b\rc,d\re') == ('a,b\rc,d\r', 'e')
+    assert split_complete_csv_records('a,b\r') == ('', 'a,b\r')  # Might still be \r\n
+
+
+def test_any_split_parses_like_the_whole_file():
+    expected = parse_csv_content(TRICKY_CSV)
+    assert [song["title"] for song in expected["songs"]] == [
+        "Line one\nline two", '12" Remix', "Plain", 'Quoted "inner" title', "Café del Mar", 'Trailing "quote"'
+    ]
+    assert expected["songs"][0]["notes"] == 'He said "hi"'
+    assert_streams_like_whole_file(TRICKY_CSV)
+
+
+def test_multibyte_characters_split_across_chunks():
+    data = "Title,Artist\n" + "".join(f"Ünïcødé {i} ♫,Bjørk 🎸\n" for i in range(20))
+    data = data.encode("utf-8")
+    assert len(parse_csv_content(data)["songs"]) == 20
+    assert_streams_like_whole_file(data, seed=2)
+
+
+def test_stray_quotes_never_stall_the_split(monkeypatch):
+    monkeypatch.setattr(csv_import, "CSV_MAX_RECORD_SIZE", 200)
+    data = ('Title,Artist\n12" Remix,DJ\n' + "".join(f"Song {i},Band {i}\n" for i in range(500))).encode("utf-8")
+    songs, _ = parse_in_pieces(data, range(64, len(data), 64))
+    assert len(songs) == 501
+
+
+def test_unclosed_quote_is_reported_once_too_large(monkeypatch):
+    monkeypatch.setattr(csv_import, "CSV_MAX_RECORD_SIZE", 200)
+    data = ('Title,Artist\n"Never closed,DJ\n' + "x,y\n" * 200).encode("utf-8")
+    with pytest.raises(ValueError, match="unclosed quote"):
+        parse_in_pieces(data, range(64, len(data), 64))
+
+
+def test_invalid_utf8_is_rejected():
+    with pytest.raises(ValueError, match="UTF-8"):
+        parse_in_pieces("Title,Artist\nCafé,X\n".encode("latin-1"), [5])
@@ -0,0 +1,274 @@
+"""Equivalence tests: the compiled genre/mood classifier must agree with the original keyword chains"""
+import csv
+import itertools
+import random
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+import numpy as np  # noqa: E402
+
+from genre_mood import (  # noqa: E402
+    AUDIO_FEATURE_COLUMNS,
+    GENRE_ARTIST_RULES,
+    GENRE_TITLE_RULES,
+    MOOD_TITLE_RULES,
+    SAD_BANGER_LIFT_WORDS,
+    SAD_BANGER_SAD_WORDS,
+    assign_genre_and_mood,
+    classify_audio_feature_matrix,
+    classify_many,
+    get_mood_from_audio_features,
+    moods_from_audio_features,
+)
+
+
+def legacy_assign_genre_and_mood(song_title: str, artist: str) -> Dict[str, Any]:
+    """The original if/elif implementation, kept verbatim as the reference"""
+    title_lower = song_title.lower()
+    artist_lower = artist.lower()
+    
+    # Curated Genre List (20 options)
+    CURATED_GENRES = [
+        "Pop", "Rock", "Classic Rock", "Folk", "Country", "Americana", "Indie", 
+        "Alternative", "Singer-Songwriter", "R&B", "Soul", "Funk", "Blues", 
+        "Jazz", "Hip Hop", "Reggae", "Electronic", "Dance", "Latin", "Acoustic"
+    ]
+    
+    # Genre assignment based on keywords - prioritize specific categories
+    genre = "Pop"  # Default
+    
+    # Artist-based genre detection (common artists people know)
+    if any(artist in artist_lower for artist in ["taylor swift", "adele", "ed sheeran", "bruno mars"]):
+        genre = "Pop"
+    elif any(artist in artist_lower for artist in ["the beatles", "led zeppelin", "queen", "eagles", "fleetwood mac"]):
+        genre = "Classic Rock"
+    elif any(artist in artist_lower for artist in ["johnny cash", "dolly parton", "chris stapleton", "kacey musgraves"]):
+        genre = "Country"
+    elif any(artist in artist_lower for artist in ["bob dylan", "joni mitchell", "simon and garfunkel"]):
+        genre = "Folk"
+    elif any(artist in artist_lower for artist in ["john mayer", "james taylor", "jack johnson"]):
+        genre = "Singer-Songwriter"
+    elif any(artist in artist_lower for artist in ["stevie wonder", "marvin gaye", "alicia keys"]):
+        genre = "R&B"
+    elif any(artist in artist_lower for artist in ["bb king", "muddy waters", "eric clapton"]):
+        genre = "Blues"
+    elif any(artist in artist_lower for artist in ["miles davis", "ella fitzgerald", "frank sinatra"]):
+        genre = "Jazz"
+    elif any(artist in artist_lower for artist in ["bob marley", "jimmy buffett"]):
+        genre = "Reggae"
+    
+    # Title-based genre detection
+    elif any(word in title_lower for word in ["rock", "stone", "highway", "guitar"]):
+        genre = "Rock"
+    elif any(word in title_lower for word in ["classic", "oldies", "vintage"]):
+        genre = "Classic Rock"
+    elif any(word in title_lower for word in ["country", "truck", "whiskey", "cowboy", "honky"]):
+        genre = "Country"
+    elif any(word in title_lower for word in ["folk", "mountain", "cabin", "prairie"]):
+        genre = "Folk"
+    elif any(word in title_lower for word in ["acoustic", "unplugged", "stripped"]):
+        genre = "Acoustic"
+    elif any(word in title_lower for word in ["hip", "rap", "beat", "street"]):
+        genre = "Hip Hop"
+    elif any(word in title_lower for word in ["jazz", "swing", "smooth"]):
+        genre = "Jazz"
+    elif any(word in title_lower for word in ["blues", "blue", "lonesome"]):
+        genre = "Blues"
+    elif any(word in title_lower for word in ["electronic", "digital", "synth", "techno"]):
+        genre = "Electronic"
+    elif any(word in title_lower for word in ["dance", "club", "party", "disco"]):
+        genre = "Dance"
+    elif any(word in title_lower for word in ["reggae", "island", "caribbean"]):
+        genre = "Reggae"
+    elif any(word in title_lower for word in ["soul", "funky", "groove"]):
+        genre = "Soul"
+    elif any(word in title_lower for word in ["indie", "alternative", "underground"]):
+        genre = "Indie"
+    elif any(word in title_lower for word in ["latin", "spanish", "salsa", "tango"]):
+        genre = "Latin"
+    
+    # Curated Mood List (20 options)
+    CURATED_MOODS = [
+        "Chill Vibes", "Feel Good", "Throwback", "Romantic", "Poolside", "Island Vibes", 
+        "Dance Party", "Late Night", "Road Trip", "Sad Bangers", "Coffeehouse", 
+        "Campfire", "Bar Anthems", "Summer Vibes", "Rainy Day", "Feel It Live", 
+        "Heartbreak", "Fall Acoustic", "Weekend Warm-Up", "Groovy"
+    ]
+    
+    # Mood assignment based on keywords - more contextual and performance-oriented
+    mood = "Feel Good"  # Default
+    
+    # Love and relationship moods
+    if any(word in title_lower for word in ["love", "heart", "baby", "kiss", "valentine", "together"]):
+        mood = "Romantic"
+    elif any(word in title_lower for word in ["break", "goodbye", "tears", "lonely", "miss", "gone"]):
+        mood = "Heartbreak"
+    
+    # Energy and party moods  
+    elif any(word in title_lower for word in ["party", "dance", "celebration", "tonight", "weekend"]):
+        mood = "Dance Party"
+    elif any(word in title_lower for word in ["bar", "beer", "whiskey", "shots", "crowd", "anthem"]):
+        mood = "Bar Anthems"
+    elif any(word in title_lower for word in ["warm up", "getting ready", "pump", "hype"]):
+        mood = "Weekend Warm-Up"
+    elif any(word in title_lower for word in ["groove", "funky", "smooth", "soul", "rhythm"]):
+        mood = "Groovy"
+    
+    # Chill and relaxed moods
+    elif any(word in title_lower for word in ["chill", "relax", "peace", "calm", "quiet", "soft", "mellow"]):
+        mood = "Chill Vibes"
+    elif any(word in title_lower for word in ["coffee", "morning", "café", "acoustic", "intimate"]):
+        mood = "Coffeehouse"
+    elif any(word in title_lower for word in ["campfire", "around", "circle", "sing along"]):
+        mood = "Campfire"
+    elif any(word in title_lower for word in ["late", "night", "midnight", "after dark", "3am"]):
+        mood = "Late Night"
+    elif any(word in title_lower for word in ["rain", "storm", "grey", "cozy", "inside"]):
+        mood = "Rainy Day"
+    
+    # Seasonal and setting moods
+    elif any(word in title_lower for word in ["summer", "sun", "beach", "vacation", "hot"]):
+        mood = "Summer Vibes"
+    elif any(word in title_lower for word in ["pool", "swimming", "drinks", "cocktail", "tropical"]):
+        mood = "Poolside"
+    elif any(word in title_lower for word in ["island", "caribbean", "beach", "ocean", "waves"]):
+        mood = "Island Vibes"
+    elif any(word in title_lower for word in ["road", "highway", "drive", "car", "journey", "adventure"]):
+        mood = "Road Trip"
+    elif any(word in title_lower for word in ["fall", "autumn", "leaves", "cozy", "sweater"]):
+        mood = "Fall Acoustic"
+    
+    # Performance and nostalgia moods
+    elif any(word in title_lower for word in ["throwback", "oldies", "remember", "back", "classic"]):
+        mood = "Throwback"
+    elif any(word in title_lower for word in ["live", "stage", "show", "performance", "crowd"]):
+        mood = "Feel It Live"
+    elif any(word in title_lower for word in ["sad", "blue", "hurt", "pain"]) and any(word in title_lower for word in ["but", "still", "anyway", "dance", "sing"]):
+        mood = "Sad Bangers"  # Sad but still hits hard
+    
+    return {"genre": genre, "mood": mood}
+
+
+TITLE_KEYWORDS = sorted({
+    keyword
+    for rules in (GENRE_TITLE_RULES, MOOD_TITLE_RULES)
+    for _, keywords in rules
+    for keyword in keywords
+} | set(SAD_BANGER_SAD_WORDS) | set(SAD_BANGER_LIFT_WORDS))
+ARTIST_KEYWORDS = sorted({keyword for _, keywords in GENRE_ARTIST_RULES for keyword in keywords})
+
+
+def fixture_songs():
+    """(title, artist) pairs from the CSV fixtures in the repository root"""
+    songs = []
+    for path in sorted(ROOT_DIR.glob("test_*.csv")):
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                title = (row.get("Title") or row.get("title") or "").strip()
+                artist = (row.get("Artist") or row.get("artist") or "").strip()
+                if title:
+                    songs.append((title, artist))
+    return songs
+
+
+def assert_same(title: str, artist: str):
+    assert assign_genre_and_mood(title, artist) == legacy_assign_genre_and_mood(title, artist), (title, artist)
+
+
+def test_every_single_keyword():
+    for keyword in TITLE_KEYWORDS:
+        assert_same(keyword, "Unknown Artist")
+        assert_same(f"The {keyword.title()} Song", "Someone")
+    for keyword in ARTIST_KEYWORDS:
+        assert_same("Untitled", keyword)
+        assert_same("Rock and Roll Tonight", keyword.upper())
+
+
+def test_keyword_pairs_in_both_orders():
+    # Exercises rule priority wherever two rules compete for the same title
+    for first, second in itertools.permutations(TITLE_KEYWORDS, 2):
+        assert_same(f"{first} {second}", "Unknown Artist")
+
+
+def test_overlapping_and_embedded_keywords():
+    titles = [
+        "Heartbreak Hotel", "Breakfast at Tiffany's", "Barnstorm", "Sunday Morning", "Backroads",
+        "Blueberry Hill", "Hipster", "Rapture", "Soulmate", "Livestream", "Carousel", "Goodbye Yellow Brick Road",
+        "Sad But True", "Blue Still", "Hurt Anyway", "Painted Sing", "Saddance", "Warm Upbeat",
+        "After Darkness", "Café del Mar", "CAFÉ", "", "   ", "3AM", "Shots Fired",
+    ]
+    for title in titles:
+        assert_same(title, "Unknown Artist")
+        assert_same(title, "Queen")
+
+
+def test_fixture_songs():
+    songs = fixture_songs()
+    assert songs
+    for title, artist in songs:
+        assert_same(title, artist)
+
+
+def test_random_keyword_soup():
+    rng = random.Random(20240611)
+    fragments = TITLE_KEYWORDS + ["the", "a", "of", "me", "you", "x", "-", "'", "ly", "s"]
+    for _ in range(5000):
+        title = "".join(rng.choice(fragments) + rng.choice(["", " ", ""]) for _ in range(rng.randint(1, 6)))
+        artist = rng.choice(ARTIST_KEYWORDS + ["Unknown Artist", "The Queen Bees", "Eaglesmere"])
+        assert_same(title, artist)
+
+
+def test_classify_many_matches_single_calls():
+    songs = fixture_songs() + [("Love Me Do", "The Beatles"), ("Love Me Do", "The Beatles"), ("Midnight Rain", "")]
+    results = classify_many([title for title, _ in songs], [artist for _, artist in songs])
+    assert results == [legacy_assign_genre_and_mood(title, artist) for title, artist in songs]
+
+
+def test_classify_many_results_are_independent():
+    first, second = classify_many(["Love Song", "Love Song"], ["Adele", "Adele"])
+    first["genre"] = "Changed"
+    assert second == {"genre": "Pop", "mood": "Romantic"}
+
+
+def test_audio_feature_matrix_matches_scalar_on_threshold_grid():
+    # Every combination of values on and either side of each threshold
+    ratios = [0.0, 0.39, 0.4, 0.41, 0.5, 0.51, 0.59, 0.6, 0.61, 0.69, 0.7, 0.71, 0.8, 0.81, 1.0]
+    tempos = [60.0, 99.9, 100.0, 120.0, 140.0, 140.1, 200.0]
+    grid = np.array(list(itertools.product(ratios, ratios, ratios, ratios, tempos))[::7])
+    labels = classify_audio_feature_matrix(grid)
+    for row, label in zip(grid, labels):
+        features = dict(zip(AUDIO_FEATURE_COLUMNS, row.tolist()))
+        assert label == get_mood_from_audio_features(features), features
+
+
+def test_audio_feature_matrix_matches_scalar_on_random_features():
+    rng = np.random.default_rng(7)
+    matrix = rng.random((20000, 5))
+    matrix[:, 4] = rng.uniform(50, 200, 20000)
+    labels = classify_audio_feature_matrix(matrix)
+    for row, label in zip(matrix, labels):
+        assert label == get_mood_from_audio_features(dict(zip(AUDIO_FEATURE_COLUMNS, row.tolist())))
+
+
+def test_moods_from_audio_features_handles_partial_and_missing_entries():
+    features_list = [
+        {"valence": 0.9, "energy": 0.9, "danceability": 0.9, "acousticness": 0.1, "tempo": 128, "id": "a"},
+        {"energy": 0.2},  # Missing columns use the scalar defaults
+        None,
+        {},
+        {"valence": None, "energy": 0.5},  # Unusable - caller falls back to the curated mood
+        {"valence": 0.1, "energy": 0.7, "danceability": 0.3, "acousticness": 0.2, "tempo": 90},
+    ]
+    assert moods_from_audio_features(features_list) == [
+        get_mood_from_audio_features(features_list[0]),
+        get_mood_from_audio_features(features_list[1]),
+        None,
+        None,
+        None,
+        get_mood_from_audio_features(features_list[5]),
+    ]
+    assert moods_from_audio_features([]) == []
@@ -0,0 +1,47 @@
+"""Song fingerprints: which title/artist variants count as the same song on import"""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+from song_identity import normalize_song_key, song_fingerprint  # noqa: E402
+
+
+def test_normalize_song_key_collapses_case_and_whitespace():
+    assert normalize_song_key("  Hey   JUDE ") == "hey jude"
+    assert normalize_song_key(None) == ""
+
+
+@pytest.mark.parametrize("first, second", [
+    (("Don't Stop Believin'", "Journey"), ("Dont Stop Believin", "Journey")),
+    (("Here Comes the Sun (Remastered 2011)", "The Beatles"), ("Here Comes the Sun", "Beatles")),
+    (("Yesterday - Remastered 2009", "The Beatles"), ("Yesterday", "The Beatles")),
+    (("Bohemian Rhapsody [Live]", "Queen"), ("Bohemian Rhapsody", "Queen")),
+    (("Old Town Road (feat. Billy Ray Cyrus)", "Lil Nas X"), ("Old Town Road", "Lil Nas X")),
+    (("Old Town Road", "Lil Nas X feat. Billy Ray Cyrus"), ("Old Town Road", "Lil Nas X")),
+    (("Stay", "The Kid LAROI ft Justin Bieber"), ("Stay", "Kid LAROI")),
+    (("Café del Mar", "Énergie"), ("Cafe Del Mar", "Energie")),
+    (("Rock & Roll", "Led Zeppelin"), ("Rock and Roll", "Led Zeppelin")),
+])
+def test_variants_share_a_fingerprint(first, second):
+    assert song_fingerprint(*first) == song_fingerprint(*second)
+
+
+@pytest.mark.parametrize("first, second", [
+    (("50 Ft Queenie", "PJ Harvey"), ("50", "PJ Harvey")),
+    (("Live and Let Die", "Wings"), ("and Let Die", "Wings")),
+    (("Hello", "Adele"), ("Hello", "Lionel Richie")),
+    (("?", "X"), ("!!!", "X")),
+])
+def test_different_songs_keep_different_fingerprints(first, second):
+    assert song_fingerprint(*first) != song_fingerprint(*second)
+
+
+def test_titles_are_never_stripped_to_nothing():
+    assert song_fingerprint("Live and Let Die", "Wings").startswith("live and let die\x1f")
+    assert song_fingerprint("(Live)", "X") == "live\x1fx"
+    assert song_fingerprint("The", "X") == "the\x1fx"
+    assert song_fingerprint("?", "X") == "?\x1fx"